@@ -0,0 +1,91 @@
+"""
+Archival of closed jobs.
+
+The CV matches and applications of jobs closed for a while are moved, in
+batches, from the live tables into ``ArchivedCVMatch`` and
+``ArchivedApplication``, keeping their ids, so active hiring only scans
+and indexes rows that matter. The job row itself stays live with
+``archived_at`` set. Detail views, and lists filtered to an archived job,
+read through to the archive tables; reopening the job moves its rows back.
+"""
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Job, CVMatch, Application, ArchivedCVMatch, ArchivedApplication, batched_tombstones
+
+# Live model -> archive model. Both have the same concrete field names.
+ARCHIVES = {
+    CVMatch: ArchivedCVMatch,
+    Application: ArchivedApplication,
+}
+
+BATCH_SIZE = 1000
+
+
+def archive_model(model):
+    return ARCHIVES[model]
+
+
+class ArchiveError(Exception):
+    """Rows could not be moved; the batch that failed was rolled back."""
+
+
+def _move(source, target, job_ids, batch_size):
+    """Move the rows of ``job_ids`` from ``source`` to ``target``; return how many moved."""
+    fields = [field.attname for field in source._meta.concrete_fields]
+    # bulk_create stamps auto_now_add fields (uploaded_at, applied_at) with the
+    # current time; they are written back from the moved rows
+    stamped = [field.attname for field in target._meta.concrete_fields if getattr(field, 'auto_now_add', False)]
+    moved = 0
+    while True:
+        try:
+            with transaction.atomic():
+                rows = list(
+                    source.objects.filter(job_id__in=job_ids).order_by('pk').values(*fields)[:batch_size]
+                )
+                if not rows:
+                    return moved
+                objs = target.objects.bulk_create([target(**row) for row in rows])
+                if stamped:
+                    for obj, row in zip(objs, rows):
+                        for name in stamped:
+                            setattr(obj, name, row[name])
+                    target.objects.bulk_update(objs, stamped)
+                with batched_tombstones():
+                    source.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+        except IntegrityError as e:
+            # e.g. a CV re-uploaded under the same file name while archived
+            raise ArchiveError(f'Could not move {source._meta.verbose_name_plural} of jobs {job_ids}: {e}') from e
+        moved += len(rows)
+
+
+def archive_jobs(job_ids, batch_size=BATCH_SIZE):
+    """
+    Move the CV matches and applications of closed ``job_ids`` to the
+    archive tables, ``batch_size`` rows per transaction. Returns the number
+    of rows moved per live model.
+    """
+    # Marked first so reads look in both places while rows are moving. A
+    # job reopened since it was picked is left alone, and so are its rows.
+    now = timezone.now()
+    jobs = Job.objects.filter(pk__in=job_ids, status='Closed')
+    jobs.filter(archived_at__isnull=True).update(archived_at=now, updated_at=now)
+    job_ids = list(jobs.filter(archived_at__isnull=False).values_list('pk', flat=True))
+    return {model: _move(model, target, job_ids, batch_size) for model, target in ARCHIVES.items()}
+
+
+def restore_job(job, batch_size=BATCH_SIZE):
+    """Move an archived job's rows back to the live tables."""
+    counts = {model: _move(target, model, [job.pk], batch_size) for model, target in ARCHIVES.items()}
+    job.archived_at = None
+    Job.objects.filter(pk=job.pk).update(archived_at=None, updated_at=timezone.now())
+    return counts
+
+
+def archivable_jobs(days):
+    """Jobs closed more than ``days`` days ago whose rows are still live."""
+    cutoff = timezone.now() - timedelta(days=days)
+    return Job.objects.filter(status='Closed', closed_at__lt=cutoff, archived_at__isnull=True)
+
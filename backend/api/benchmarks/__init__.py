@@ -0,0 +1,155 @@
+"""
+Performance benchmarks for the Talent Flow API.
+
+Benchmarks are plain functions registered with the ``@benchmark`` decorator.
+Each one receives a ``Runner`` and calls ``runner.measure()`` for every case
+it wants recorded. Run them all with::
+
+    python manage.py benchmark --output results.json
+    python manage.py benchmark --compare results.json
+
+Results are written as JSON so two runs can be diffed to flag regressions.
+"""
+import gc
+import math
+import time
+import tracemalloc
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+REGISTRY = {}
+
+
+def benchmark(name):
+    """Register a benchmark function under ``name``."""
+    def decorator(func):
+        REGISTRY[name] = func
+        return func
+    return decorator
+
+
+def percentile(samples, pct):
+    """Return the ``pct`` percentile of ``samples`` using linear interpolation."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class Runner:
+    """Collects timing, query count and peak memory for benchmark cases."""
+
+    def __init__(self, sizes, iterations=20, warmup=2, stdout=None):
+        self.sizes = sizes
+        self.iterations = iterations
+        self.warmup = warmup
+        self.stdout = stdout
+        self.results = {}
+
+    def measure(self, name, func, setup=None, iterations=None, params=None, units=None):
+        """
+        Time ``func`` and record the result under ``name``.
+
+        ``setup`` runs before every call and is excluded from timing. ``units``
+        is the amount of work one call performs (rows, CVs, pages...) and is
+        used to report throughput alongside latency.
+        """
+        iterations = iterations or self.iterations
+
+        for _ in range(self.warmup):
+            if setup:
+                setup()
+            func()
+
+        samples = []
+        for _ in range(iterations):
+            if setup:
+                setup()
+            gc.collect()
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1000)
+
+        # Query count and peak memory come from one extra untimed call, since
+        # tracemalloc slows execution down too much to share a pass with timing.
+        if setup:
+            setup()
+        gc.collect()
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as queries:
+            func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return self.record(name, samples, params, units, queries=len(queries), peak_kb=peak / 1024)
+
+    def record(self, name, samples, params=None, units=None, queries=0, peak_kb=0):
+        """
+        Record millisecond ``samples`` taken outside ``measure()``, e.g. timings
+        reported back by a subprocess.
+        """
+        iterations = len(samples)
+        mean = sum(samples) / len(samples)
+        result = {
+            'params': params or {},
+            'iterations': iterations,
+            'mean_ms': round(mean, 3),
+            'min_ms': round(min(samples), 3),
+            'p50_ms': round(percentile(samples, 50), 3),
+            'p90_ms': round(percentile(samples, 90), 3),
+            'p99_ms': round(percentile(samples, 99), 3),
+            'max_ms': round(max(samples), 3),
+            'queries': queries,
+            'peak_kb': round(peak_kb, 1),
+        }
+        if units:
+            result['units'] = units
+            result['units_per_sec'] = round(units / (mean / 1000), 1) if mean else None
+
+        self.results[name] = result
+        if self.stdout:
+            self.stdout.write(
+                f"{name:<50} p50 {result['p50_ms']:>9.2f}ms  p99 {result['p99_ms']:>9.2f}ms  "
+                f"queries {result['queries']:>4}  peak {result['peak_kb']:>9.1f}KB"
+            )
+        return result
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    Compare two result dicts and return a list of regression messages.
+
+    A case regresses when its p50 latency grows by more than ``threshold``
+    (a fraction), its query count grows, or its peak memory grows by more
+    than ``threshold``.
+    """
+    regressions = []
+    for name, new in current.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        if old['p50_ms'] and new['p50_ms'] > old['p50_ms'] * (1 + threshold):
+            regressions.append(
+                f"{name}: p50 {old['p50_ms']:.2f}ms -> {new['p50_ms']:.2f}ms"
+            )
+        if new['queries'] > old['queries']:
+            regressions.append(
+                f"{name}: queries {old['queries']} -> {new['queries']}"
+            )
+        if old['peak_kb'] and new['peak_kb'] > old['peak_kb'] * (1 + threshold):
+            regressions.append(
+                f"{name}: peak memory {old['peak_kb']:.1f}KB -> {new['peak_kb']:.1f}KB"
+            )
+    return regressions
+
+
+def load_all():
+    """Import every benchmark module so their functions register themselves."""
+    from . import api, archive, cv, dedup, load, pdf, pipeline, replicas, startup, summaries, sync, uploads  # noqa: F401
+    return REGISTRY
@@ -0,0 +1,151 @@
+"""
+API endpoint benchmarks: list endpoints at several data sizes and bulk writes.
+"""
+import shutil
+import tempfile
+from pathlib import Path
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api.models import Application, CVMatch
+from api.renderers import ORJSONRenderer
+from api.serializers import ApplicationSerializer, ApplicationValuesSerializer
+from . import benchmark
+from .fixtures import create_dataset, clear_dataset
+from .startup import _probe
+
+EXPORTS = [('applications', '/api/applications/export/'), ('cv_matches', '/api/cv-matches/export/')]
+
+LIST_ENDPOINTS = [
+    ('jobs', '/api/jobs/'),
+    ('applications', '/api/applications/'),
+    ('candidates', '/api/candidates/'),
+    ('cv_matches', '/api/cv-matches/'),
+]
+
+
+@benchmark('api.list')
+def list_endpoints(runner):
+    client = APIClient()
+    for size in runner.sizes:
+        clear_dataset()
+        create_dataset(size)
+        for label, url in LIST_ENDPOINTS:
+            def request(url=url):
+                response = client.get(url)
+                assert response.status_code == 200, response.status_code
+            runner.measure(
+                f'api.list.{label}[{size}]',
+                request,
+                params={'size': size},
+            )
+    clear_dataset()
+
+
+@benchmark('api.shortlist')
+def shortlist(runner):
+    client = APIClient()
+    clear_dataset()
+    jobs = create_dataset(100)
+    url = f'/api/jobs/{jobs[0].id}/shortlist/'
+    cv_matches = list(CVMatch.objects.filter(job=jobs[0]).values_list('id', flat=True))
+
+    def setup():
+        Application.objects.filter(job=jobs[0], candidate__email__startswith='shortlist').delete()
+
+    def request():
+        payload = {'candidates': [
+            {'cv_match': cv_matches[i % len(cv_matches)], 'name': f'Shortlisted {i}', 'email': f'shortlist{i}@example.com'}
+            for i in range(50)
+        ]}
+        response = client.post(url, payload, format='json')
+        assert response.status_code in (200, 201), response.status_code
+
+    runner.measure('api.shortlist[50]', request, setup=setup, params={'candidates': 50}, units=50)
+    clear_dataset()
+
+
+@benchmark('api.export')
+def export(runner):
+    """Stream full exports; peak_kb should stay flat as the row count grows."""
+    client = APIClient()
+    for size in runner.sizes:
+        clear_dataset()
+        create_dataset(size)
+        for label, url in EXPORTS:
+            for output in ('csv', 'ndjson'):
+                def request(url=f'{url}?output={output}'):
+                    response = client.get(url)
+                    assert response.status_code == 200, response.status_code
+                    for _ in response.streaming_content:
+                        pass
+                runner.measure(
+                    f'api.export.{label}.{output}[{size}]',
+                    request,
+                    iterations=max(1, min(runner.iterations, 100000 // size)),
+                    params={'size': size, 'output': output},
+                    units=size,
+                )
+    clear_dataset()
+
+
+@benchmark('api.export_rss')
+def export_rss(runner):
+    """
+    Peak RSS of a process serving each export, which unlike tracemalloc
+    includes the database driver and allocator. Every sample is a fresh
+    interpreter (see ``probe.export``) reading a migrated SQLite file, e.g.
+    ``--only api.export_rss --sizes 1000000 --iterations 1``.
+    """
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        for size in runner.sizes:
+            db = workdir / f'export-{size}.sqlite3'
+            _probe('--prepare-export', str(db), str(size))
+            for label, url in EXPORTS:
+                for output in ('csv', 'ndjson'):
+                    runs = [
+                        _probe('--export', str(db), f'{url}?output={output}')
+                        for _ in range(max(1, min(runner.iterations, 100000 // size)))
+                    ]
+                    params = {
+                        'size': size,
+                        'output': output,
+                        'bytes': runs[0]['bytes'],
+                        'baseline_rss_kb': max(run['baseline_rss_kb'] for run in runs),
+                        'max_rss_kb': max(run['max_rss_kb'] for run in runs),
+                    }
+                    runner.record(
+                        f'api.export_rss.{label}.{output}[{size}]', [run['export_ms'] for run in runs], params, size
+                    )
+                    if runner.stdout:
+                        runner.stdout.write(
+                            f"    max RSS {params['max_rss_kb'] / 1024:.1f}MB "
+                            f"(baseline {params['baseline_rss_kb'] / 1024:.1f}MB)"
+                        )
+            db.unlink()
+    finally:
+        shutil.rmtree(workdir)
+
+
+@benchmark('api.serialize')
+def serialize(runner):
+    """ModelSerializer + DRF JSONRenderer versus .values() rows + orjson, without HTTP."""
+    clear_dataset()
+    create_dataset(10000)
+    queryset = Application.objects.all()
+
+    runner.measure(
+        'api.serialize.applications.model_json[10000]',
+        lambda: JSONRenderer().render(ApplicationSerializer(queryset.select_related('candidate'), many=True).data),
+        iterations=5,
+        units=10000,
+    )
+    runner.measure(
+        'api.serialize.applications.values_orjson[10000]',
+        lambda: ORJSONRenderer().render(ApplicationValuesSerializer(queryset).data),
+        iterations=5,
+        units=10000,
+    )
+    clear_dataset()
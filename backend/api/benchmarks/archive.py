@@ -0,0 +1,80 @@
+"""
+Archival benchmarks: live table size and list / scan latency before and
+after ``archive_jobs --vacuum`` moves the rows of closed jobs to the archive
+tables.
+"""
+import os
+import time
+
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.test import APIClient
+
+from api.models import Application, CVMatch, ArchivedApplication, ArchivedCVMatch
+from . import benchmark
+from .fixtures import clear_dataset, create_dataset
+
+MODELS = [Application, CVMatch, ArchivedApplication, ArchivedCVMatch]
+
+
+def table_kb(model):
+    """Size of ``model``'s table plus its indexes, or None if the database cannot tell."""
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT pg_total_relation_size(%s)', [table])
+        elif connection.vendor == 'sqlite':
+            try:
+                cursor.execute(
+                    'SELECT SUM(pgsize) FROM dbstat WHERE name IN '
+                    '(SELECT name FROM sqlite_master WHERE tbl_name = %s)', [table],
+                )
+            except Exception:
+                # SQLite built without SQLITE_ENABLE_DBSTAT_VTAB
+                return None
+        else:
+            return None
+        size = cursor.fetchone()[0]
+    return round(size / 1024, 1) if size is not None else None
+
+
+@benchmark('archive.lists')
+def lists(runner):
+    size = max(runner.sizes) * 100
+    clear_dataset()
+    create_dataset(size)
+    client = APIClient()
+
+    def measure(label):
+        params = {
+            model._meta.db_table: {'rows': model.objects.count(), 'kb': table_kb(model)}
+            for model in MODELS
+        }
+        for endpoint, model in (('applications', Application), ('cv-matches', CVMatch)):
+            rows = model.objects.count()
+            runner.measure(
+                f'archive.list_{endpoint}[{label}]',
+                lambda: client.get(f'/api/{endpoint}/'),
+                iterations=3,
+                params={'dataset': size, 'tables': params},
+                units=rows,
+            )
+        runner.measure(
+            f'archive.scan_cv_matches[{label}]',
+            lambda: CVMatch.objects.filter(match_score__gte=80, match_status='not_matched').count(),
+            params={'dataset': size},
+        )
+        # bench-0 is closed, so after archiving this reads through to the archive
+        runner.measure(
+            f'archive.job_applications[{label}]',
+            lambda: client.get('/api/applications/?job=bench-0'),
+            params={'dataset': size},
+        )
+
+    measure('before')
+    start = time.perf_counter()
+    call_command('archive_jobs', days=90, vacuum=True, stdout=open(os.devnull, 'w'))
+    runner.record('archive.archive_jobs', [(time.perf_counter() - start) * 1000], params={'dataset': size},
+                  units=ArchivedApplication.objects.count() + ArchivedCVMatch.objects.count())
+    measure('after')
+    clear_dataset()
@@ -0,0 +1,128 @@
+"""
+CV pipeline benchmarks: ``process_cvs`` end to end and its stages in isolation.
+"""
+import itertools
+import random
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APIClient
+
+from api.models import Job, CVMatch
+from api.views import JobViewSet
+from api.skills import job_profile
+from api.scoring import get_vocabulary, job_vector, tfidf_scores, open_job_matrix, rank_jobs
+from . import benchmark
+from .fixtures import cv_text, make_pdf, clear_dataset, create_dataset
+
+REQUIREMENTS = (
+    '5+ years React, TypeScript, Node.js, GraphQL, AWS. Experience with Docker, '
+    'PostgreSQL and REST APIs. Agile team player.'
+)
+
+
+@benchmark('cv.process_cvs')
+def process_cvs(runner):
+    rng = random.Random(0)
+    clear_dataset()
+    job = Job.objects.create(
+        id='bench-cv', title='Engineer', department='Engineering',
+        location='Remote', requirements=REQUIREMENTS,
+    )
+    client = APIClient()
+    url = f'/api/jobs/{job.id}/process_cvs/'
+    counter = itertools.count()
+
+    for batch in (1, 10, 50):
+        if batch > max(runner.sizes):
+            continue
+        pdfs = [make_pdf(cv_text(rng, lines=90)) for _ in range(batch)]
+        files = []
+
+        def setup():
+            # Fresh file names every call so the (job, file_name) unique
+            # constraint never turns a run into an error path.
+            CVMatch.objects.all().delete()
+            run = next(counter)
+            files[:] = [
+                SimpleUploadedFile(f'cv-{run}-{i}.pdf', data, content_type='application/pdf')
+                for i, data in enumerate(pdfs)
+            ]
+
+        def request():
+            response = client.post(url, {'cvs': files}, format='multipart')
+            assert response.status_code == 200, response.status_code
+
+        runner.measure(
+            f'cv.process_cvs[{batch}]',
+            request,
+            setup=setup,
+            iterations=max(3, runner.iterations // batch),
+            params={'batch': batch, 'pages_per_cv': 2},
+            units=batch,
+        )
+    clear_dataset()
+
+
+@benchmark('cv.stages')
+def stages(runner):
+    rng = random.Random(1)
+    view = JobViewSet()
+    texts = [cv_text(rng, lines=90) for _ in range(100)]
+    skills = [view._extract_skills_from_text(text) for text in texts]
+
+    runner.measure(
+        'cv.extract_skills[100]',
+        lambda: [view._extract_skills_from_text(text) for text in texts],
+        params={'cvs': 100},
+        units=100,
+    )
+    profile = job_profile(Job(requirements=REQUIREMENTS))
+    runner.measure(
+        'cv.match_score[100]',
+        lambda: [view._calculate_match_score(s, profile) for s in skills],
+        params={'cvs': 100},
+        units=100,
+    )
+
+
+@benchmark('cv.tfidf')
+def tfidf(runner):
+    rng = random.Random(2)
+    clear_dataset()
+    job = Job.objects.create(
+        id='bench-tfidf', title='Engineer', department='Engineering',
+        location='Remote', requirements=REQUIREMENTS, scoring_engine='tfidf',
+    )
+    texts = [cv_text(rng, lines=90) for _ in range(10000)]
+    CVMatch.objects.bulk_create([
+        CVMatch(job=job, file_name=f'cv-{i}.pdf', extracted_text=text[:1000])
+        for i, text in enumerate(texts[:2000])
+    ])
+    vocabulary = get_vocabulary()
+    job_vector(job, vocabulary)
+
+    runner.measure(
+        'cv.tfidf_scores[10000]',
+        lambda: tfidf_scores(texts, job, vocabulary),
+        iterations=3,
+        params={'cvs': 10000},
+        units=10000,
+    )
+    clear_dataset()
+
+
+@benchmark('cv.rank_jobs')
+def cross_job(runner):
+    """Score one CV against every open job (create_dataset makes size // 10 jobs)."""
+    rng = random.Random(3)
+    text = cv_text(rng, lines=90)
+    for size in runner.sizes:
+        clear_dataset()
+        create_dataset(size * 10)
+        open_job_matrix()
+        runner.measure(
+            f'cv.rank_jobs[{size}]',
+            lambda: rank_jobs(text, 10),
+            params={'jobs': size},
+        )
+    clear_dataset()
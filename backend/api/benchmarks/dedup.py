@@ -0,0 +1,112 @@
+"""
+Duplicate detection benchmarks: clustering CV matches with blocking keys and
+MinHash/LSH as the table grows, against comparing every pair of signatures,
+plus the per-CV cost of extracting contacts and signatures at upload time.
+"""
+import random
+
+import numpy as np
+
+from api.dedup import NUM_PERM, config, dedup_fields, find_duplicates
+from api.models import Job, CVMatch
+from . import benchmark
+from .fixtures import clear_dataset, cv_text
+
+FIRST_NAMES = ['Ana', 'Ben', 'Chen', 'Dara', 'Eli', 'Fatima', 'Goran', 'Hana', 'Ivan', 'Jun']
+LAST_NAMES = ['Silva', 'Okafor', 'Novak', 'Kim', 'Haddad', 'Larsen', 'Moreau', 'Patel', 'Rossi', 'Tanaka']
+DUPLICATE_EVERY = 10
+PAIRWISE_MAX = 10000
+
+
+def _people(rng, size):
+    """
+    ``size`` CVs of distinct people, plus a duplicate of every tenth one:
+    the same CV renamed, the same email on another CV, or an updated CV.
+    Yields ``(person, text)``.
+    """
+    for person in range(size):
+        name = f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+        body = cv_text(rng, lines=12)
+        email = f'person{person}@example.com'
+        yield person, f'{name}\n{email}\n{body}'
+        if person % DUPLICATE_EVERY == 0:
+            kind = person // DUPLICATE_EVERY % 3
+            if kind == 0:
+                yield person, f'{name}\n{email}\n{body}'
+            elif kind == 1:
+                yield person, f'{name}\n{email}\n{cv_text(rng, lines=12)}'
+            else:
+                yield person, f'{name}\n{body}\n{cv_text(rng, lines=2)}'
+
+
+def _create(size, batch=5000):
+    rng = random.Random(4)
+    job = Job.objects.create(id='bench-dedup', title='Engineer', department='Engineering', location='Remote')
+    rows = []
+    for i, (person, text) in enumerate(_people(rng, size)):
+        rows.append(CVMatch(job=job, file_name=f'p{person}-{i}.pdf', extracted_text=text, **dedup_fields(text)))
+        if len(rows) >= batch:
+            CVMatch.objects.bulk_create(rows)
+            rows = []
+    CVMatch.objects.bulk_create(rows)
+
+
+def _accuracy(clusters):
+    """Pairwise precision and recall of ``clusters`` against the person in each file name."""
+    person = dict(
+        (pk, file_name.split('-')[0]) for pk, file_name in CVMatch.objects.values_list('id', 'file_name')
+    )
+    counts = {}
+    for p in person.values():
+        counts[p] = counts.get(p, 0) + 1
+    expected = sum(n * (n - 1) // 2 for n in counts.values())
+    found = correct = 0
+    for cluster in clusters:
+        members = [person[pk] for pk in cluster['cv_matches']]
+        found += len(members) * (len(members) - 1) // 2
+        by_person = {}
+        for p in members:
+            by_person[p] = by_person.get(p, 0) + 1
+        correct += sum(n * (n - 1) // 2 for n in by_person.values())
+    return round(correct / found, 4) if found else 1.0, round(correct / expected, 4) if expected else 1.0
+
+
+def _pairwise(threshold):
+    """Compare every pair of signatures, as clustering without blocking would."""
+    blobs = [blob for blob in CVMatch.objects.values_list('minhash', flat=True) if blob]
+    signatures = np.frombuffer(b''.join(blobs), dtype=np.uint32).reshape(len(blobs), NUM_PERM)
+    pairs = 0
+    for i in range(len(signatures) - 1):
+        pairs += int(((signatures[i + 1:] == signatures[i]).mean(axis=1) >= threshold).sum())
+    return pairs
+
+
+@benchmark('dedup.clusters')
+def clusters(runner):
+    iterations = max(1, runner.iterations // 10)
+    for size in runner.sizes:
+        clear_dataset()
+        _create(size)
+        rows = CVMatch.objects.count()
+        precision, recall = _accuracy(find_duplicates())
+        runner.measure(
+            f'dedup.clusters.lsh[{size}]', find_duplicates, iterations=iterations,
+            params={'cv_matches': rows, 'precision': precision, 'recall': recall}, units=rows,
+        )
+        if size <= PAIRWISE_MAX:
+            threshold = config()['TEXT_THRESHOLD']
+            runner.measure(
+                f'dedup.clusters.pairwise[{size}]', lambda: _pairwise(threshold), iterations=iterations,
+                params={'cv_matches': rows}, units=rows,
+            )
+    clear_dataset()
+
+
+@benchmark('dedup.extract')
+def extract(runner):
+    rng = random.Random(5)
+    texts = [f'Ana Silva\nana@example.com +1 415 555 0199\n{cv_text(rng, lines=90)}' for _ in range(100)]
+    runner.measure(
+        'dedup.extract[100]', lambda: [dedup_fields(text) for text in texts],
+        params={'lines_per_cv': 92}, units=len(texts),
+    )
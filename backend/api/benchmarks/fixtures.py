@@ -0,0 +1,168 @@
+"""
+Synthetic data for benchmarks: model rows and text PDFs.
+"""
+import random
+import zlib
+from datetime import timedelta
+
+from django.utils import timezone
+
+from api.models import (
+    Job, Candidate, Application, CVMatch, TfidfVocabulary, ArchivedApplication, ArchivedCVMatch,
+    Tombstone, CVSummary, batched_tombstones,
+)
+
+SKILL_POOL = [
+    'React', 'TypeScript', 'JavaScript', 'Node.js', 'GraphQL', 'AWS', 'Docker',
+    'Python', 'Django', 'PostgreSQL', 'REST', 'Kubernetes', 'Figma', 'Sketch',
+    'Java', 'Spring', 'Go', 'Rust', 'SQL', 'Redis', 'Agile', 'Scrum', 'HTML',
+    'CSS', 'Machine Learning', 'TensorFlow', 'Microservices', 'Git', 'Azure',
+]
+
+FILLER_WORDS = [
+    'delivered', 'led', 'team', 'projects', 'customers', 'platform', 'designed',
+    'built', 'scaled', 'improved', 'experience', 'years', 'responsible', 'for',
+    'the', 'and', 'with', 'across', 'product', 'quality', 'release', 'mentored',
+]
+
+
+def cv_text(rng, lines=40, skills_per_cv=8):
+    """Return plausible CV text mentioning a random handful of skills."""
+    skills = rng.sample(SKILL_POOL, skills_per_cv)
+    out = []
+    for i in range(lines):
+        words = rng.choices(FILLER_WORDS, k=10)
+        if i % 4 == 0:
+            words.insert(rng.randrange(len(words)), skills[i // 4 % len(skills)])
+        out.append(' '.join(words))
+    return '\n'.join(out)
+
+
+def create_dataset(size, seed=0, batch=10000):
+    """
+    Populate the database with ``size`` candidates and applications spread
+    over ``size // 10`` jobs (at least one), plus ``size`` CV matches.
+    Every fifth job was closed 120 days ago.
+
+    Rows are inserted in batches so millions of rows can be created without
+    holding them all in memory.
+    """
+    rng = random.Random(seed)
+    job_count = max(1, size // 10)
+    closed_at = timezone.now() - timedelta(days=120)
+    for offset in range(0, job_count, batch):
+        Job.objects.bulk_create([
+            Job(
+                id=f'bench-{i}',
+                title=f'Engineer {i}',
+                department='Engineering',
+                location='Remote',
+                requirements=', '.join(rng.sample(SKILL_POOL, 6)),
+                status='Open' if i % 5 else 'Closed',
+                closed_at=None if i % 5 else closed_at,
+            )
+            for i in range(offset, min(offset + batch, job_count))
+        ])
+
+    for offset in range(0, size, batch):
+        indexes = range(offset, min(offset + batch, size))
+        candidates = Candidate.objects.bulk_create([
+            Candidate(
+                name=f'Candidate {i}',
+                email=f'candidate{i}@example.com',
+                phone='+1 555 0100',
+                skills=rng.sample(SKILL_POOL, 6),
+            )
+            for i in indexes
+        ])
+        Application.objects.bulk_create([
+            Application(
+                candidate=candidate,
+                job_id=f'bench-{i % job_count}',
+                job_title=f'Engineer {i % job_count}',
+                match_score=rng.randint(0, 100),
+            )
+            for i, candidate in zip(indexes, candidates)
+        ])
+        CVMatch.objects.bulk_create([
+            CVMatch(
+                job_id=f'bench-{i % job_count}',
+                file_name=f'cv-{i}.pdf',
+                extracted_skills=rng.sample(SKILL_POOL, 6),
+                match_score=rng.randint(0, 100),
+                extracted_text=cv_text(rng, lines=5),
+            )
+            for i in indexes
+        ])
+    return list(Job.objects.order_by('id')[:100])
+
+
+def clear_dataset():
+    with batched_tombstones():
+        Application.objects.all().delete()
+        CVMatch.objects.all().delete()
+        ArchivedApplication.objects.all().delete()
+        ArchivedCVMatch.objects.all().delete()
+        Candidate.objects.all().delete()
+        Job.objects.all().delete()
+    TfidfVocabulary.objects.all().delete()
+    CVSummary.objects.all().delete()
+    Tombstone.objects.all().delete()
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_pdf(text, lines_per_page=45, image_size=0):
+    """
+    Build a minimal PDF with ``text`` laid out in Helvetica, one line per
+    text row, without needing a PDF writing library.
+
+    With ``image_size`` every page also draws a shared ``image_size`` square
+    RGB noise image, as scanned logos and photos weigh down real CVs.
+    """
+    lines = text.split('\n') or ['']
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [['']]
+
+    objects = []
+    # 1: catalog, 2: pages tree, 3: font, 4: image; page and content objects follow.
+    page_ids = [5 + 2 * i for i in range(len(pages))]
+    objects.append(b'<< /Type /Catalog /Pages 2 0 R >>')
+    kids = ' '.join(f'{pid} 0 R' for pid in page_ids)
+    objects.append(f'<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>'.encode())
+    objects.append(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+    side = image_size or 1
+    pixels = zlib.compress(random.Random(side).randbytes(side * side * 3))
+    objects.append(
+        f'<< /Type /XObject /Subtype /Image /Width {side} /Height {side} /ColorSpace /DeviceRGB '
+        f'/BitsPerComponent 8 /Filter /FlateDecode /Length {len(pixels)} >>\nstream\n'.encode()
+        + pixels + b'\nendstream'
+    )
+    for pid, page_lines in zip(page_ids, pages):
+        ops = ['q 200 0 0 200 360 40 cm /Im1 Do Q'] if image_size else []
+        ops += ['BT', '/F1 10 Tf', '14 TL', '50 770 Td']
+        for line in page_lines:
+            ops.append(f'({_escape(line)}) Tj T*')
+        ops.append('ET')
+        stream = '\n'.join(ops).encode('latin-1', 'replace')
+        objects.append(
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            f'/Resources << /Font << /F1 3 0 R >> /XObject << /Im1 4 0 R >> >> '
+            f'/Contents {pid + 1} 0 R >>'.encode()
+        )
+        objects.append(
+            f'<< /Length {len(stream)} >>\nstream\n'.encode() + stream + b'\nendstream'
+        )
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f'{number} 0 obj\n'.encode() + body + b'\nendobj\n'
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    for offset in offsets:
+        out += f'{offset:010d} 00000 n \n'.encode()
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+    return bytes(out)
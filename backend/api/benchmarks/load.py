@@ -0,0 +1,126 @@
+"""
+Load test: latency of ``GET /api/jobs/`` while large CV uploads run, with
+and without the ``process_cvs`` scheduler (``api.scheduler``).
+
+The app is served by a threaded WSGI server in a separate process (like a
+gunicorn gthread worker), and ``UPLOADERS`` clients keep posting 100-CV
+batches while one client lists jobs. Rejected uploads honour Retry-After.
+"""
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from itertools import count
+from pathlib import Path
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+
+from . import benchmark
+from .fixtures import cv_text, make_pdf
+from .probe import JOB_ID
+from .startup import PROBE, _probe
+
+UPLOADERS = 2
+BATCH = 100
+DURATION = 10
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _upload(base, pdf, names):
+    files = [SimpleUploadedFile(f'{next(names)}.pdf', pdf, content_type='application/pdf') for _ in range(BATCH)]
+    request = urllib.request.Request(
+        f'{base}/api/jobs/{JOB_ID}/process_cvs/', data=encode_multipart(BOUNDARY, {'cvs': files}),
+        headers={'Content-Type': MULTIPART_CONTENT}, method='POST',
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            response.read()
+        return 0
+    except urllib.error.HTTPError as e:
+        if e.code != 429:
+            raise
+        return int(e.headers['Retry-After'])
+
+
+def _run(db, pdf, uploaders, scheduler):
+    """Serve ``db`` and return (/jobs/ latencies in ms, CVs processed, uploads rejected)."""
+    port = _free_port()
+    base = f'http://127.0.0.1:{port}'
+    args = [sys.executable, str(PROBE), '--serve', str(db), str(port)] + ([] if scheduler else ['--no-scheduler'])
+    server = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(f'{base}/api/jobs/').read()
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        stop = threading.Event()
+        names = count()
+        stats = {'cvs': 0, 'rejected': 0}
+
+        def uploader():
+            while not stop.is_set():
+                retry_after = _upload(base, pdf, names)
+                if retry_after:
+                    stats['rejected'] += 1
+                    stop.wait(retry_after)
+                else:
+                    stats['cvs'] += BATCH
+
+        threads = [threading.Thread(target=uploader) for _ in range(uploaders)]
+        for thread in threads:
+            thread.start()
+        time.sleep(1 if uploaders else 0)  # let the uploads get going
+
+        latencies = []
+        deadline = time.monotonic() + DURATION
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            urllib.request.urlopen(f'{base}/api/jobs/').read()
+            latencies.append((time.perf_counter() - start) * 1000)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return latencies, stats['cvs'], stats['rejected']
+    finally:
+        server.terminate()
+        server.wait()
+
+
+@benchmark('load.jobs_during_uploads')
+def jobs_during_uploads(runner):
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        template = workdir / 'template.sqlite3'
+        _probe('--prepare', str(template))
+        pdf = make_pdf(cv_text(random.Random(6), lines=90))
+
+        for label, uploaders, scheduler in (
+            ('idle', 0, True),
+            ('uploads,no_scheduler', UPLOADERS, False),
+            ('uploads,scheduler', UPLOADERS, True),
+        ):
+            db = workdir / 'run.sqlite3'
+            shutil.copy(template, db)
+            latencies, cvs, rejected = _run(db, pdf, uploaders, scheduler)
+            runner.record(f'load.jobs[{label}]', latencies, params={
+                'uploaders': uploaders, 'batch': BATCH, 'scheduler': scheduler,
+                'cvs_per_sec': round(cvs / DURATION, 1), 'uploads_rejected': rejected,
+            })
+            db.unlink()
+    finally:
+        shutil.rmtree(workdir)
@@ -0,0 +1,73 @@
+"""
+PDF extraction backends compared on the same corpus: pages/sec and how much
+of the source text (and how many of its skills) each one recovers.
+
+The corpus is generated, so the true text is known. Set ``PDF_CORPUS`` to a
+directory of real CVs to add them too; a ``name.txt`` next to ``name.pdf``
+holds its expected text, without one only speed is reported.
+"""
+import os
+import random
+from collections import Counter
+from pathlib import Path
+
+from api.pdf import BACKENDS, PDFExtractionError, extract_pages
+from api.skills import skill_ids
+from . import benchmark
+from .fixtures import cv_text, make_pdf
+
+
+def _corpus():
+    rng = random.Random(5)
+    documents = [
+        ('cv', cv_text(rng, lines=90), {}),
+        ('long', cv_text(rng, lines=900), {}),
+        ('images', cv_text(rng, lines=90), {'image_size': 600}),
+    ]
+    corpus = [(name, make_pdf(text, **options), text) for name, text, options in documents]
+    if os.environ.get('PDF_CORPUS'):
+        for path in sorted(Path(os.environ['PDF_CORPUS']).glob('*.pdf')):
+            truth = path.with_suffix('.txt')
+            corpus.append((path.stem, path.read_bytes(), truth.read_text() if truth.exists() else None))
+    return corpus
+
+
+def quality(extracted, truth):
+    """Token F1 of ``extracted`` against ``truth`` and the share of its skills found."""
+    found, expected = Counter(extracted.lower().split()), Counter(truth.lower().split())
+    overlap = sum((found & expected).values())
+    precision = overlap / sum(found.values()) if found else 0.0
+    recall = overlap / sum(expected.values()) if expected else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if overlap else 0.0
+    skills = skill_ids(truth)
+    return round(f1, 4), round(len(skill_ids(extracted) & skills) / len(skills), 4) if skills else None
+
+
+@benchmark('pdf.backends')
+def backends(runner):
+    corpus = _corpus()
+    for backend in BACKENDS.values():
+        if not backend.available():
+            runner.stdout and runner.stdout.write(f'pdf.{backend.name}: not installed, skipped')
+            continue
+        for name, data, truth in corpus:
+            try:
+                pages = extract_pages(data, backend)
+            except PDFExtractionError as e:
+                runner.stdout and runner.stdout.write(f'pdf.{backend.name}[{name}]: {e}')
+                continue
+            params = {'backend': backend.name, 'document': name, 'pages': len(pages), 'bytes': len(data)}
+            if truth is not None:
+                params['token_f1'], params['skill_recall'] = quality('\n'.join(pages), truth)
+            result = runner.measure(
+                f'pdf.{backend.name}[{name}]',
+                lambda: backend.pages(data),
+                iterations=max(3, runner.iterations // 4),
+                params=params,
+                units=len(pages),
+            )
+            if runner.stdout:
+                runner.stdout.write(
+                    f"    {result['units_per_sec']:>8.1f} pages/s  token F1 {params.get('token_f1')}  "
+                    f"skill recall {params.get('skill_recall')}"
+                )
@@ -0,0 +1,62 @@
+"""
+Streaming CV pipeline benchmark: peak memory and time to read a very large
+synthetic CV and find its skills, dedup fields and word counts, from the
+whole extracted text as ``process_cvs`` used to against a page at a time
+(``api.pipeline``), for every installed PDF backend.
+
+Peak memory is what tracemalloc sees, i.e. Python objects such as page
+texts; memory held inside native backends (PDFium) is not included.
+"""
+import io
+import random
+
+from django.test import override_settings
+
+from api.dedup import dedup_fields
+from api.pdf import BACKENDS, extract_text
+from api.pipeline import read_cv
+from api.scoring import word_counts
+from api.skills import skill_ids
+from . import benchmark
+from .fixtures import cv_text, make_pdf
+
+LINES_PER_PAGE = 45
+PAGES = (50, 500)
+# Backends too slow to read the largest document in a benchmark run (about
+# 30s per pass for pdfminer); they only read the smaller ones
+SLOW = {'pdfminer'}
+
+
+def _whole(data):
+    text = extract_text(data).text
+    return skill_ids(text), dedup_fields(text), word_counts(text), text[:1000]
+
+
+def _streamed(data):
+    cv = read_cv(io.BytesIO(data))
+    return cv.skill_ids, cv.duplicates.fields(), cv.words, cv.text
+
+
+@benchmark('pipeline.large_pdf')
+def large_pdf(runner):
+    rng = random.Random(6)
+    for pages in PAGES:
+        data = make_pdf(cv_text(rng, lines=pages * LINES_PER_PAGE), lines_per_page=LINES_PER_PAGE)
+        for backend in BACKENDS.values():
+            if not backend.available():
+                runner.stdout and runner.stdout.write(f'pipeline.{backend.name}: not installed, skipped')
+                continue
+            if backend.name in SLOW and pages == max(PAGES):
+                continue
+            params = {'backend': backend.name, 'pages': pages, 'bytes': len(data)}
+            with override_settings(PDF_EXTRACTION={'BACKENDS': [backend.name]}):
+                assert _streamed(data) == _whole(data)
+                iterations = max(1, runner.iterations // 10)
+                for mode, func in (('whole', _whole), ('streamed', _streamed)):
+                    runner.measure(
+                        f'pipeline.{mode}.{backend.name}[{pages}]',
+                        lambda func=func: func(data),
+                        iterations=iterations,
+                        params={**params, 'mode': mode},
+                        units=pages,
+                    )
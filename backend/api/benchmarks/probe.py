@@ -0,0 +1,193 @@
+"""
+Probe run in a fresh interpreter by the ``startup`` and ``load`` benchmarks.
+
+    python probe.py --prepare DB        migrate DB and create the probe jobs
+    python probe.py DB PDF [--warmup]   load the WSGI app and upload PDF twice
+    python probe.py --serve DB PORT [--no-scheduler]
+                                        serve the app on a threaded server
+    python probe.py --replica-reads DB REPLICAS WORKERS SECONDS
+                                        read jobs from REPLICAS copies of DB
+                                        while the primary takes writes
+    python probe.py --prepare-export DB SIZE
+                                        migrate DB and fill it with SIZE rows
+    python probe.py --export DB URL     stream the export at URL, reporting
+                                        the process's peak RSS
+
+Prints timings as JSON. Kept free of Django imports at module level so the
+interpreter starts cold.
+"""
+import json
+import os
+import resource
+import shutil
+import sys
+import time
+from pathlib import Path
+
+JOB_ID = 'bench-startup'
+# Enough for /api/jobs/ to be a realistic interactive request
+LISTED_JOBS = 100
+
+
+def configure(db, warmup, scheduler=True, replicas=()):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'talent_flow.settings')
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = db
+    for i, path in enumerate(replicas):
+        settings.DATABASES[f'replica{i}'] = {**settings.DATABASES['default'], 'NAME': path}
+    settings.DATABASE_REPLICAS = [f'replica{i}' for i in range(len(replicas))]
+    settings.WARMUP = {'ENABLED': warmup, 'DATABASE': True}
+    settings.CV_SCHEDULER = {**getattr(settings, 'CV_SCHEDULER', {}), 'ENABLED': scheduler}
+
+
+def prepare(db):
+    configure(db, warmup=False)
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from api.models import Job
+    from api.scoring import build_vocabulary
+    call_command('migrate', verbosity=0)
+    Job.objects.create(
+        id=JOB_ID, title='Engineer', department='Engineering', location='Remote',
+        requirements='5+ years React, TypeScript, Node.js. Docker is a plus.',
+    )
+    Job.objects.bulk_create([
+        Job(id=f'bench-{i}', title=f'Engineer {i}', department='Engineering', location='Remote',
+            requirements='Python, Django, PostgreSQL and REST APIs. AWS is a plus.')
+        for i in range(LISTED_JOBS)
+    ])
+    build_vocabulary()
+
+
+def serve(db, port, scheduler):
+    configure(db, warmup=True, scheduler=scheduler)
+    from django.core.servers.basehttp import run
+    from talent_flow.wsgi import application
+    run('127.0.0.1', port, application, threading=True)
+
+
+def probe(db, pdf, warmup):
+    start = time.perf_counter()
+    configure(db, warmup)
+    from talent_flow.wsgi import application  # noqa: F401
+    load_app_ms = (time.perf_counter() - start) * 1000
+
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.test import Client
+    client = Client()
+    client.handler.load_middleware()
+    with open(pdf, 'rb') as f:
+        data = f.read()
+
+    timings = []
+    for run in range(2):
+        upload = SimpleUploadedFile(f'cv-{run}.pdf', data, content_type='application/pdf')
+        start = time.perf_counter()
+        response = client.post(f'/api/jobs/{JOB_ID}/process_cvs/', {'cvs': [upload]})
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.status_code
+
+    return {
+        'load_app_ms': load_app_ms,
+        'first_request_ms': timings[0],
+        'second_request_ms': timings[1],
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def replica_reads(db, replicas, workers, seconds):
+    """Reads/sec of ``workers`` forked reader processes while this one writes."""
+    paths = [f'{db}.replica{i}' for i in range(replicas)]
+    for path in paths:
+        shutil.copy(db, path)
+    configure(db, warmup=False, replicas=paths)
+    import django
+    django.setup()
+    import multiprocessing
+    from django.db import connections
+    from api.models import Job, CVMatch
+    from api.routers import read_from_replicas
+
+    def reader(stop, reads):
+        with read_from_replicas():
+            while not stop.is_set():
+                list(Job.objects.values_list('id', 'title', 'requirements')[:100])
+                with reads.get_lock():
+                    reads.value += 1
+
+    context = multiprocessing.get_context('fork')
+    stop, reads = context.Event(), context.Value('i', 0)
+    connections.close_all()
+    processes = [context.Process(target=reader, args=(stop, reads)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    deadline = time.monotonic() + seconds
+    written = 0
+    while time.monotonic() < deadline:
+        CVMatch.objects.create(job_id=JOB_ID, file_name=f'w-{written}.pdf', extracted_text='x' * 1000)
+        written += 1
+    stop.set()
+    for process in processes:
+        process.join()
+    for path in paths:
+        os.unlink(path)
+    return {'reads_per_sec': reads.value / seconds, 'writes_per_sec': written / seconds}
+
+
+def prepare_export(db, size):
+    configure(db, warmup=False)
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from api.benchmarks.fixtures import create_dataset
+    call_command('migrate', verbosity=0)
+    create_dataset(size)
+
+
+def export(db, url):
+    """
+    Stream one export. ``baseline_rss_kb`` is the peak RSS after an empty
+    export (app loaded, connection open), so the difference to
+    ``max_rss_kb`` is what streaming the rows cost.
+    """
+    configure(db, warmup=False)
+    import django
+    django.setup()
+    from django.test import Client
+    client = Client()
+    client.handler.load_middleware()
+
+    def stream(url):
+        response = client.get(url)
+        assert response.status_code == 200, response.status_code
+        return sum(len(chunk) for chunk in response.streaming_content)
+
+    stream(f'{url}&job=no-such-job')
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    size = stream(url)
+    return {
+        'export_ms': (time.perf_counter() - start) * 1000,
+        'bytes': size,
+        'baseline_rss_kb': baseline,
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+if __name__ == '__main__':
+    if sys.argv[1] == '--prepare':
+        prepare(sys.argv[2])
+    elif sys.argv[1] == '--replica-reads':
+        db, replicas, workers, seconds = sys.argv[2], *map(int, sys.argv[3:6])
+        print(json.dumps(replica_reads(db, replicas, workers, seconds)))
+    elif sys.argv[1] == '--prepare-export':
+        prepare_export(sys.argv[2], int(sys.argv[3]))
+    elif sys.argv[1] == '--export':
+        print(json.dumps(export(sys.argv[2], sys.argv[3])))
+    elif sys.argv[1] == '--serve':
+        serve(sys.argv[2], int(sys.argv[3]), '--no-scheduler' not in sys.argv[4:])
+    else:
+        print(json.dumps(probe(sys.argv[1], sys.argv[2], '--warmup' in sys.argv[3:])))
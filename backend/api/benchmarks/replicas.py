@@ -0,0 +1,41 @@
+"""
+Read throughput against 0-3 read replicas (``api.routers``) while the
+primary takes a steady stream of writes.
+
+Each run forks ``WORKERS`` reader processes, like gunicorn workers, that
+list jobs inside ``read_from_replicas()`` against SQLite copies of a
+migrated database; see ``probe.replica_reads``. Samples are milliseconds
+per read, so ``units_per_sec`` is reads per second.
+"""
+import shutil
+import tempfile
+from pathlib import Path
+
+from . import benchmark
+from .startup import _probe
+
+WORKERS = 4
+SECONDS = 5
+
+
+@benchmark('db.replica_reads')
+def replica_reads(runner):
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        template = workdir / 'template.sqlite3'
+        _probe('--prepare', str(template))
+        for replicas in range(4):
+            samples, writes = [], []
+            for _ in range(max(2, runner.iterations // 10)):
+                db = workdir / 'run.sqlite3'
+                shutil.copy(template, db)
+                result = _probe('--replica-reads', str(db), str(replicas), str(WORKERS), str(SECONDS))
+                samples.append(1000 / result['reads_per_sec'])
+                writes.append(result['writes_per_sec'])
+                db.unlink()
+            runner.record(f'db.replica_reads[{replicas}]', samples, params={
+                'replicas': replicas, 'workers': WORKERS,
+                'writes_per_sec': round(sum(writes) / len(writes), 1),
+            }, units=1)
+    finally:
+        shutil.rmtree(workdir)
@@ -0,0 +1,52 @@
+"""
+Startup benchmarks: loading the WSGI app and the first CV upload a fresh
+worker serves, with and without the pre-fork warm-up (``api.warmup``).
+
+Each sample is a new interpreter running ``probe.py`` against a copy of a
+migrated SQLite file, since the state under test is per-process.
+"""
+import json
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from . import benchmark
+from .fixtures import cv_text, make_pdf
+
+PROBE = Path(__file__).with_name('probe.py')
+
+
+def _probe(*args):
+    output = subprocess.run(
+        [sys.executable, str(PROBE), *args], check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1]) if output.strip() else None
+
+
+@benchmark('startup')
+def startup(runner):
+    workdir = Path(tempfile.mkdtemp())
+    try:
+        template = workdir / 'template.sqlite3'
+        pdf = workdir / 'cv.pdf'
+        pdf.write_bytes(make_pdf(cv_text(random.Random(4), lines=90)))
+        _probe('--prepare', str(template))
+
+        iterations = max(3, runner.iterations // 4)
+        for warm in (False, True):
+            runs = []
+            for i in range(iterations):
+                db = workdir / f'run-{i}.sqlite3'
+                shutil.copy(template, db)
+                runs.append(_probe(str(db), str(pdf), *(['--warmup'] if warm else [])))
+                db.unlink()
+
+            label = 'warm' if warm else 'cold'
+            params = {'warmup': warm, 'max_rss_kb': max(run['max_rss_kb'] for run in runs)}
+            for key in ('load_app', 'first_request', 'second_request'):
+                runner.record(f'startup.{key}[{label}]', [run[f'{key}_ms'] for run in runs], params)
+    finally:
+        shutil.rmtree(workdir)
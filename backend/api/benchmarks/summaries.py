@@ -0,0 +1,65 @@
+"""
+Offline summary benchmarks: filling ``Application.ai_summary`` for a batch
+of applications from scratch (in this process and across worker
+processes), from the CV summary cache, and re-running over unchanged CVs.
+"""
+import os
+import random
+
+from api.models import Job, Candidate, CVMatch, Application, CVSummary
+from api.summaries import summarize_applications
+from . import benchmark
+from .fixtures import clear_dataset, cv_text
+
+APPLICATIONS = 10000
+
+
+def _create(count, batch=5000):
+    rng = random.Random(6)
+    job = Job.objects.create(id='bench-summaries', title='Engineer', department='Engineering', location='Remote')
+    for offset in range(0, count, batch):
+        indexes = range(offset, min(offset + batch, count))
+        candidates = Candidate.objects.bulk_create([
+            Candidate(name=f'Candidate {i}', email=f'summary{i}@example.com', phone='')
+            for i in indexes
+        ])
+        CVMatch.objects.bulk_create([
+            CVMatch(job=job, file_name=f'cv-{i}.pdf', candidate=candidate, extracted_text=cv_text(rng, lines=12))
+            for i, candidate in zip(indexes, candidates)
+        ])
+        Application.objects.bulk_create([
+            Application(candidate=candidate, job=job, job_title=job.title)
+            for candidate in candidates
+        ])
+
+
+@benchmark('summaries.applications')
+def applications(runner):
+    count = min(APPLICATIONS, max(runner.sizes))
+    clear_dataset()
+    _create(count)
+    workers = os.cpu_count() or 1
+
+    def cold():
+        CVSummary.objects.all().delete()
+        Application.objects.update(ai_summary='', ai_summary_hash='')
+
+    def cached():
+        Application.objects.update(ai_summary='', ai_summary_hash='')
+
+    def run(workers, expected):
+        def fill():
+            counts = summarize_applications(workers=workers)
+            assert counts[expected] == count, counts
+        return fill
+
+    iterations = max(1, runner.iterations // 10)
+    params = {'applications': count, 'cpus': workers}
+    for n in sorted({1, workers}):
+        runner.measure(f'summaries.cold[{count}x{n}]', run(n, 'summarized'), setup=cold,
+                       iterations=iterations, params={**params, 'workers': n}, units=count)
+    runner.measure(f'summaries.cached[{count}]', run(1, 'cached'), setup=cached,
+                   iterations=iterations, params=params, units=count)
+    runner.measure(f'summaries.unchanged[{count}]', run(1, 'unchanged'),
+                   iterations=iterations, params=params, units=count)
+    clear_dataset()
@@ -0,0 +1,55 @@
+"""
+Delta sync benchmarks: a full ``/api/changes/`` download of jobs and
+applications against a delta with a handful of changes, as the tables grow.
+"""
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from api.models import Application
+from . import benchmark
+from .fixtures import clear_dataset, create_dataset
+
+CHANGES = 10
+
+
+@benchmark('sync.changes')
+def changes(runner):
+    client = APIClient()
+    url = '/api/changes/?models=jobs,applications'
+
+    def get(url):
+        response = client.get(url)
+        assert response.status_code == 200, response.status_code
+        return response
+
+    # Without the overlap window the freshly created dataset would count as changed
+    with override_settings(SYNC={'OVERLAP_SECONDS': 0}):
+        for size in runner.sizes:
+            clear_dataset()
+            create_dataset(size)
+            full = get(url)
+            token = full.json()['token']
+            patched = list(Application.objects.order_by('?').values_list('pk', flat=True)[:CHANGES])
+            for pk in patched:
+                client.patch(f'/api/applications/{pk}/update_notes/', {'notes': 'synced'}, format='json')
+            # Delete an unpatched row when there is one (small sizes have none)
+            deleted = Application.objects.exclude(pk__in=patched).order_by('?').first() or (
+                Application.objects.get(pk=patched[-1])
+            )
+            deleted_pk = deleted.pk
+            deleted.delete()
+            delta = get(f'{url}&since={token}').json()
+            expected = len(patched) - (deleted_pk in patched)
+            assert len(delta['applications']) == expected, (len(delta['applications']), expected)
+            assert deleted_pk in delta['deleted']['applications'], deleted_pk
+            delta_bytes = len(get(f'{url}&since={token}').content)
+
+            runner.measure(
+                f'sync.full[{size}]', lambda: get(url),
+                params={'size': size, 'bytes': len(full.content)},
+            )
+            runner.measure(
+                f'sync.delta[{size}]', lambda: get(f'{url}&since={token}'),
+                params={'size': size, 'changes': len(patched) + 1, 'bytes': delta_bytes},
+            )
+    clear_dataset()
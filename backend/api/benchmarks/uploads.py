@@ -0,0 +1,122 @@
+"""
+Resumable upload benchmarks: a batch of CVs sent through upload sessions
+against one multipart ``process_cvs`` POST, and the cost of finishing a
+batch whose connection dropped halfway.
+"""
+import itertools
+import random
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from api.models import Job, CVMatch
+from . import benchmark
+from .cv import REQUIREMENTS
+from .fixtures import cv_text, make_pdf, clear_dataset
+
+BATCH = 50
+
+
+def _put(client, url, data, start, total):
+    end = start + len(data) - 1
+    response = client.generic(
+        'PUT', url, data, content_type='application/octet-stream',
+        HTTP_CONTENT_RANGE=f'bytes {start}-{end}/{total}',
+    )
+    assert response.status_code == 200, response.content
+    return response.json()
+
+
+@benchmark('cv.uploads')
+def uploads(runner):
+    rng = random.Random(2)
+    clear_dataset()
+    job = Job.objects.create(
+        id='bench-upload', title='Engineer', department='Engineering',
+        location='Remote', requirements=REQUIREMENTS,
+    )
+    client = APIClient()
+    batch = min(BATCH, max(runner.sizes))
+    pdfs = [make_pdf(cv_text(rng, lines=90)) for _ in range(batch)]
+    counter = itertools.count()
+    state = {}
+    workdir = tempfile.mkdtemp()
+
+    def setup():
+        CVMatch.objects.all().delete()
+        run = next(counter)
+        state['names'] = [f'cv-{run}-{i}.pdf' for i in range(batch)]
+        state['session'] = client.post(f'/api/jobs/{job.id}/uploads/').json()['id']
+
+    def session_url():
+        return f'/api/jobs/{job.id}/uploads/{state["session"]}'
+
+    def send(files, chunks=2):
+        for name, data in files:
+            url = f'{session_url()}/files/{name}/'
+            size = -(-len(data) // chunks)
+            for start in range(0, len(data), size):
+                _put(client, url, data[start:start + size], start, len(data))
+
+    def commit():
+        response = client.post(f'{session_url()}/commit/')
+        assert response.status_code == 200, response.content
+        assert response.json()['total_processed'] == batch
+
+    def multipart():
+        files = [
+            SimpleUploadedFile(name, data, content_type='application/pdf')
+            for name, data in zip(state['names'], pdfs)
+        ]
+        response = client.post(f'/api/jobs/{job.id}/process_cvs/', {'cvs': files}, format='multipart')
+        assert response.status_code == 200, response.status_code
+
+    def resumable(chunks):
+        def upload():
+            send(zip(state['names'], pdfs), chunks)
+            commit()
+        return upload
+
+    def drop_halfway():
+        # Setup: half the files arrive, then the connection drops mid-file
+        setup()
+        half = batch // 2
+        send(zip(state['names'][:half], pdfs[:half]))
+        data = pdfs[half]
+        _put(client, f'{session_url()}/files/{state["names"][half]}/', data[:len(data) // 2], 0, len(data))
+
+    def resume():
+        files = client.get(f'{session_url()}/').json()['files']
+        received = {f['name']: f['received'] for f in files if f['status'] != 'uploading'}
+        offsets = {f['name']: f['received'] for f in files if f['status'] == 'uploading'}
+        for name, data in zip(state['names'], pdfs):
+            if name in received:
+                continue
+            start = offsets.get(name, 0)
+            _put(client, f'{session_url()}/files/{name}/', data[start:], start, len(data))
+        commit()
+
+    def retried():
+        # Every chunk is sent twice, as after lost acknowledgements
+        send(zip(state['names'], pdfs))
+        send(zip(state['names'], pdfs))
+        commit()
+        assert CVMatch.objects.count() == batch
+
+    iterations = max(3, runner.iterations // batch)
+    params = {'batch': batch, 'pages_per_cv': 2}
+    with override_settings(UPLOADS={'DIRECTORY': workdir}):
+        runner.measure(f'cv.uploads.multipart[{batch}]', multipart, setup=setup,
+                       iterations=iterations, params=params, units=batch)
+        for chunks in (1, 2):
+            runner.measure(f'cv.uploads.resumable[{batch}x{chunks}]', resumable(chunks), setup=setup,
+                           iterations=iterations, params={**params, 'chunks_per_file': chunks}, units=batch)
+        runner.measure(f'cv.uploads.retried[{batch}]', retried, setup=setup,
+                       iterations=iterations, params={**params, 'chunks_per_file': 2}, units=batch)
+        runner.measure(f'cv.uploads.resume_after_drop[{batch}]', resume, setup=drop_halfway,
+                       iterations=iterations, params={**params, 'dropped_at': batch // 2}, units=batch)
+    shutil.rmtree(workdir, ignore_errors=True)
+    clear_dataset()
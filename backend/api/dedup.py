@@ -0,0 +1,419 @@
+"""
+Duplicate candidate detection.
+
+The same person shows up as a ``CVMatch`` for every job they send a CV to,
+and sometimes as several ``Candidate`` records. When a CV is processed its
+email, phone and name are extracted from the text and a MinHash signature of
+its word shingles is stored on the ``CVMatch``. ``find_duplicates()`` then
+clusters candidates and CV matches without comparing every pair:
+
+- records sharing an email, or a phone that is not shared by more than
+  ``MAX_PHONE_SHARES`` records (switchboards, placeholders), are the same
+  person;
+- CV matches with the same name are the same person when their texts are
+  at least ``NAME_THRESHOLD`` similar (an updated CV);
+- CV matches whose signatures collide in an LSH band are the same person
+  when their texts are at least ``TEXT_THRESHOLD`` similar (the same CV
+  under another file name).
+
+Every pair is compared only within uncommon names; LSH buckets are compared
+against their first member, and a pair missed in one band is usually caught
+in another, so the work stays linear in the number of records.
+``merge_candidates()`` folds a cluster into one candidate.
+"""
+import re
+import zlib
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Candidate, CVMatch, Application, ArchivedCVMatch, ArchivedApplication, batched_tombstones
+
+DEFAULTS = {
+    'TEXT_THRESHOLD': 0.8,
+    'NAME_THRESHOLD': 0.3,
+    'MAX_PHONE_SHARES': 10,
+}
+
+# Changing these invalidates every stored signature
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE = 3
+MIN_WORDS = 20
+# Names shared by more CVs than this are only compared through LSH
+NAME_BUCKET = 50
+_PRIME = (1 << 31) - 1
+_state = np.random.RandomState(20261019)
+_A = _state.randint(1, _PRIME, size=NUM_PERM).astype(np.uint64)
+_B = _state.randint(0, _PRIME, size=NUM_PERM).astype(np.uint64)
+
+EMAIL_RE = re.compile(r'[a-z0-9._%+-]+@[a-z0-9-]+(?:\.[a-z0-9-]+)*\.[a-z]{2,}', re.IGNORECASE)
+PHONE_RE = re.compile(r'(?<![\w/])\+?(?:\(\d{1,4}\)|\d{1,4})(?:[ .-]?(?:\(\d{1,4}\)|\d{2,4})){2,5}(?![\w/])')
+PHONE_DIGITS = 9
+NAME_RE = re.compile(r"[A-Z][A-Za-z'-]+(?:[ \t]+(?:[A-Z]\.|[A-Z][A-Za-z'-]+)){1,3}")
+NAME_LABEL_RE = re.compile(r'^name\s*[:-]\s*', re.IGNORECASE)
+NAME_LINES = 3
+NOT_NAMES = frozenset("""
+curriculum vitae resume cv profile summary contact experience education skills
+senior junior lead principal engineer developer manager designer analyst
+consultant architect scientist intern
+""".split())
+WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+class MergeError(Exception):
+    """The records to merge are missing or cannot form a candidate."""
+
+
+def config():
+    return {**DEFAULTS, **getattr(settings, 'DEDUP', {})}
+
+
+class ContactFinder:
+    """Finds the email, phone and name of a CV in its text, fed a page at a time."""
+
+    def __init__(self):
+        self.email = self.phone = self.name = ''
+        self.lines = 0
+
+    def feed(self, text):
+        # Neither pattern spans a line break, so nothing is lost between pages
+        if not self.email:
+            match = EMAIL_RE.search(text)
+            self.email = match.group().lower() if match else ''
+        if not self.phone:
+            self.phone = next(
+                (match.group().strip()[:20] for match in PHONE_RE.finditer(text)
+                 if len(re.sub(r'\D', '', match.group())) >= PHONE_DIGITS),
+                '',
+            )
+        for line in text.splitlines():
+            if self.name or self.lines >= NAME_LINES:
+                break
+            line = line.strip()
+            if not line:
+                continue
+            self.lines += 1
+            line = NAME_LABEL_RE.sub('', line)
+            if NAME_RE.fullmatch(line) and not NOT_NAMES & set(line.lower().split()):
+                self.name = line[:200]
+
+
+def extract_contacts(text):
+    """Return ``(email, phone, name)`` found near the top of a CV; missing ones are ''."""
+    finder = ContactFinder()
+    finder.feed(text)
+    return finder.email, finder.phone, finder.name
+
+
+def phone_key(phone):
+    digits = re.sub(r'\D', '', phone)
+    return digits[-PHONE_DIGITS:] if len(digits) >= PHONE_DIGITS else ''
+
+
+def name_key(name):
+    """Order-insensitive form of ``name``, ignoring initials: "Smith, J. John" -> "john smith"."""
+    words = sorted(word for word in re.findall(r"[a-z'-]+", name.lower()) if len(word) > 1)
+    return ' '.join(words) if len(words) >= 2 else ''
+
+
+class MinHasher:
+    """Builds the ``signature()`` of a text fed a page at a time."""
+
+    def __init__(self):
+        self.minimum = np.full(NUM_PERM, _PRIME, dtype=np.uint64)
+        # Last words of the previous page, for the shingles spanning pages
+        self.tail = []
+        self.words = 0
+
+    def feed(self, text):
+        words = self.tail + WORD_RE.findall(text.lower())
+        self.words += len(words) - len(self.tail)
+        if len(words) >= SHINGLE:
+            shingles = {' '.join(words[i:i + SHINGLE]) for i in range(len(words) - SHINGLE + 1)}
+            hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+            hashes %= _PRIME
+            minimum = ((_A[:, None] * hashes[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+            np.minimum(self.minimum, minimum, out=self.minimum)
+        self.tail = words[-(SHINGLE - 1):]
+
+    def signature(self):
+        return self.minimum.astype(np.uint32).tobytes() if self.words >= MIN_WORDS else b''
+
+
+def signature(text):
+    """MinHash signature of the word shingles of ``text`` as bytes, or b'' for short texts."""
+    hasher = MinHasher()
+    hasher.feed(text)
+    return hasher.signature()
+
+
+class DuplicateFields:
+    """The ``CVMatch`` dedup fields of a CV, from its text fed a page at a time."""
+
+    def __init__(self):
+        self.contacts = ContactFinder()
+        self.minhash = MinHasher()
+
+    def feed(self, text):
+        self.contacts.feed(text)
+        self.minhash.feed(text)
+
+    def fields(self):
+        return {
+            'email': self.contacts.email,
+            'phone': self.contacts.phone,
+            'candidate_name': self.contacts.name,
+            'minhash': self.minhash.signature(),
+        }
+
+
+def dedup_fields(text):
+    """The ``CVMatch`` dedup fields for a CV's full text."""
+    fields = DuplicateFields()
+    fields.feed(text)
+    return fields.fields()
+
+
+def backfill(batch_size=1000):
+    """Compute the dedup fields of CV matches stored before they existed; return how many."""
+    count = 0
+    while True:
+        batch = list(CVMatch.objects.filter(minhash__isnull=True).only('id', 'extracted_text')[:batch_size])
+        if not batch:
+            return count
+        now = timezone.now()
+        for cv_match in batch:
+            for field, value in dedup_fields(cv_match.extracted_text).items():
+                setattr(cv_match, field, value)
+            # The contacts are synced fields (see api.sync)
+            cv_match.updated_at = now
+        CVMatch.objects.bulk_update(batch, ['email', 'phone', 'candidate_name', 'minhash', 'updated_at'])
+        count += len(batch)
+
+
+class _Clusters:
+    """Union-find over record indexes, remembering why records were joined."""
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.edges = []
+
+    def find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, a, b, reason):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[rb] = ra
+            self.edges.append((a, reason))
+
+    def union_buckets(self, buckets, reason, max_size=None):
+        for members in buckets.values():
+            if len(members) > 1 and (max_size is None or len(members) <= max_size):
+                for member in members[1:]:
+                    self.union(members[0], member, reason)
+
+    def groups(self):
+        groups, reasons = {}, {}
+        for i in range(len(self.parent)):
+            groups.setdefault(self.find(i), []).append(i)
+        for i, reason in self.edges:
+            reasons.setdefault(self.find(i), set()).add(reason)
+        return [(members, reasons[root]) for root, members in groups.items() if len(members) > 1]
+
+
+def _text_edges(signatures, threshold):
+    """
+    ``(a, b)`` index pairs of rows of ``signatures`` (one per row) that
+    collide in an LSH band and are at least ``threshold`` similar, and their
+    similarities.
+    """
+    count = len(signatures)
+    if count < 2:
+        return np.empty((0, 2), dtype=np.int64), np.empty(0)
+    bands = signatures.reshape(count, BANDS, ROWS).astype(np.uint64)
+    keys = bands[:, :, 0]
+    for row in range(1, ROWS):
+        keys = keys * np.uint64(1000003) ^ bands[:, :, row]
+
+    edges = []
+    for band in range(BANDS):
+        order = np.argsort(keys[:, band], kind='stable')
+        sorted_keys = keys[order, band]
+        starts = np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]])
+        first = order[np.flatnonzero(starts)[np.cumsum(starts) - 1]]
+        members = first != order
+        a, b = first[members], order[members]
+        similar = (signatures[a] == signatures[b]).mean(axis=1) >= threshold
+        edges.append(np.stack([a[similar], b[similar]], axis=1))
+    edges = np.unique(np.concatenate(edges), axis=0)
+    return edges, (signatures[edges[:, 0]] == signatures[edges[:, 1]]).mean(axis=1)
+
+
+def find_duplicates():
+    """
+    Clusters of records that look like the same person and are not merged
+    yet, largest first, as ``{'candidates': ids, 'cv_matches': ids,
+    'reasons': [...]}``.
+    """
+    options = config()
+    candidates = list(Candidate.objects.values_list('id', 'email', 'phone'))
+    cv_matches = list(CVMatch.objects.values_list('id', 'email', 'phone', 'candidate_name', 'minhash', 'candidate_id'))
+    offset = len(candidates)
+    clusters = _Clusters(offset + len(cv_matches))
+    candidate_index = {pk: i for i, (pk, _, _) in enumerate(candidates)}
+
+    emails, phones, names = {}, {}, {}
+    for i, (_, email, phone) in enumerate(candidates):
+        emails.setdefault(email.lower(), []).append(i)
+        phones.setdefault(phone_key(phone), []).append(i)
+    signed, name_keys = [], {}
+    for i, (_, email, phone, name, minhash, candidate_id) in enumerate(cv_matches, offset):
+        emails.setdefault(email, []).append(i)
+        phones.setdefault(phone_key(phone), []).append(i)
+        if candidate_id in candidate_index:
+            clusters.union(candidate_index[candidate_id], i, 'linked')
+        if minhash:
+            name_keys[i] = name_key(name)
+            names.setdefault(name_keys[i], []).append(i)
+            signed.append(i)
+    emails.pop('', None)
+    phones.pop('', None)
+    names.pop('', None)
+    clusters.union_buckets(emails, 'email')
+    clusters.union_buckets(phones, 'phone', options['MAX_PHONE_SHARES'])
+
+    if not signed:
+        return _unmerged(clusters, candidates, cv_matches)
+    signatures = np.frombuffer(
+        b''.join(cv_matches[i - offset][4] for i in signed), dtype=np.uint32
+    ).reshape(len(signed), NUM_PERM)
+    row = {i: r for r, i in enumerate(signed)}
+
+    # Uncommon names: compare every pair of CVs with that name. Common
+    # names are left to the LSH pass below.
+    for members in names.values():
+        if 1 < len(members) <= NAME_BUCKET:
+            block = signatures[[row[i] for i in members]]
+            similar = (block[:, None, :] == block[None, :, :]).mean(axis=2) >= options['NAME_THRESHOLD']
+            for a, b in zip(*np.nonzero(np.triu(similar, 1))):
+                clusters.union(members[a], members[b], 'name')
+
+    # Texts colliding in an LSH band: the same CV, or a CV under the same name
+    threshold = min(options['TEXT_THRESHOLD'], options['NAME_THRESHOLD'])
+    edges, similarities = _text_edges(signatures, threshold)
+    for (a, b), value in zip(edges.tolist(), similarities.tolist()):
+        a, b = signed[a], signed[b]
+        if value >= options['TEXT_THRESHOLD']:
+            clusters.union(a, b, 'text')
+        elif name_keys[a] and name_keys[a] == name_keys[b]:
+            clusters.union(a, b, 'name')
+    return _unmerged(clusters, candidates, cv_matches)
+
+
+def _unmerged(clusters, candidates, cv_matches):
+    """The clusters of ``find_duplicates()`` that still need merging."""
+    offset = len(candidates)
+    result = []
+    for members, reasons in clusters.groups():
+        candidate_ids = [candidates[i][0] for i in members if i < offset]
+        cv_rows = [cv_matches[i - offset] for i in members if i >= offset]
+        # Already merged: one candidate with every CV linked to it
+        if len(candidate_ids) == 1 and all(row[5] == candidate_ids[0] for row in cv_rows):
+            continue
+        result.append({
+            'candidates': sorted(candidate_ids),
+            'cv_matches': sorted(row[0] for row in cv_rows),
+            'reasons': sorted(reasons),
+        })
+    result.sort(key=lambda cluster: -(len(cluster['candidates']) + len(cluster['cv_matches'])))
+    return result
+
+
+def _candidate_from(cv_matches):
+    """The candidate of the CV matches' extracted email, created if needed."""
+    cv_match = next((cv_match for cv_match in cv_matches if cv_match.email), None)
+    if cv_match is None:
+        raise MergeError('None of the CV matches has an email to create the candidate with')
+    candidate, _ = Candidate.objects.get_or_create(email=cv_match.email, defaults={
+        'name': next((c.candidate_name for c in cv_matches if c.candidate_name), cv_match.email.split('@')[0]),
+        'phone': next((c.phone for c in cv_matches if c.phone), ''),
+        'resume_url': f'/resumes/{cv_match.file_name}',
+    })
+    return candidate
+
+
+def merge_candidates(candidate_ids=(), cv_match_ids=(), target_id=None):
+    """
+    Fold candidates and CV matches into one candidate and return it with
+    counts of what changed.
+
+    The target is ``target_id``, else the first of ``candidate_ids``, else
+    the candidate of the CV matches' email (created if needed). The other
+    candidates' applications move to the target and the candidates are
+    deleted; where both applied to the same job the target's application is
+    kept. Blank target details are filled in from the others, skills are
+    combined and the CV matches are linked to the target.
+    """
+    candidate_ids = list(dict.fromkeys(candidate_ids))
+    if target_id is not None and target_id not in candidate_ids:
+        candidate_ids.insert(0, target_id)
+    with transaction.atomic():
+        candidates = Candidate.objects.select_for_update().in_bulk(candidate_ids)
+        cv_matches = list(CVMatch.objects.filter(pk__in=cv_match_ids).order_by('pk'))
+        missing = set(candidate_ids) - candidates.keys()
+        if missing:
+            raise MergeError(f'Candidates not found: {sorted(missing)}')
+        missing = set(cv_match_ids) - {cv_match.pk for cv_match in cv_matches}
+        if missing:
+            raise MergeError(f'CV matches not found: {sorted(missing)}')
+        if candidate_ids:
+            target = candidates[candidate_ids[0]]
+        elif cv_matches:
+            target = _candidate_from(cv_matches)
+        else:
+            raise MergeError('Nothing to merge')
+        sources = [candidates[pk] for pk in candidate_ids if pk != target.pk]
+        now = timezone.now()
+
+        taken = set(Application.objects.filter(candidate=target).values_list('job_id', flat=True))
+        moved, duplicates = [], []
+        for application in Application.objects.filter(candidate__in=sources).order_by('applied_at', 'pk'):
+            if application.job_id in taken:
+                duplicates.append(application.pk)
+            else:
+                taken.add(application.job_id)
+                moved.append(application.pk)
+        Application.objects.filter(pk__in=moved).update(candidate=target, updated_at=now)
+        ArchivedApplication.objects.filter(candidate__in=sources).update(candidate=target)
+        ArchivedCVMatch.objects.filter(candidate__in=sources).update(candidate=target)
+        CVMatch.objects.filter(candidate__in=sources).update(candidate=target, updated_at=now)
+        CVMatch.objects.filter(pk__in=cv_match_ids).update(candidate=target, updated_at=now)
+
+        for source in sources:
+            for field in ('name', 'phone', 'resume_url'):
+                if not getattr(target, field) and getattr(source, field):
+                    setattr(target, field, getattr(source, field))
+        if not target.phone:
+            target.phone = next((c.phone for c in cv_matches if c.phone), '')
+        for skills in [source.skills for source in sources] + [c.extracted_skills for c in cv_matches]:
+            target.skills = target.skills + [s for s in skills if s not in target.skills]
+        target.save()
+
+        with batched_tombstones():
+            Application.objects.filter(pk__in=duplicates).delete()
+            Candidate.objects.filter(pk__in=[source.pk for source in sources]).delete()
+    return target, {
+        'merged_candidates': len(sources),
+        'moved_applications': len(moved),
+        'deleted_applications': len(duplicates),
+        'linked_cv_matches': len(cv_matches),
+    }
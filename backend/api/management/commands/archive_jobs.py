@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from api.archive import ARCHIVES, BATCH_SIZE, ArchiveError, archivable_jobs, archive_jobs
+
+# Jobs whose rows are moved together, so jobs with few rows share batches
+JOBS_PER_RUN = 500
+
+class Command(BaseCommand):
+    help = 'Move CV matches and applications of jobs closed more than N days ago to the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90, help='Archive jobs closed more than this many days ago')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Rows moved per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only list the jobs that would be archived')
+        parser.add_argument(
+            '--vacuum', action='store_true',
+            help='Reclaim the space freed in the live tables afterwards (SQLite rewrites the whole file)',
+        )
+
+    def handle(self, *args, **options):
+        jobs = archivable_jobs(options['days']).order_by('closed_at')
+        if options['dry_run']:
+            count = 0
+            for job in jobs.iterator():
+                self.stdout.write(f'{job.pk}: {job.title} (closed {job.closed_at:%Y-%m-%d})')
+                count += 1
+            self.stdout.write(f'{count} jobs would be archived')
+            return
+
+        start = time.perf_counter()
+        job_ids = list(jobs.values_list('pk', flat=True))
+        archived = rows = 0
+        for offset in range(0, len(job_ids), JOBS_PER_RUN):
+            group = job_ids[offset:offset + JOBS_PER_RUN]
+            try:
+                counts = archive_jobs(group, options['batch_size'])
+            except ArchiveError as e:
+                self.stderr.write(str(e))
+                continue
+            archived += len(group)
+            rows += sum(counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {archived} jobs ({rows} rows) in {time.perf_counter() - start:.1f}s'
+        ))
+
+        if options['vacuum'] and rows:
+            with connection.cursor() as cursor:
+                if connection.vendor == 'sqlite':
+                    cursor.execute('VACUUM')
+                elif connection.vendor == 'postgresql':
+                    for model in ARCHIVES:
+                        cursor.execute(f'VACUUM ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+            self.stdout.write('Vacuumed the live tables')
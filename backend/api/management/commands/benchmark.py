@@ -0,0 +1,76 @@
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.benchmarks import Runner, compare, load_all
+
+
+class Command(BaseCommand):
+    help = 'Run performance benchmarks against a throwaway test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='10,100,1000',
+            help='Comma-separated dataset sizes for size-dependent benchmarks',
+        )
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument(
+            '--only', default='*',
+            help='Glob matched against benchmark names, e.g. "cv.*"',
+        )
+        parser.add_argument('--output', help='Write results to this JSON file')
+        parser.add_argument('--compare', help='Baseline JSON file to check for regressions')
+        parser.add_argument(
+            '--threshold', type=float, default=0.2,
+            help='Allowed slowdown fraction before a case counts as a regression',
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',') if size]
+        registry = load_all()
+        selected = {name: func for name, func in registry.items() if fnmatch(name, options['only'])}
+        if not selected:
+            raise CommandError(f"No benchmarks match {options['only']!r}")
+
+        runner = Runner(sizes, iterations=options['iterations'], stdout=self.stdout)
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            for name, func in selected.items():
+                self.stdout.write(self.style.MIGRATE_HEADING(name))
+                func(runner)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report = {
+            'meta': {
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'python': sys.version.split()[0],
+                'django': django.get_version(),
+                'platform': platform.platform(),
+                'database': connection.vendor,
+                'sizes': sizes,
+            },
+            'results': runner.results,
+        }
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        if options['compare']:
+            with open(options['compare']) as fh:
+                baseline = json.load(fh)
+            regressions = compare(baseline['results'], runner.results, options['threshold'])
+            if regressions:
+                for line in regressions:
+                    self.stdout.write(self.style.ERROR(line))
+                raise CommandError(f'{len(regressions)} regression(s) against {options["compare"]}')
+            self.stdout.write(self.style.SUCCESS('No regressions against baseline'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from api.models import Job
+from api.scoring import build_vocabulary, get_vocabulary, job_vector
+
+class Command(BaseCommand):
+    help = 'Rebuild the TF-IDF vocabulary from stored CVs and jobs and precompute job vectors'
+
+    def handle(self, *args, **options):
+        record = build_vocabulary()
+        self.stdout.write(f'Built vocabulary {record.pk}: {record.term_count} terms from {record.document_count} documents')
+
+        vocabulary = get_vocabulary()
+        count = 0
+        for job in Job.objects.filter(scoring_engine='tfidf').iterator():
+            job_vector(job, vocabulary)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Precomputed vectors for {count} TF-IDF jobs'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from api.uploads import delete_session, expired_sessions
+
+class Command(BaseCommand):
+    help = 'Delete upload sessions (and their part files) older than UPLOADS["EXPIRE_HOURS"]'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=float, help='Override UPLOADS["EXPIRE_HOURS"]')
+
+    def handle(self, *args, **options):
+        count = 0
+        for session in expired_sessions(options['hours']).iterator():
+            delete_session(session)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Deleted {count} upload sessions'))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+from api.dedup import backfill, find_duplicates
+
+class Command(BaseCommand):
+    help = 'Report clusters of candidates and CV matches that look like the same person'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20, help='Clusters to list')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='CV matches per batch when filling in contacts of older CVs'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        filled = backfill(options['batch_size'])
+        if filled:
+            self.stdout.write(f'Extracted contacts and signatures of {filled} older CV matches')
+        clusters = find_duplicates()
+        for cluster in clusters[:options['limit']]:
+            self.stdout.write(
+                f'candidates={cluster["candidates"]} cv_matches={cluster["cv_matches"]} '
+                f'({", ".join(cluster["reasons"])})'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Found {len(clusters)} clusters in {time.perf_counter() - started:.1f}s'
+        ))
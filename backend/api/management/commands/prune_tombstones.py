@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from api.sync import prune_tombstones
+
+class Command(BaseCommand):
+    help = 'Delete tombstones of deleted rows older than SYNC["TOMBSTONE_DAYS"]'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Override SYNC["TOMBSTONE_DAYS"]')
+
+    def handle(self, *args, **options):
+        count = prune_tombstones(options['days'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {count} tombstones'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from api.models import Job
+from api.skills import PROFILE_VERSION, parse_requirements
+
+class Command(BaseCommand):
+    help = 'Store the requirement profiles of jobs whose profile is missing or outdated'
+
+    def handle(self, *args, **options):
+        stale = [
+            job for job in Job.objects.only('id', 'requirements', 'requirements_profile').iterator()
+            if (job.requirements_profile or {}).get('version') != PROFILE_VERSION
+        ]
+        for job in stale:
+            job.requirements_profile = parse_requirements(job.requirements)
+        # The API already shows reparsed profiles, so updated_at is left alone
+        Job.objects.bulk_update(stale, ['requirements_profile'], batch_size=500)
+        self.stdout.write(self.style.SUCCESS(f'Refreshed {len(stale)} requirement profiles'))
@@ -0,0 +1,46 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from api.models import Application
+from api.summaries import summarize_applications
+
+# Changes committed by transactions that started before a pass are picked
+# up by the next one
+OVERLAP = timedelta(seconds=10)
+
+class Command(BaseCommand):
+    help = 'Fill in Application.ai_summary from CV texts with the offline summarizer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help='Override SUMMARIES["WORKERS"]')
+        parser.add_argument('--batch-size', type=int, help='Override SUMMARIES["BATCH_SIZE"]')
+        parser.add_argument(
+            '--interval', type=float,
+            help='Keep running, summarizing applications or CVs changed since the last pass every INTERVAL seconds'
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        while True:
+            started = timezone.now()
+            start = time.perf_counter()
+            applications = Application.objects.all()
+            if since is not None:
+                applications = applications.filter(
+                    Q(updated_at__gte=since) | Q(candidate__cv_matches__updated_at__gte=since)
+                ).distinct()
+            counts = summarize_applications(applications, options['workers'], options['batch_size'])
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f'Summarized {counts["summarized"]} CVs and updated {counts["updated"]} applications '
+                f'({counts["cached"]} from cache, {counts["unchanged"]} unchanged, {counts["no_cv"]} without a CV) '
+                f'in {elapsed:.1f}s'
+            )
+            if not options['interval']:
+                break
+            since = started - OVERLAP
+            time.sleep(options['interval'])
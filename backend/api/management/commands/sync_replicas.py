@@ -0,0 +1,37 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database onto the SQLite read replicas (local replication stand-in)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, help='Keep copying every INTERVAL seconds')
+
+    def handle(self, *args, **options):
+        aliases = getattr(settings, 'DATABASE_REPLICAS', [])
+        if not aliases:
+            raise CommandError('DATABASE_REPLICAS is empty')
+        for alias in ['default'] + aliases:
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError(f'{alias} is not SQLite; use the database\'s own replication')
+
+        while True:
+            start = time.perf_counter()
+            source = sqlite3.connect(connections['default'].settings_dict['NAME'])
+            try:
+                for alias in aliases:
+                    target = sqlite3.connect(connections[alias].settings_dict['NAME'])
+                    try:
+                        source.backup(target)
+                    finally:
+                        target.close()
+            finally:
+                source.close()
+            self.stdout.write(f'Synced {len(aliases)} replica(s) in {(time.perf_counter() - start) * 1000:.1f}ms')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from api.warmup import warm_up
+
+class Command(BaseCommand):
+    help = 'Run the pre-fork warm-up and report how long each step takes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--no-database', action='store_true', help='Skip loading the TF-IDF vocabulary and job matrix')
+
+    def handle(self, *args, **options):
+        timings = warm_up(database=not options['no_database'])
+        for step, ms in timings.items():
+            self.stdout.write(f'{step:<12} {ms:>8.1f}ms')
+        self.stdout.write(self.style.SUCCESS(f'Warm-up took {sum(timings.values()):.1f}ms'))
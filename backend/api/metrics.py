@@ -0,0 +1,92 @@
+"""
+Prometheus metrics for the API and the CV processing pipeline.
+
+Metrics are recorded in-process by ``MetricsMiddleware`` and the CV pipeline,
+and exposed at ``/metrics``. When running several worker processes (gunicorn,
+uvicorn), set the ``PROMETHEUS_MULTIPROC_DIR`` environment variable to an
+empty, writable directory before the workers start; samples are then shared
+through files in that directory and ``/metrics`` aggregates all workers.
+"""
+import os
+import time
+
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest,
+)
+from prometheus_client import multiprocess
+
+REQUEST_LATENCY = Histogram(
+    'talentflow_request_duration_seconds',
+    'HTTP request latency by view.',
+    ['view', 'method'],
+)
+CV_STAGE_DURATION = Histogram(
+    'talentflow_cv_stage_duration_seconds',
+    'Time spent per CV in each processing stage.',
+    ['stage'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+PDF_PAGES_PER_SECOND = Histogram(
+    'talentflow_pdf_pages_per_second',
+    'PDF text extraction throughput per CV.',
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+)
+SKILLS_PER_CV = Histogram(
+    'talentflow_cv_skills_extracted',
+    'Number of skills extracted from each CV.',
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34),
+)
+MATCH_SCORE = Histogram(
+    'talentflow_cv_match_score',
+    'Distribution of CV match scores (0-100).',
+    buckets=(10, 20, 30, 40, 50, 60, 70, 80, 90, 100),
+)
+EMAIL_SEND_LATENCY = Histogram(
+    'talentflow_email_send_duration_seconds',
+    'Time taken to send status change emails.',
+    ['outcome'],
+)
+PDF_PARSE_FAILURES = Counter(
+    'talentflow_pdf_parse_failures',
+    'PDFs whose text could not be extracted.',
+)
+CV_QUEUE_WAIT = Histogram(
+    'talentflow_cv_queue_wait_seconds',
+    'Time CV chunks wait for a processing slot.',
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+CV_QUEUE_REJECTED = Counter(
+    'talentflow_cv_queue_rejected',
+    'CV uploads rejected with 429 because the processing queue was full.',
+)
+PDF_EXTRACTION_FALLBACKS = Counter(
+    'talentflow_pdf_extraction_fallbacks',
+    'PDFs a text extraction backend failed on, passing them to the next one.',
+    ['backend'],
+)
+
+
+class MetricsMiddleware:
+    """Record request latency per resolved view."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        REQUEST_LATENCY.labels(view=view, method=request.method).observe(time.perf_counter() - start)
+        return response
+
+
+def metrics_view(request):
+    """Expose metrics in the Prometheus text format."""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
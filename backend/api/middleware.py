@@ -0,0 +1,165 @@
+import cProfile
+import logging
+import random
+import time
+from collections import deque
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import profiling
+from .routers import read_from_replicas, replicas
+
+logger = logging.getLogger('api.profiling')
+
+PROFILING_DEFAULTS = {
+    'ENABLED': False,
+    'SLOW_REQUEST_MS': 500,
+    'SLOW_LOG_SIZE': 100,
+    'PROFILE_SAMPLE_RATE': 0.0,
+    'PROFILE_DIR': None,
+}
+
+
+class ProfilingMiddleware:
+    """
+    Opt-in per-request profiling, configured by the ``PROFILING`` setting.
+
+    Adds ``Server-Timing`` and ``X-DB-Query-Count`` headers to every response,
+    keeps a rolling log of slow requests in ``api.profiling.slow_requests``
+    and, for a sampled fraction of requests, writes a cProfile dump to
+    ``PROFILE_DIR`` when the request turns out to be slow.
+    """
+
+    def __init__(self, get_response):
+        config = {**PROFILING_DEFAULTS, **getattr(settings, 'PROFILING', {})}
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = config['SLOW_REQUEST_MS']
+        self.sample_rate = config['PROFILE_SAMPLE_RATE']
+        self.profile_dir = Path(config['PROFILE_DIR']) if config['PROFILE_DIR'] else None
+        profiling.slow_requests = deque(maxlen=config['SLOW_LOG_SIZE'])
+
+    def __call__(self, request):
+        profile = profiling.RequestProfile()
+        token = profiling._current.set(profile)
+        profiler = self._start_profiler()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile.db_wrapper))
+                response = self.get_response(request)
+        finally:
+            if profiler:
+                profiler.disable()
+            profiling._current.reset(token)
+
+        total_ms = profile.elapsed_ms()
+        response['Server-Timing'] = profile.server_timing(total_ms)
+        response['X-DB-Query-Count'] = str(profile.db_queries)
+
+        if response.streaming:
+            # Streamed content (exports) is produced after this returns; check
+            # for a slow request once it has all been sent, so the log has
+            # the full time and the queries made while streaming
+            response.streaming_content = self._finish_stream(
+                request, response, profile, profiler, response.streaming_content
+            )
+        elif total_ms >= self.slow_ms:
+            self._record_slow(request, response, profile, total_ms, profiler)
+        return response
+
+    def _finish_stream(self, request, response, profile, profiler, content):
+        try:
+            yield from content
+        finally:
+            total_ms = profile.elapsed_ms()
+            if total_ms >= self.slow_ms:
+                self._record_slow(request, response, profile, total_ms, profiler)
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; time that step
+        # separately since JSON rendering dominates large list responses.
+        profile = profiling.current()
+        if profile is not None:
+            start = time.perf_counter()
+
+            def done(rendered):
+                profile.render_ms += (time.perf_counter() - start) * 1000
+
+            response.add_post_render_callback(done)
+        return response
+
+    def _start_profiler(self):
+        if not self.profile_dir or random.random() >= self.sample_rate:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active in this process.
+            return None
+        return profiler
+
+    def _record_slow(self, request, response, profile, total_ms, profiler):
+        entry = {
+            'at': datetime.now(timezone.utc).isoformat(),
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 1),
+            'db_queries': profile.db_queries,
+            'db_ms': round(profile.db_ms, 1),
+            'render_ms': round(profile.render_ms, 1),
+            'stages': {name: round(ms, 1) for name, ms in profile.stages.items()},
+        }
+        if profiler:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            slug = request.path.strip('/').replace('/', '_') or 'root'
+            path = self.profile_dir / f"{datetime.now():%Y%m%d-%H%M%S-%f}-{slug}.prof"
+            profiler.dump_stats(path)
+            entry['profile'] = str(path)
+        profiling.slow_requests.append(entry)
+        logger.warning('Slow request %s %s: %.1fms, %d queries', request.method, request.path,
+                       total_ms, profile.db_queries)
+
+
+class ReplicaMiddleware:
+    """
+    Send reads of safe requests to the read replicas (``api.routers``).
+
+    After a client writes, a cookie keeps its requests on the primary for
+    ``REPLICA_STICKY_SECONDS`` so it never reads data older than its own
+    writes while the replicas catch up.
+    """
+
+    cookie_name = 'tf_read_primary_until'
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        if not replicas():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+
+    def __call__(self, request):
+        try:
+            primary_until = float(request.COOKIES.get(self.cookie_name, 0))
+        except ValueError:
+            primary_until = 0
+        use_replicas = request.method in self.safe_methods and time.time() >= primary_until
+
+        with read_from_replicas(use_replicas):
+            response = self.get_response(request)
+
+        if request.method not in self.safe_methods:
+            response.set_cookie(
+                self.cookie_name, f'{time.time() + self.sticky_seconds:.3f}',
+                max_age=self.sticky_seconds, samesite='Lax',
+            )
+        return response
@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-19 09:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_cvmatch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TfidfVocabulary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('terms', models.JSONField(default=list)),
+                ('document_frequencies', models.JSONField(default=list)),
+                ('document_count', models.PositiveIntegerField(default=0)),
+                ('term_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='scoring_engine',
+            field=models.CharField(choices=[('keyword', 'Keyword'), ('tfidf', 'TF-IDF')], default='keyword', help_text='How CVs uploaded to this job are scored', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='tfidf_vector',
+            field=models.JSONField(blank=True, default=dict, help_text='Cached TF-IDF vector of the requirements'),
+        ),
+    ]
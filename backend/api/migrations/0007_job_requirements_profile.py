@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 09:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_job_scoring_engine_tfidfvocabulary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='requirements_profile',
+            field=models.JSONField(blank=True, default=dict, help_text='Skill ids and years parsed from the requirements'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 6.0 on 2026-10-19 09:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def set_closed_at(apps, schema_editor):
+    # When existing jobs were closed is unknown; start their clock now
+    Job = apps.get_model('api', 'Job')
+    Job.objects.filter(status='Closed', closed_at__isnull=True).update(closed_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_job_requirements_profile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, help_text="When the job's CV matches and applications moved to the archive tables", null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='closed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ArchivedApplication',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('job_title', models.CharField(max_length=200)),
+                ('status', models.CharField(choices=[('Applied', 'Applied'), ('Screening', 'Screening'), ('Interview', 'Interview'), ('Offer', 'Offer'), ('Rejected', 'Rejected')], default='Applied', max_length=10)),
+                ('applied_at', models.DateTimeField()),
+                ('rating', models.PositiveIntegerField(default=0)),
+                ('notes', models.TextField(blank=True)),
+                ('ai_summary', models.TextField(blank=True)),
+                ('match_score', models.IntegerField(default=0)),
+                ('match_status', models.CharField(default='not_matched', max_length=20)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.candidate')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.job')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedCVMatch',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('file_name', models.CharField(max_length=255)),
+                ('extracted_skills', models.JSONField(default=list)),
+                ('match_score', models.IntegerField(default=0)),
+                ('match_status', models.CharField(choices=[('matched', 'Matched'), ('not_matched', 'Not Matched')], default='not_matched', max_length=20)),
+                ('extracted_text', models.TextField(blank=True)),
+                ('uploaded_at', models.DateTimeField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.job')),
+            ],
+        ),
+        migrations.RunPython(set_closed_at, migrations.RunPython.noop),
+    ]
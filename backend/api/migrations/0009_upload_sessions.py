@@ -0,0 +1,42 @@
+# Generated by Django 6.0 on 2026-10-19 10:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_job_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('committed_at', models.DateTimeField(blank=True, null=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='api.job')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='UploadFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('size', models.PositiveIntegerField()),
+                ('sha256', models.CharField(blank=True, help_text='Expected checksum of the whole file', max_length=64)),
+                ('received', models.PositiveIntegerField(default=0, help_text='Bytes received from the start of the file')),
+                ('status', models.CharField(choices=[('uploading', 'Uploading'), ('complete', 'Complete'), ('processed', 'Processed'), ('failed', 'Failed')], default='uploading', max_length=10)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('cv_match', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.cvmatch')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='files', to='api.uploadsession')),
+            ],
+            options={
+                'ordering': ['position'],
+                'unique_together': {('session', 'name')},
+            },
+        ),
+    ]
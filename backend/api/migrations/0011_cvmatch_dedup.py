@@ -0,0 +1,64 @@
+# Generated by Django 6.0 on 2026-10-19 13:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_sync_tracking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedcvmatch',
+            name='candidate',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.candidate'),
+        ),
+        migrations.AddField(
+            model_name='archivedcvmatch',
+            name='candidate_name',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='archivedcvmatch',
+            name='email',
+            field=models.CharField(blank=True, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='archivedcvmatch',
+            name='minhash',
+            field=models.BinaryField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedcvmatch',
+            name='phone',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='cvmatch',
+            name='candidate',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='cv_matches', to='api.candidate'),
+        ),
+        migrations.AddField(
+            model_name='cvmatch',
+            name='candidate_name',
+            field=models.CharField(blank=True, help_text='Name found in the CV text', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='cvmatch',
+            name='email',
+            field=models.CharField(blank=True, help_text='Email found in the CV text', max_length=254),
+        ),
+        migrations.AddField(
+            model_name='cvmatch',
+            name='minhash',
+            field=models.BinaryField(editable=False, help_text='MinHash signature of the CV text', null=True),
+        ),
+        migrations.AddField(
+            model_name='cvmatch',
+            name='phone',
+            field=models.CharField(blank=True, help_text='Phone number found in the CV text', max_length=20),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0 on 2026-10-19 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_cvmatch_dedup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CVSummary',
+            fields=[
+                ('content_hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('summary', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='ai_summary_hash',
+            field=models.CharField(blank=True, help_text='Hash of the CV text the summary was generated from (api.summaries)', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='archivedapplication',
+            name='ai_summary_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
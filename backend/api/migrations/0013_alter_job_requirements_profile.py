@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_cv_summaries'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='requirements_profile',
+            field=models.JSONField(blank=True, default=dict, help_text='Skill ids parsed from the requirements'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_alter_job_requirements_profile'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='requirements_profile',
+            field=models.JSONField(blank=True, default=dict, help_text='Skill ids and years parsed from the requirements'),
+        ),
+    ]
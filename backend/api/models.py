@@ -1,10 +1,20 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from django.db import models
+from django.db.models.signals import post_delete
+from django.utils import timezone
+from .skills import parse_requirements
 
 class Job(models.Model):
     STATUS_CHOICES = [
         ('Open', 'Open'),
         ('Closed', 'Closed'),
     ]
+    SCORING_ENGINE_CHOICES = [
+        ('keyword', 'Keyword'),
+        ('tfidf', 'TF-IDF'),
+    ]
 
     id = models.CharField(max_length=20, primary_key=True)
     title = models.CharField(max_length=200)
@@ -14,6 +24,43 @@ class Job(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='Open')
     created_at = models.DateTimeField(auto_now_add=True)
     applications_count = models.PositiveIntegerField(default=0)
+    scoring_engine = models.CharField(
+        max_length=20,
+        choices=SCORING_ENGINE_CHOICES,
+        default='keyword',
+        help_text="How CVs uploaded to this job are scored"
+    )
+    tfidf_vector = models.JSONField(default=dict, blank=True, help_text="Cached TF-IDF vector of the requirements")
+    requirements_profile = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Skill ids and years parsed from the requirements"
+    )
+    closed_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the job's CV matches and applications moved to the archive tables"
+    )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'requirements' in update_fields:
+            self.requirements_profile = parse_requirements(self.requirements)
+            if update_fields is not None:
+                kwargs['update_fields'] = update_fields = {*update_fields, 'requirements_profile'}
+        if update_fields is None or 'status' in update_fields:
+            if self.status == 'Closed' and self.closed_at is None:
+                self.closed_at = timezone.now()
+            elif self.status == 'Open':
+                self.closed_at = None
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'closed_at'}
+        if update_fields is not None:
+            # auto_now only applies to the fields being saved
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'updated_at'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
@@ -24,6 +71,7 @@ class Candidate(models.Model):
     phone = models.CharField(max_length=20)
     skills = models.JSONField(default=list)
     resume_url = models.URLField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.name
@@ -45,6 +93,16 @@ class CVMatch(models.Model):
     )
     extracted_text = models.TextField(blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    # Duplicate detection (see api.dedup)
+    email = models.CharField(max_length=254, blank=True, help_text="Email found in the CV text")
+    phone = models.CharField(max_length=20, blank=True, help_text="Phone number found in the CV text")
+    candidate_name = models.CharField(max_length=200, blank=True, help_text="Name found in the CV text")
+    minhash = models.BinaryField(null=True, editable=False, help_text="MinHash signature of the CV text")
+    candidate = models.ForeignKey(
+        Candidate, on_delete=models.SET_NULL, null=True, blank=True, related_name='cv_matches'
+    )
 
     class Meta:
         unique_together = ['job', 'file_name']
@@ -69,6 +127,9 @@ class Application(models.Model):
     rating = models.PositiveIntegerField(default=0)
     notes = models.TextField(blank=True)
     ai_summary = models.TextField(blank=True)
+    ai_summary_hash = models.CharField(
+        max_length=64, blank=True, help_text="Hash of the CV text the summary was generated from (api.summaries)"
+    )
 
     # CV Matching fields
     match_score = models.IntegerField(default=0, help_text="Match score 0-100")
@@ -81,6 +142,153 @@ class Application(models.Model):
         default='not_matched',
         help_text="CV matching status"
     )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.candidate.name} - {self.job.title}"
+
+class TfidfVocabulary(models.Model):
+    """Persisted TF-IDF vocabulary; the latest row is the one in use."""
+    terms = models.JSONField(default=list)
+    document_frequencies = models.JSONField(default=list)
+    document_count = models.PositiveIntegerField(default=0)
+    term_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def save(self, *args, **kwargs):
+        self.term_count = len(self.terms)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"Vocabulary {self.pk} ({self.term_count} terms)"
+
+class CVSummary(models.Model):
+    """Cached extractive summary of a CV text, keyed by its hash (see ``api.summaries``)."""
+    content_hash = models.CharField(max_length=64, primary_key=True)
+    summary = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Summary {self.content_hash[:12]}"
+
+class ArchivedCVMatch(models.Model):
+    """A ``CVMatch`` of an archived job, keeping its original id (see ``api.archive``)."""
+    id = models.IntegerField(primary_key=True)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='+')
+    file_name = models.CharField(max_length=255)
+    extracted_skills = models.JSONField(default=list)
+    match_score = models.IntegerField(default=0)
+    match_status = models.CharField(max_length=20, choices=CVMatch.MATCH_STATUS_CHOICES, default='not_matched')
+    extracted_text = models.TextField(blank=True)
+    uploaded_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    email = models.CharField(max_length=254, blank=True)
+    phone = models.CharField(max_length=20, blank=True)
+    candidate_name = models.CharField(max_length=200, blank=True)
+    minhash = models.BinaryField(null=True, editable=False)
+    candidate = models.ForeignKey(Candidate, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+
+    def __str__(self):
+        return f"{self.file_name} (archived)"
+
+class ArchivedApplication(models.Model):
+    """An ``Application`` of an archived job, keeping its original id (see ``api.archive``)."""
+    id = models.IntegerField(primary_key=True)
+    candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='+')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='+')
+    job_title = models.CharField(max_length=200)
+    status = models.CharField(max_length=10, choices=Application.STATUS_CHOICES, default='Applied')
+    applied_at = models.DateTimeField()
+    rating = models.PositiveIntegerField(default=0)
+    notes = models.TextField(blank=True)
+    ai_summary = models.TextField(blank=True)
+    ai_summary_hash = models.CharField(max_length=64, blank=True)
+    match_score = models.IntegerField(default=0)
+    match_status = models.CharField(max_length=20, default='not_matched')
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.candidate_id} - {self.job_title} (archived)"
+
+
+class UploadSession(models.Model):
+    """A resumable CV upload for a job (see ``api.uploads``)."""
+    id = models.CharField(max_length=50, primary_key=True)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='upload_sessions')
+    created_at = models.DateTimeField(auto_now_add=True)
+    committed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.id} - {self.job.title}"
+
+
+class UploadFile(models.Model):
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),  # every byte received, not processed yet
+        ('processed', 'Processed'),
+        ('failed', 'Failed'),
+    ]
+
+    session = models.ForeignKey(UploadSession, on_delete=models.CASCADE, related_name='files')
+    name = models.CharField(max_length=255)
+    position = models.PositiveIntegerField(default=0)
+    size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64, blank=True, help_text="Expected checksum of the whole file")
+    received = models.PositiveIntegerField(default=0, help_text="Bytes received from the start of the file")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='uploading')
+    cv_match = models.OneToOneField(CVMatch, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    result = models.JSONField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ['session', 'name']
+        ordering = ['position']
+
+    def __str__(self):
+        return f"{self.name} ({self.received}/{self.size})"
+
+
+class Tombstone(models.Model):
+    """A deleted row of a synced model, reported by ``/api/changes/`` (see ``api.sync``)."""
+    model = models.CharField(max_length=20)
+    object_id = models.CharField(max_length=50)
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} deleted {self.deleted_at}"
+
+
+# Models the frontend keeps in sync through /api/changes/
+SYNCED_MODELS = [Job, Candidate, CVMatch, Application]
+
+
+_tombstone_buffer = ContextVar('tombstone_buffer', default=None)
+
+
+@contextmanager
+def batched_tombstones():
+    """
+    Write the tombstones of every delete inside the block in one query at
+    the end of it, instead of one per deleted row. Use it inside the
+    transaction that deletes.
+    """
+    buffer = []
+    token = _tombstone_buffer.set(buffer)
+    try:
+        yield
+    finally:
+        _tombstone_buffer.reset(token)
+    Tombstone.objects.bulk_create(buffer, batch_size=1000)
+
+
+def record_tombstone(sender, instance, **kwargs):
+    tombstone = Tombstone(model=sender._meta.model_name, object_id=str(instance.pk))
+    buffer = _tombstone_buffer.get()
+    if buffer is None:
+        tombstone.save()
+    else:
+        buffer.append(tombstone)
+
+
+for model in SYNCED_MODELS:
+    post_delete.connect(record_tombstone, sender=model, dispatch_uid=f'tombstone_{model._meta.model_name}')
@@ -0,0 +1,212 @@
+"""
+PDF text extraction backends.
+
+Each backend reads a PDF one page at a time. ``extract_stream()`` tries the
+backends listed in ``settings.PDF_EXTRACTION['BACKENDS']`` in order,
+fastest first, feeding each page's text to a consumer as it is read, and
+falls back to the next backend (with a fresh consumer) when a backend is
+not installed, raises, or finds (almost) no text. Only when every backend
+has failed does it raise ``PDFExtractionError``; callers never get an empty
+result for a PDF that could not be read. ``extract_text()`` collects the
+pages into one string.
+"""
+import io
+import threading
+from collections import namedtuple
+from importlib import import_module
+
+from django.conf import settings
+
+from .metrics import PDF_EXTRACTION_FALLBACKS
+
+Extraction = namedtuple('Extraction', ['text', 'pages', 'backend'])
+StreamedExtraction = namedtuple('StreamedExtraction', ['consumer', 'pages', 'backend'])
+
+DEFAULTS = {
+    'BACKENDS': ['pypdfium2', 'PyPDF2', 'pypdf', 'pdfminer'],
+    # Below this many non-blank characters per page the result is treated as
+    # a failed extraction (e.g. a backend that cannot decode the fonts)
+    'MIN_CHARS_PER_PAGE': 20,
+}
+
+
+class PDFExtractionError(Exception):
+    """No configured backend could extract text from the PDF."""
+
+
+class Backend:
+    """Base class: ``module`` is imported on first use to test availability."""
+
+    name = None
+    module = None
+
+    def available(self):
+        try:
+            import_module(self.module)
+        except ImportError:
+            return False
+        return True
+
+    def pages(self, data):
+        """Return the text of every page of the PDF in ``data``."""
+        return list(self.iter_pages(io.BytesIO(data)))
+
+    def iter_pages(self, stream):
+        """Yield the text of each page of the PDF in the binary file ``stream``."""
+        raise NotImplementedError
+
+
+class PyPDF2Backend(Backend):
+    name = 'PyPDF2'
+    module = 'PyPDF2'
+
+    def iter_pages(self, stream):
+        from PyPDF2 import PdfReader
+        for page in PdfReader(stream).pages:
+            yield page.extract_text() or ''
+
+
+class PypdfBackend(Backend):
+    """pypdf, the maintained successor of PyPDF2."""
+
+    name = 'pypdf'
+    module = 'pypdf'
+
+    def iter_pages(self, stream):
+        from pypdf import PdfReader
+        for page in PdfReader(stream).pages:
+            yield page.extract_text() or ''
+
+
+class PdfminerBackend(Backend):
+    """pdfminer.six: slowest, but copes best with unusual fonts and layouts."""
+
+    name = 'pdfminer'
+    module = 'pdfminer.high_level'
+
+    def iter_pages(self, stream):
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+        # pdfminer only takes real file objects, not Django's File wrappers
+        while not isinstance(stream, io.IOBase) and hasattr(stream, 'file'):
+            stream = stream.file
+        for layout in extract_pages(stream):
+            yield ''.join(element.get_text() for element in layout if isinstance(element, LTTextContainer))
+
+
+class PdfiumBackend(Backend):
+    """pypdfium2 (Chrome's PDFium): native code, the fastest and least memory."""
+
+    name = 'pypdfium2'
+    module = 'pypdfium2'
+    # PDFium is not thread-safe; threaded workers take turns
+    lock = threading.Lock()
+
+    def iter_pages(self, stream):
+        import pypdfium2
+        # The lock is held per PDFium call, not while the consumer handles a page
+        with self.lock:
+            document = pypdfium2.PdfDocument(stream)
+        try:
+            for index in range(len(document)):
+                with self.lock:
+                    page = document[index]
+                    textpage = page.get_textpage()
+                    text = textpage.get_text_range()
+                    textpage.close()
+                    page.close()
+                # PDFium ends lines with \r\n
+                yield text.replace('\r\n', '\n')
+        finally:
+            with self.lock:
+                document.close()
+
+
+BACKENDS = {backend.name: backend for backend in (
+    PdfiumBackend(), PyPDF2Backend(), PypdfBackend(), PdfminerBackend(),
+)}
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, 'PDF_EXTRACTION', {})}
+
+
+def configured_backends():
+    """The installed backends from ``PDF_EXTRACTION['BACKENDS']``, in order."""
+    return [BACKENDS[name] for name in _config()['BACKENDS'] if BACKENDS[name].available()]
+
+
+class _Pages(list):
+    """Consumer keeping every page text."""
+    feed = list.append
+
+
+def _read_pages(stream, backend):
+    """``backend.iter_pages(stream)``, raising its errors as ``PDFExtractionError``."""
+    try:
+        stream.seek(0)
+        texts = iter(backend.iter_pages(stream))
+    except Exception as e:
+        raise PDFExtractionError(f'{backend.name}: {e}') from e
+    while True:
+        try:
+            text = next(texts)
+        except StopIteration:
+            return
+        except Exception as e:
+            raise PDFExtractionError(f'{backend.name}: {e}') from e
+        yield text
+
+
+def _feed(stream, backend, consumer):
+    """
+    Feed the pages read by ``backend`` to ``consumer`` and return how many
+    there were, raising ``PDFExtractionError`` if the backend fails or the
+    pages hold too little text to be a real extraction. Errors raised by
+    ``consumer.feed()`` are bugs, not unreadable PDFs, and propagate as they
+    are so no other backend is tried.
+    """
+    pages = chars = 0
+    for text in _read_pages(stream, backend):
+        consumer.feed(text)
+        pages += 1
+        chars += len(''.join(text.split()))
+    if not pages or chars < _config()['MIN_CHARS_PER_PAGE'] * pages:
+        raise PDFExtractionError(f'{backend.name}: no text layer found')
+    return pages
+
+
+def extract_pages(data, backend):
+    """Extract page texts with one ``backend``; see ``_feed()`` for errors."""
+    pages = _Pages()
+    _feed(io.BytesIO(data), backend, pages)
+    return list(pages)
+
+
+def extract_stream(stream, consumer_factory):
+    """
+    Read the PDF in the seekable binary file ``stream`` one page at a time
+    with the first backend that succeeds, calling ``consumer.feed(text)``
+    for each page on a fresh ``consumer = consumer_factory()`` per backend
+    tried. Only one page's text is held at a time.
+    """
+    backends = configured_backends()
+    if not backends:
+        raise PDFExtractionError('No PDF extraction backend is installed')
+    errors = []
+    for backend in backends:
+        consumer = consumer_factory()
+        try:
+            pages = _feed(stream, backend, consumer)
+        except PDFExtractionError as e:
+            PDF_EXTRACTION_FALLBACKS.labels(backend=backend.name).inc()
+            errors.append(str(e))
+            continue
+        return StreamedExtraction(consumer, pages, backend.name)
+    raise PDFExtractionError('; '.join(errors))
+
+
+def extract_text(data):
+    """Extract the text of PDF ``data`` with the first backend that succeeds."""
+    extraction = extract_stream(io.BytesIO(data), _Pages)
+    return Extraction('\n'.join(extraction.consumer).strip(), extraction.pages, extraction.backend)
@@ -0,0 +1,146 @@
+"""
+Streaming CV text pipeline.
+
+``process_cvs`` used to build the whole text of a PDF, scan it for skills,
+contacts and words, and then keep only its first 1000 characters. Instead
+``read_cv()`` has ``api.pdf.extract_stream()`` read the PDF one page at a
+time and feeds each page to a ``CVText``, which keeps only what the rest
+of the request needs:
+
+* the start of the text (``HEAD`` characters, stored on the ``CVMatch``),
+* the skill ids mentioned,
+* the word counts for TF-IDF scoring,
+* the dedup fields (see ``api.dedup.DuplicateFields``),
+
+so peak memory per CV is one page of text, however many pages it has.
+Every result equals what the same steps give for the whole text, pages
+joined with newlines.
+
+Skill aliases such as "machine learning" can be split by a page break.
+``SkillScanner`` keeps the last ``SKILL_OVERLAP`` characters of a page and
+scans them again with the next one, accepting only matches that start
+before that tail, so no match is lost or counted twice.
+"""
+import re
+import time
+from collections import Counter
+
+from .dedup import DuplicateFields
+from .pdf import extract_stream
+from .profiling import record_stage
+from .scoring import word_counts
+from .skills import SKILL_OVERLAP, skill_id, skill_pattern
+
+# Characters of the text kept, as stored in ``CVMatch.extracted_text``
+HEAD = 1000
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+class SkillScanner:
+    """The skill ids of a text fed a chunk at a time."""
+
+    def __init__(self):
+        self.skill_ids = set()
+        self.carry = ''
+        # Where scanning resumes in ``carry``
+        self.pos = 0
+
+    def feed(self, text, final=False):
+        # Whitespace runs are collapsed so a match, which may span any
+        # whitespace, is never longer than the longest alias
+        text = WHITESPACE_RE.sub(' ', text)
+        if self.carry.endswith(' ') and text.startswith(' '):
+            text = text[1:]
+        buffer = self.carry + text
+        # Matches starting before ``limit`` are complete; later ones may
+        # continue in the next chunk
+        limit = len(buffer) if final else max(len(buffer) - SKILL_OVERLAP, 0)
+        end = self.pos
+        for match in skill_pattern().finditer(buffer, self.pos):
+            if match.start() >= limit:
+                break
+            self.skill_ids.add(skill_id(match.group()))
+            end = match.end()
+        # One character more is kept for the pattern's lookbehind
+        keep = max(limit - 1, 0)
+        self.carry = buffer[keep:]
+        self.pos = max(end, limit) - keep
+
+    def finish(self):
+        self.feed('', final=True)
+        return self.skill_ids
+
+
+class CVText:
+    """
+    Consumer for ``extract_stream()``: everything ``process_cvs`` needs from
+    a CV's text, gathered a page at a time.
+    """
+
+    def __init__(self):
+        self.skills = SkillScanner()
+        self.duplicates = DuplicateFields()
+        self.words = Counter()
+        self.timings = Counter()
+        self.pages = 0
+        self.head = ''
+        # Length of the text without leading whitespace, and of its
+        # trailing whitespace, to strip it as ``extract_text()`` does
+        self.length = 0
+        self.trailing = 0
+        # Set by finish(): the skill ids, the start of the stripped text
+        # and the length of all of it
+        self.skill_ids = set()
+        self.text = ''
+        self.size = 0
+
+    def feed(self, page):
+        text = '\n' + page if self.pages else page
+        self.pages += 1
+
+        start = time.perf_counter()
+        if not self.length:
+            text = text.lstrip()
+        if text:
+            if len(self.head) < HEAD:
+                self.head += text[:HEAD - len(self.head)]
+            self.length += len(text)
+            content = len(text.rstrip())
+            self.trailing = len(text) - content if content else self.trailing + len(text)
+        self.skills.feed(text)
+        checked = time.perf_counter()
+        self.duplicates.feed(text)
+        deduplicated = time.perf_counter()
+        self.words.update(word_counts(text))
+        self.timings['skills'] += checked - start
+        self.timings['dedup'] += deduplicated - checked
+        self.timings['scoring'] += time.perf_counter() - deduplicated
+
+    def finish(self):
+        """Finish scanning; returns ``self``."""
+        start = time.perf_counter()
+        self.skill_ids = self.skills.finish()
+        self.timings['skills'] += time.perf_counter() - start
+        self.size = self.length - self.trailing
+        self.text = self.head[:self.size]
+        return self
+
+
+def read_cv(stream):
+    """
+    Read the CV PDF in the seekable binary file ``stream`` and return its
+    finished ``CVText``, with ``elapsed`` set to the seconds it took.
+
+    The pdf, skills and dedup stage timings are recorded; the time spent
+    counting words is left in ``timings['scoring']`` for the caller's
+    scoring stage. Raises ``PDFExtractionError`` like ``extract_stream()``.
+    """
+    start = time.perf_counter()
+    cv = extract_stream(stream, CVText).consumer.finish()
+    elapsed = time.perf_counter() - start
+    record_stage('pdf', elapsed - sum(cv.timings.values()))
+    record_stage('skills', cv.timings['skills'])
+    record_stage('dedup', cv.timings['dedup'])
+    cv.elapsed = elapsed
+    return cv
@@ -0,0 +1,78 @@
+"""
+Per-request timing collected by ``api.middleware.ProfilingMiddleware``.
+
+Views mark expensive sections with ``stage()``; the timings are summed per
+stage name and reported in the ``Server-Timing`` response header. When the
+middleware is disabled there is no active profile and ``stage()`` only feeds
+the Prometheus stage histogram.
+"""
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .metrics import CV_STAGE_DURATION
+
+_current = ContextVar('request_profile', default=None)
+
+# Most recent slow requests, newest last. Sized by PROFILING['SLOW_LOG_SIZE'].
+slow_requests = deque(maxlen=100)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_ms = 0.0
+        self.render_ms = 0.0
+        self.stages = {}
+
+    def add_stage(self, name, ms):
+        self.stages[name] = self.stages.get(name, 0.0) + ms
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook counting queries and DB time."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_queries += 1
+            self.db_ms += (time.perf_counter() - start) * 1000
+
+    def server_timing(self, total_ms):
+        entries = [
+            f'total;dur={total_ms:.1f}',
+            f'db;dur={self.db_ms:.1f};desc="{self.db_queries} queries"',
+            f'render;dur={self.render_ms:.1f}',
+        ]
+        entries.extend(f'{name};dur={ms:.1f}' for name, ms in self.stages.items())
+        return ', '.join(entries)
+
+
+def current():
+    """Return the profile for the request being handled, or None."""
+    return _current.get()
+
+
+@contextmanager
+def stage(name):
+    """
+    Time the enclosed CV pipeline stage, recording it in the stage duration
+    metric and, when profiling is on, the current request's ``name`` stage.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - start)
+
+
+def record_stage(name, seconds):
+    """Record ``seconds`` spent in stage ``name``, for stages timed piecemeal."""
+    CV_STAGE_DURATION.labels(stage=name).observe(seconds)
+    profile = _current.get()
+    if profile is not None:
+        profile.add_stage(name, seconds * 1000)
@@ -0,0 +1,61 @@
+"""
+Primary/replica database routing.
+
+Writes always go to ``default``. Reads of the replicated models (jobs,
+candidates, applications and CV matches) go to a random alias from
+``settings.DATABASE_REPLICAS``, but only where stale data is acceptable:
+inside ``read_from_replicas()``, which ``api.middleware.ReplicaMiddleware``
+enters for safe (GET/HEAD/OPTIONS) requests from clients that have not
+written recently. Everything else, including management commands and
+background work, reads from the primary.
+
+The first write in a context pins its remaining reads to the primary, so a
+request always sees its own writes; the middleware's cookie extends that to
+the client's next requests for ``REPLICA_STICKY_SECONDS``. The frontend
+sends cookies with every API call (``src/lib/api.ts``), which needs
+``CORS_ALLOW_CREDENTIALS``.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+REPLICATED_MODELS = {'job', 'candidate', 'application', 'cvmatch'}
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+@contextmanager
+def read_from_replicas(enabled=True):
+    """Let reads of replicated models inside the block use a replica."""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        aliases = replicas()
+        if (aliases and _replica_reads.get() and model._meta.app_label == 'api'
+                and model._meta.model_name in REPLICATED_MODELS):
+            return random.choice(aliases)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        # Read your writes: the rest of this request reads from the primary.
+        # Only ever set inside read_from_replicas(), whose reset at the end
+        # of the block (the request, in ReplicaMiddleware) undoes it
+        if _replica_reads.get():
+            _replica_reads.set(False)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
@@ -0,0 +1,196 @@
+"""
+Admission control and fair scheduling for CV processing.
+
+CV parsing is CPU bound, so a few large uploads running side by side take
+the GIL (and the CPU) away from every other request the worker serves.
+``process_cvs`` therefore works through its files in chunks, and each chunk
+must first get one of ``MAX_CONCURRENT`` slots from the ``CVScheduler``.
+
+Waiting chunks are served in fair queuing order: every (user, job) key has
+its own virtual clock that each chunk advances by its size, and the chunk
+finishing earliest in virtual time goes next. Keys therefore take turns,
+small batches go ahead of large ones, and an upload that has waited a
+while is not overtaken forever. Uploads that arrive while ``MAX_QUEUED``
+others wait, or that would wait longer than ``MAX_WAIT`` seconds to start,
+are rejected with ``QueueFull`` (HTTP 429).
+
+Every upload in the scheduler, running or waiting, holds a request thread.
+So that some are always left for the rest of the API, at most
+``WORKER_THREADS - 1`` uploads are let in at once, whatever ``MAX_QUEUED``.
+
+The scheduler is per worker process; the limits apply to each process.
+"""
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from .metrics import CV_QUEUE_WAIT, CV_QUEUE_REJECTED
+
+DEFAULTS = {
+    'ENABLED': True,
+    'MAX_CONCURRENT': 1,  # Chunks processed at once per worker process
+    'MAX_QUEUED': 8,  # Uploads waiting to start before new ones get a 429
+    'MAX_WAIT': 30,  # Seconds an upload may wait to start before a 429
+    'CHUNK_SIZE': 10,  # CVs processed per slot before queuing again
+    'WORKER_THREADS': 4,  # Request threads per worker process (gunicorn --threads)
+}
+
+
+class QueueFull(Exception):
+    """The upload was not admitted; retry after ``retry_after`` seconds."""
+
+    def __init__(self, retry_after):
+        super().__init__(f'CV processing queue is full, retry after {retry_after}s')
+        self.retry_after = retry_after
+
+
+class CVScheduler:
+    def __init__(self, max_concurrent=1, max_queued=8, max_wait=30, worker_threads=4):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.max_wait = max_wait
+        # One thread is kept for other requests, unless there is only one
+        self.max_uploads = max(worker_threads - 1, 1)
+        self.uploads = 0  # uploads admitted and not finished
+        self.condition = threading.Condition()
+        self.running = 0
+        self.waiting = []  # heap of (finish tag, sequence, cost)
+        self.running_cost = 0
+        self.uploads_waiting = 0  # uploads that have not started yet
+        self.virtual_time = 0.0
+        self.finish_tags = {}  # key -> virtual finish time of its last chunk
+        self.sequence = itertools.count()
+        self.seconds_per_cv = 0.05  # moving average, used for Retry-After
+
+    def retry_after(self):
+        """Seconds until the current backlog has likely drained."""
+        backlog = sum(cost for _, _, cost in self.waiting) + self.running_cost
+        return max(1, math.ceil(backlog * self.seconds_per_cv / self.max_concurrent))
+
+    def _forget_idle_keys(self):
+        # Keys whose last chunk finished in virtual time carry no credit or debt
+        self.finish_tags = {key: tag for key, tag in self.finish_tags.items() if tag > self.virtual_time}
+
+    @contextmanager
+    def upload(self):
+        """
+        Admit an upload for as long as the block runs, or raise
+        ``QueueFull`` if too many uploads are waiting or in progress.
+        """
+        with self.condition:
+            if self.uploads_waiting >= self.max_queued or self.uploads >= self.max_uploads:
+                CV_QUEUE_REJECTED.inc()
+                raise QueueFull(self.retry_after())
+            self.uploads += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.uploads -= 1
+
+    @contextmanager
+    def slot(self, key, cost, admitted=True):
+        """
+        Hold one processing slot for a chunk of ``cost`` CVs.
+
+        The first chunk of an upload passes ``admitted=False`` and is
+        rejected with ``QueueFull`` if it waits more than ``max_wait``
+        seconds; later chunks of an admitted upload always wait their turn.
+        """
+        with self.condition:
+            previous_tag = self.finish_tags.get(key)
+            start_tag = max(self.virtual_time, previous_tag or 0.0)
+            self.finish_tags[key] = start_tag + cost
+            entry = (start_tag + cost, next(self.sequence), cost)
+            heapq.heappush(self.waiting, entry)
+            if not admitted:
+                self.uploads_waiting += 1
+
+            queued_at = time.monotonic()
+            try:
+                while self.running >= self.max_concurrent or self.waiting[0] != entry:
+                    remaining = self.max_wait - (time.monotonic() - queued_at)
+                    if not admitted and remaining <= 0:
+                        self.waiting.remove(entry)
+                        heapq.heapify(self.waiting)
+                        # The key is not charged for a chunk that never ran,
+                        # unless a later chunk of it was queued on top
+                        if self.finish_tags.get(key) == entry[0]:
+                            if previous_tag is None:
+                                del self.finish_tags[key]
+                            else:
+                                self.finish_tags[key] = previous_tag
+                        self.condition.notify_all()
+                        CV_QUEUE_REJECTED.inc()
+                        raise QueueFull(self.retry_after())
+                    self.condition.wait(remaining if not admitted else None)
+                heapq.heappop(self.waiting)
+                self.running += 1
+                self.running_cost += cost
+                self.virtual_time = max(self.virtual_time, start_tag)
+                self._forget_idle_keys()
+            finally:
+                if not admitted:
+                    self.uploads_waiting -= 1
+            CV_QUEUE_WAIT.observe(time.monotonic() - queued_at)
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.running -= 1
+                self.running_cost -= cost
+                per_cv = (time.monotonic() - started) / max(cost, 1)
+                self.seconds_per_cv = 0.8 * self.seconds_per_cv + 0.2 * per_cv
+                self.condition.notify_all()
+
+
+_scheduler = None
+_lock = threading.Lock()
+
+
+def config():
+    return {**DEFAULTS, **getattr(settings, 'CV_SCHEDULER', {})}
+
+
+def get_scheduler():
+    """The process-wide scheduler, or None when ``CV_SCHEDULER['ENABLED']`` is off."""
+    global _scheduler
+    options = config()
+    if not options['ENABLED']:
+        return None
+    with _lock:
+        if _scheduler is None:
+            _scheduler = CVScheduler(
+                options['MAX_CONCURRENT'], options['MAX_QUEUED'], options['MAX_WAIT'], options['WORKER_THREADS']
+            )
+    return _scheduler
+
+
+def process_in_chunks(files, key, process, scheduler=None, chunk_size=None):
+    """
+    Call ``process(file)`` for each of ``files``, a chunk at a time, each
+    chunk while holding a scheduler slot for ``key``.
+
+    Raises ``QueueFull`` before processing anything if the upload is
+    rejected. Slots are released as soon as their chunk is done or
+    ``process`` raises. Without a scheduler the files are processed
+    straight away.
+    """
+    if scheduler is None:
+        for file in files:
+            process(file)
+        return
+    chunk_size = chunk_size or config()['CHUNK_SIZE']
+    with scheduler.upload():
+        for offset in range(0, len(files), chunk_size):
+            chunk = files[offset:offset + chunk_size]
+            with scheduler.slot(key, len(chunk), admitted=offset > 0):
+                for file in chunk:
+                    process(file)
@@ -0,0 +1,340 @@
+"""
+TF-IDF scoring of CV text against job requirements.
+
+The vocabulary (term -> document frequency) is built from stored CV texts and
+job requirements and persisted in ``TfidfVocabulary``; job requirement vectors
+are persisted on ``Job.tfidf_vector``. Scoring a CV is then a sparse dot
+product in NumPy, with no network access or external models.
+
+Scores are the cosine similarity between the job vector and the CV vector
+restricted to the job's terms, so CV content unrelated to the requirements
+(education, hobbies, ...) does not dilute the score. Words are complemented
+with character 4-grams so near-variants such as "Postgres" and "PostgreSQL"
+still overlap, while short tokens like "Go" only match whole words.
+"""
+import hashlib
+import re
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .models import CVMatch, Job, TfidfVocabulary
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+STOP_WORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can
+could did do does doing for from had has have having he her his how i if in into
+is it its me more most my no not of on or our out over own same she should so
+some such than that the their them then there these they this those through to
+too under up very was we were what when where which while who why will with you
+your years year experience plus strong good excellent knowledge required preferred
+""".split())
+NGRAM = 4
+
+# Most recent CV texts used when building a vocabulary
+MAX_DOCUMENTS = 20000
+
+_cache = {}
+
+
+@lru_cache(maxsize=100000)
+def _word_terms(word):
+    if word in STOP_WORDS or word.isdigit():
+        return ()
+    if len(word) <= NGRAM:
+        return (word,)
+    return (word,) + tuple(f'~{word[i:i + NGRAM]}' for i in range(len(word) - NGRAM + 1))
+
+
+def _term_counts(text):
+    """Return a Counter of the terms of ``text``."""
+    counts = Counter()
+    for word, count in Counter(TOKEN_RE.findall(text.lower())).items():
+        for term in _word_terms(word):
+            counts[term] += count
+    return counts
+
+
+def word_counts(text):
+    """Return a Counter of the words of ``text``, before stop words and n-grams."""
+    return Counter(TOKEN_RE.findall(text.lower()))
+
+
+def tokenize(text):
+    """Return the terms of ``text``: words plus character n-grams of long words."""
+    return [term for word in TOKEN_RE.findall(text.lower()) for term in _word_terms(word)]
+
+
+class Vocabulary:
+    """In-memory view of a ``TfidfVocabulary`` row."""
+
+    def __init__(self, record):
+        self.pk = record.pk
+        self.terms = list(record.terms)
+        self.index = {term: i for i, term in enumerate(self.terms)}
+        self.document_count = record.document_count
+        df = np.asarray(record.document_frequencies, dtype=np.float64)
+        self.idf = np.log((1 + self.document_count) / (1 + df)) + 1
+
+    def vectorize(self, text):
+        """Return ``(indices, weights)`` of the L2-normalised TF-IDF vector of ``text``."""
+        counts = {self.index[term]: count for term, count in _term_counts(text).items() if term in self.index}
+        if not counts:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        weights = (1 + np.log(tf)) * self.idf[indices]
+        order = np.argsort(indices)
+        indices, weights = indices[order], weights[order]
+        return indices, weights / np.linalg.norm(weights)
+
+
+def _requirements_hash(requirements):
+    return hashlib.sha1(requirements.encode()).hexdigest()
+
+
+def build_vocabulary():
+    """Build and persist a new vocabulary from job requirements and stored CV texts."""
+    document_frequencies = Counter()
+    documents = 0
+    texts = Job.objects.values_list('requirements', flat=True).iterator()
+    cv_ids = CVMatch.objects.order_by('-id').values_list('id', flat=True)[:MAX_DOCUMENTS]
+    cv_texts = CVMatch.objects.filter(id__in=list(cv_ids)).values_list('extracted_text', flat=True)
+    for source in (texts, cv_texts.iterator()):
+        for text in source:
+            document_frequencies.update(set(tokenize(text)))
+            documents += 1
+    terms = sorted(document_frequencies)
+    return TfidfVocabulary.objects.create(
+        terms=terms,
+        document_frequencies=[document_frequencies[term] for term in terms],
+        document_count=documents,
+    )
+
+
+def get_vocabulary():
+    """Return the latest vocabulary, building one if none exists yet."""
+    latest = TfidfVocabulary.objects.order_by('-pk').values_list('pk', 'term_count').first()
+    if latest is None:
+        record = build_vocabulary()
+        latest = (record.pk, record.term_count)
+    if _cache.get('key') != latest:
+        _cache['vocabulary'] = Vocabulary(TfidfVocabulary.objects.get(pk=latest[0]))
+        _cache['key'] = latest
+    return _cache['vocabulary']
+
+
+def _add_terms(vocabulary, terms):
+    """Append unseen ``terms`` to the persisted vocabulary (document frequency 0)."""
+    with transaction.atomic():
+        record = TfidfVocabulary.objects.select_for_update().get(pk=vocabulary.pk)
+        known = set(record.terms)
+        new = [term for term in dict.fromkeys(terms) if term not in known]
+        record.terms += new
+        record.document_frequencies += [0] * len(new)
+        record.save(update_fields=['terms', 'document_frequencies', 'term_count'])
+    _cache.pop('key', None)
+    return get_vocabulary()
+
+
+def job_vector(job, vocabulary=None):
+    """
+    Return ``(indices, weights)`` for ``job``'s requirements, reusing the
+    vector persisted on the job while the vocabulary and requirements are
+    unchanged.
+    """
+    return _job_vector(job, vocabulary or get_vocabulary())[1:]
+
+
+def _job_vector(job, vocabulary):
+    """Like ``job_vector`` but also returns the vocabulary the vector indexes into."""
+    if _job_vector_is_current(job, vocabulary):
+        indices = np.asarray(job.tfidf_vector['indices'], dtype=np.int64)
+        if len(indices) and indices[-1] >= len(vocabulary.terms):
+            # Terms were appended since ``vocabulary`` was loaded
+            vocabulary = get_vocabulary()
+        return vocabulary, indices, np.asarray(job.tfidf_vector['weights'])
+
+    unseen = [term for term in tokenize(job.requirements) if term not in vocabulary.index]
+    if unseen:
+        vocabulary = _add_terms(vocabulary, unseen)
+    indices, weights = _compute_job_vector(job, vocabulary)
+    Job.objects.filter(pk=job.pk).update(tfidf_vector=job.tfidf_vector)
+    return vocabulary, indices, weights
+
+
+def _job_vector_is_current(job, vocabulary):
+    stored = job.tfidf_vector or {}
+    return (
+        stored.get('vocabulary') == vocabulary.pk
+        and stored.get('requirements') == _requirements_hash(job.requirements)
+    )
+
+
+def _compute_job_vector(job, vocabulary):
+    """Vectorize ``job``'s requirements and store the result on ``job.tfidf_vector`` (unsaved)."""
+    indices, weights = vocabulary.vectorize(job.requirements)
+    job.tfidf_vector = {
+        'vocabulary': vocabulary.pk,
+        'requirements': _requirements_hash(job.requirements),
+        'indices': indices.tolist(),
+        'weights': weights.tolist(),
+    }
+    return indices, weights
+
+
+def _to_score(similarity):
+    return int(round(min(max(similarity, 0.0), 1.0) * 100))
+
+
+def tfidf_score(text, job, vocabulary=None):
+    """Score one CV text against ``job`` (0-100)."""
+    return tfidf_scores([text], job, vocabulary)[0]
+
+
+def tfidf_scores(texts, job, vocabulary=None):
+    """Score many CV texts against ``job`` (0-100 each)."""
+    return tfidf_scores_from_counts(map(word_counts, texts), job, vocabulary)
+
+
+def tfidf_scores_from_counts(counters, job, vocabulary=None):
+    """
+    Score many CVs, given as an iterable of the ``word_counts()`` of their
+    texts, against ``job`` (0-100 each). Counts can be summed a page at a
+    time, so a CV's text need never be held whole (see ``api.pipeline``).
+
+    The CVs are packed into CSR arrays restricted to the job's terms so the
+    whole batch is scored with a handful of vectorised NumPy operations. Only
+    the job's terms are counted, since the rest cancel out of the restricted
+    cosine.
+    """
+    vocabulary, job_indices, job_weights = _job_vector(job, vocabulary or get_vocabulary())
+    if not len(job_indices):
+        return [0] * sum(1 for _ in counters)
+
+    position = {vocabulary.terms[index]: i for i, index in enumerate(job_indices)}
+    job_idf = vocabulary.idf[job_indices]
+
+    # Job columns hit by each distinct word, shared across the batch
+    word_columns = {}
+    cols, tf, indptr = [], [], [0]
+    for words in counters:
+        counts = {}
+        for word, count in words.items():
+            columns = word_columns.get(word)
+            if columns is None:
+                columns = word_columns[word] = [position[t] for t in _word_terms(word) if t in position]
+            for column in columns:
+                counts[column] = counts.get(column, 0) + count
+        cols.extend(counts.keys())
+        tf.extend(counts.values())
+        indptr.append(len(cols))
+    cols = np.asarray(cols, dtype=np.int64)
+    data = (1 + np.log(np.asarray(tf, dtype=np.float64))) * job_idf[cols]
+    indptr = np.asarray(indptr)
+
+    starts = indptr[:-1]
+    nonempty = indptr[1:] > starts
+    dots = np.zeros(len(starts))
+    norms = np.zeros(len(starts))
+    if nonempty.any():
+        dots[nonempty] = np.add.reduceat(data * job_weights[cols], starts[nonempty])
+        norms[nonempty] = np.sqrt(np.add.reduceat(data * data, starts[nonempty]))
+    similarity = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+    return [_to_score(value) for value in similarity]
+
+
+# Open-job matrix for cross-job matching. Rebuilt when the vocabulary
+# changes, or when open jobs are added, closed, deleted or edited (in any
+# worker process: ``Job.save()`` bumps ``updated_at``).
+
+
+class JobMatrix:
+    """
+    The TF-IDF vectors of a set of jobs, one row per job, stored by column
+    (term id) so a CV only touches the entries of the terms it contains.
+    """
+
+    def __init__(self, vocabulary, jobs):
+        self.vocabulary = vocabulary
+        stale = [job for job in jobs if not _job_vector_is_current(job, vocabulary)]
+        unseen = [
+            term for job in stale for term in tokenize(job.requirements)
+            if term not in vocabulary.index
+        ]
+        if unseen:
+            self.vocabulary = vocabulary = _add_terms(vocabulary, unseen)
+        for job in stale:
+            _compute_job_vector(job, vocabulary)
+        if stale:
+            Job.objects.bulk_update(stale, ['tfidf_vector'], batch_size=500)
+
+        self.job_ids = [job.pk for job in jobs]
+        lengths = [len(job.tfidf_vector['indices']) for job in jobs]
+        size = sum(lengths)
+        terms = np.fromiter((i for job in jobs for i in job.tfidf_vector['indices']), dtype=np.int64, count=size)
+        weights = np.fromiter((w for job in jobs for w in job.tfidf_vector['weights']), dtype=np.float64, count=size)
+        order = np.argsort(terms, kind='stable')
+        self.terms = terms[order]
+        self.rows = np.repeat(np.arange(len(jobs)), lengths)[order]
+        self.weights = weights[order]
+
+    def scores(self, text):
+        """Return an array with the 0-100 score of ``text`` for every job row."""
+        vocabulary = self.vocabulary
+        counts = {vocabulary.index[t]: c for t, c in _term_counts(text).items() if t in vocabulary.index}
+        if not counts:
+            return np.zeros(len(self.job_ids), dtype=int)
+        # The CV vector stays sparse: its term ids and their weights
+        terms = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        weights = (1 + np.log(tf)) * vocabulary.idf[terms]
+
+        # The matrix entries of the CV's terms, and the CV weight of each
+        first = np.searchsorted(self.terms, terms, side='left')
+        lengths = np.searchsorted(self.terms, terms, side='right') - first
+        starts = np.cumsum(lengths) - lengths
+        entries = np.repeat(first - starts, lengths) + np.arange(lengths.sum())
+        cv = np.repeat(weights, lengths)
+
+        # Per job: its vector . cv, and the norm of cv restricted to its terms
+        rows = self.rows[entries]
+        dots = np.bincount(rows, weights=self.weights[entries] * cv, minlength=len(self.job_ids))
+        norms = np.sqrt(np.bincount(rows, weights=cv * cv, minlength=len(self.job_ids)))
+        similarity = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+        return np.rint(np.clip(similarity, 0, 1) * 100).astype(int)
+
+
+def open_job_matrix():
+    """Return the (cached) ``JobMatrix`` of all open jobs."""
+    vocabulary = get_vocabulary()
+    # Closing or deleting a job changes the count, any other edit the latest
+    # ``updated_at``
+    stats = Job.objects.filter(status='Open').aggregate(count=Count('pk'), updated=Max('updated_at'))
+    cached = _cache.get('job_matrix')
+    if cached and cached[0] == (_cache['key'], stats['count'], stats['updated']):
+        return cached[1]
+
+    jobs = list(Job.objects.filter(status='Open').only('id', 'requirements', 'tfidf_vector').order_by('pk'))
+    matrix = JobMatrix(vocabulary, jobs)
+    # Keyed on the vocabulary after any terms the new jobs appended
+    _cache['job_matrix'] = ((_cache['key'], stats['count'], stats['updated']), matrix)
+    return matrix
+
+
+def rank_jobs(text, limit=10):
+    """
+    Score ``text`` against every open job and return the best ``limit`` as
+    ``(job_id, score)`` pairs, highest first. Jobs scoring 0 are left out.
+    """
+    matrix = open_job_matrix()
+    if not matrix.job_ids:
+        return []
+    scores = matrix.scores(text)
+    limit = min(limit, len(scores))
+    top = np.argpartition(-scores, limit - 1)[:limit]
+    top = top[np.argsort(-scores[top], kind='stable')]
+    return [(matrix.job_ids[i], int(scores[i])) for i in top if scores[i] > 0]
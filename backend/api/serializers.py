@@ -1,5 +1,7 @@
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Job, Candidate, Application, CVMatch
+from .models import Job, Candidate, Application, CVMatch, UploadSession, UploadFile
+from .skills import job_profile, stored_profile, profile_representation
 
 class CandidateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -7,33 +9,185 @@ class CandidateSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 class JobSerializer(serializers.ModelSerializer):
+    requirements_profile = serializers.SerializerMethodField()
+
     class Meta:
         model = Job
-        fields = '__all__'
+        exclude = ['tfidf_vector']
+        read_only_fields = ['closed_at', 'archived_at']
+
+    def get_requirements_profile(self, job):
+        return profile_representation(job_profile(job))
 
 class CVMatchSerializer(serializers.ModelSerializer):
     class Meta:
         model = CVMatch
-        fields = '__all__'
+        exclude = ['minhash']
 
 class ApplicationSerializer(serializers.ModelSerializer):
     candidate = CandidateSerializer(read_only=True)
 
     class Meta:
         model = Application
-        fields = '__all__'
+        exclude = ['ai_summary_hash']
 
 class ApplicationCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
-        fields = '__all__'
+        exclude = ['ai_summary_hash']
 
 class JobCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Job
-        exclude = ['id', 'created_at', 'applications_count']
+        exclude = [
+            'id', 'created_at', 'applications_count', 'tfidf_vector', 'requirements_profile',
+            'closed_at', 'archived_at',
+        ]
+
+class UploadFileSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadFile
+        fields = ['name', 'size', 'received', 'status', 'result']
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    files = UploadFileSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'job', 'created_at', 'committed_at', 'files']
 
 class ApplicationUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
         fields = ['status', 'notes', 'rating']
+
+class ShortlistEntrySerializer(serializers.Serializer):
+    cv_match = serializers.IntegerField(required=False)
+    name = serializers.CharField(max_length=200)
+    email = serializers.EmailField()
+    phone = serializers.CharField(max_length=20, required=False, allow_blank=True)
+    skills = serializers.ListField(child=serializers.CharField(), required=False)
+    resume_url = serializers.CharField(max_length=200, required=False, allow_blank=True)
+    notes = serializers.CharField(required=False, allow_blank=True)
+    ai_summary = serializers.CharField(required=False, allow_blank=True)
+
+class ShortlistSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES, default='Screening')
+    candidates = ShortlistEntrySerializer(many=True, allow_empty=False, max_length=500)
+
+
+def _datetime(value):
+    # Same format as DRF's DateTimeField: ISO 8601 in the current timezone, UTC as 'Z'
+    if value is None:
+        return None
+    value = timezone.localtime(value).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+class ValuesSerializer:
+    """
+    Read-only list serializer over ``QuerySet.values()`` rows.
+
+    Produces the same output as the matching ModelSerializer for list
+    responses without instantiating models or running per-field
+    serializer machinery. ``fields`` maps output names to a ``values()``
+    lookup, optionally with a converter; ``nested`` maps output names to
+    another ValuesSerializer reached through a relation (list the name in
+    ``fields`` too, to fix its position in the output).
+    """
+    fields = []
+    nested = {}
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    @classmethod
+    def lookups(cls, prefix=''):
+        lookups = [prefix + lookup for _, lookup, *_ in cls.fields]
+        for name, (relation, serializer) in cls.nested.items():
+            lookups.extend(serializer.lookups(f'{prefix}{relation}__'))
+        return lookups
+
+    @classmethod
+    def to_representation(cls, row, prefix=''):
+        data = {}
+        for name, lookup, *convert in cls.fields:
+            value = row[prefix + lookup]
+            data[name] = convert[0](value) if convert else value
+        for name, (relation, serializer) in cls.nested.items():
+            data[name] = serializer.to_representation(row, f'{prefix}{relation}__')
+        return data
+
+    @property
+    def data(self):
+        return [self.to_representation(row) for row in self.queryset.values(*self.lookups())]
+
+class CandidateValuesSerializer(ValuesSerializer):
+    fields = [
+        ('id', 'id'),
+        ('name', 'name'),
+        ('email', 'email'),
+        ('phone', 'phone'),
+        ('skills', 'skills'),
+        ('resume_url', 'resume_url'),
+        ('updated_at', 'updated_at', _datetime),
+    ]
+
+class JobValuesSerializer(ValuesSerializer):
+    fields = [
+        ('id', 'id'),
+        ('requirements_profile', 'requirements_profile'),
+        ('title', 'title'),
+        ('department', 'department'),
+        ('location', 'location'),
+        ('requirements', 'requirements'),
+        ('status', 'status'),
+        ('created_at', 'created_at', _datetime),
+        ('applications_count', 'applications_count'),
+        ('scoring_engine', 'scoring_engine'),
+        ('closed_at', 'closed_at', _datetime),
+        ('archived_at', 'archived_at', _datetime),
+        ('updated_at', 'updated_at', _datetime),
+    ]
+
+    @classmethod
+    def to_representation(cls, row, prefix=''):
+        data = super().to_representation(row, prefix)
+        profile = stored_profile(data['requirements_profile'], data['requirements'])
+        data['requirements_profile'] = profile_representation(profile)
+        return data
+
+class CVMatchValuesSerializer(ValuesSerializer):
+    fields = [
+        ('id', 'id'),
+        ('file_name', 'file_name'),
+        ('extracted_skills', 'extracted_skills'),
+        ('match_score', 'match_score'),
+        ('match_status', 'match_status'),
+        ('extracted_text', 'extracted_text'),
+        ('uploaded_at', 'uploaded_at', _datetime),
+        ('updated_at', 'updated_at', _datetime),
+        ('email', 'email'),
+        ('phone', 'phone'),
+        ('candidate_name', 'candidate_name'),
+        ('job', 'job_id'),
+        ('candidate', 'candidate_id'),
+    ]
+
+class ApplicationValuesSerializer(ValuesSerializer):
+    fields = [
+        ('id', 'id'),
+        ('candidate', 'candidate_id'),
+        ('job_title', 'job_title'),
+        ('status', 'status'),
+        ('applied_at', 'applied_at', _datetime),
+        ('rating', 'rating'),
+        ('notes', 'notes'),
+        ('ai_summary', 'ai_summary'),
+        ('match_score', 'match_score'),
+        ('match_status', 'match_status'),
+        ('updated_at', 'updated_at', _datetime),
+        ('job', 'job_id'),
+    ]
+    nested = {'candidate': ('candidate', CandidateValuesSerializer)}
@@ -0,0 +1,278 @@
+"""
+Skill taxonomy and structured requirement profiles.
+
+Every skill has a stable integer id, a canonical name and the aliases it is
+written as. Job requirements are parsed once into a profile of must-have and
+nice-to-have skill ids plus the minimum years of experience, stored on
+``Job.requirements_profile``. Keyword
+scoring is then a set intersection of integer ids, and the matched / missing
+skills explain the score.
+
+A missing profile, or one from an older ``PROFILE_VERSION``, is reparsed
+when read; ``manage.py refresh_profiles`` stores the current ones.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# Bump when SKILLS or the parsing rules change so stored profiles are rebuilt.
+PROFILE_VERSION = 3
+
+# (id, canonical name, aliases). Ids are persisted: never reuse or renumber.
+SKILLS = [
+    (1, 'React', ['react', 'react.js', 'reactjs']),
+    (2, 'Angular', ['angular', 'angularjs']),
+    (3, 'Vue', ['vue', 'vue.js', 'vuejs']),
+    (4, 'JavaScript', ['javascript', 'js']),
+    (5, 'TypeScript', ['typescript', 'ts']),
+    (6, 'Node.js', ['node.js', 'nodejs', 'node']),
+    (7, 'Express', ['express', 'express.js']),
+    (8, 'Django', ['django']),
+    (9, 'Flask', ['flask']),
+    (10, 'Spring', ['spring', 'spring boot']),
+    (11, 'Laravel', ['laravel']),
+    (12, 'Python', ['python']),
+    (13, 'Java', ['java']),
+    (14, 'C++', ['c++']),
+    (15, 'C#', ['c#']),
+    (16, 'Go', ['go', 'golang']),
+    (17, 'Rust', ['rust']),
+    (18, 'PHP', ['php']),
+    (19, 'Ruby', ['ruby']),
+    (20, 'Swift', ['swift']),
+    (21, 'Kotlin', ['kotlin']),
+    (22, 'HTML', ['html', 'html5']),
+    (23, 'CSS', ['css', 'css3']),
+    (24, 'SCSS', ['scss']),
+    (25, 'SASS', ['sass']),
+    (26, 'Bootstrap', ['bootstrap']),
+    (27, 'Tailwind', ['tailwind', 'tailwindcss']),
+    (28, 'Material-UI', ['material-ui', 'mui']),
+    (29, 'SQL', ['sql']),
+    (30, 'MySQL', ['mysql']),
+    (31, 'PostgreSQL', ['postgresql', 'postgres']),
+    (32, 'MongoDB', ['mongodb', 'mongo']),
+    (33, 'Redis', ['redis']),
+    (34, 'Elasticsearch', ['elasticsearch']),
+    (35, 'AWS', ['aws', 'amazon web services']),
+    (36, 'Azure', ['azure']),
+    (37, 'GCP', ['gcp', 'google cloud']),
+    (38, 'Docker', ['docker']),
+    (39, 'Kubernetes', ['kubernetes', 'k8s']),
+    (40, 'Jenkins', ['jenkins']),
+    (41, 'Git', ['git']),
+    (42, 'GitHub', ['github']),
+    (43, 'GitLab', ['gitlab']),
+    (44, 'Figma', ['figma']),
+    (45, 'Sketch', ['sketch']),
+    (46, 'Adobe XD', ['adobe xd']),
+    (47, 'InVision', ['invision']),
+    (48, 'Zeplin', ['zeplin']),
+    (49, 'Prototyping', ['prototyping', 'prototypes']),
+    (50, 'UI/UX', ['ui/ux', 'ux/ui', 'user experience', 'user interface', 'ux', 'ui']),
+    (51, 'Design Systems', ['design systems', 'design system']),
+    (52, 'Machine Learning', ['machine learning', 'ml']),
+    (53, 'AI', ['ai', 'artificial intelligence']),
+    (54, 'Data Science', ['data science']),
+    (55, 'TensorFlow', ['tensorflow']),
+    (56, 'PyTorch', ['pytorch']),
+    (57, 'NLP', ['nlp', 'natural language processing']),
+    (58, 'Agile', ['agile']),
+    (59, 'Scrum', ['scrum']),
+    (60, 'Kanban', ['kanban']),
+    (61, 'JIRA', ['jira']),
+    (62, 'Confluence', ['confluence']),
+    (63, 'Trello', ['trello']),
+    (64, 'REST', ['rest', 'rest apis', 'rest api', 'restful']),
+    (65, 'GraphQL', ['graphql']),
+    (66, 'API', ['api', 'apis']),
+    (67, 'Microservices', ['microservices']),
+    (68, 'Serverless', ['serverless']),
+    (69, 'User Research', ['user research']),
+    (70, 'Wireframing', ['wireframing', 'wireframes']),
+    (71, 'Usability Testing', ['usability testing', 'user testing']),
+    (72, 'Webpack', ['webpack']),
+    (73, 'Tableau', ['tableau']),
+    (74, 'Power BI', ['power bi']),
+    (75, 'Data Analysis', ['data analysis', 'statistical analysis']),
+    (76, 'Statistics', ['statistics']),
+    (77, 'Google Analytics', ['google analytics']),
+    (78, 'SEO', ['seo']),
+    (79, 'SEM', ['sem']),
+    (80, 'Content Marketing', ['content marketing']),
+    (81, 'HubSpot', ['hubspot']),
+    (82, 'R', ['r programming', 'r language', 'rstats']),
+]
+
+SKILL_NAMES = {skill_id: name for skill_id, name, _ in SKILLS}
+ALIASES = {alias: skill_id for skill_id, _, aliases in SKILLS for alias in aliases}
+# Skill names saved on CV matches and candidates: aliases plus the canonical
+# names, some of which (such as "R") are too ambiguous to look for in text
+NAME_IDS = {**ALIASES, **{name.lower(): skill_id for skill_id, name, _ in SKILLS}}
+
+# Aliases that are also everyday words or abbreviations ("the rest", "Go to
+# our site", "Our UI team"). In text they only match written as the skill
+# is, in the case given here or upper case, and in job requirements only
+# in a skill context (see ``requirement_skill_ids()``).
+AMBIGUOUS = {
+    'go': 'Go', 'express': 'Express', 'node': 'Node', 'spring': 'Spring', 'swift': 'Swift',
+    'rust': 'Rust', 'ruby': 'Ruby', 'sketch': 'Sketch',
+    'rest': 'REST', 'ui': 'UI', 'ux': 'UX', 'ml': 'ML', 'sem': 'SEM',
+}
+
+# Clauses mentioning any of these describe optional skills
+NICE_TO_HAVE_RE = re.compile(
+    r'\b(nice to have|nice-to-have|preferred|a plus|is a plus|bonus|ideally|desirable|familiarity)\b',
+    re.IGNORECASE,
+)
+# Phrases after which an ambiguous alias names a skill
+SKILL_CONTEXT_RE = re.compile(
+    r'\b(experience (with|in|using)|experienced (with|in)|knowledge of|proficien(t|cy) (in|with)'
+    r'|familiar(ity)? with|expertise (in|with)|skilled (in|with)|fluen(t|cy) in|using|such as|including'
+    r'|skills|stack|technologies|tools)\b',
+    re.IGNORECASE,
+)
+# Text between two skills of one list: "React, Node", "Python and Go"
+LIST_SEPARATOR_RE = re.compile(r'\s*[,/|&+]?\s*(?:(?:and|or)\s+)?', re.IGNORECASE)
+# Text around the skills of a clause that is just a list item: "- Go, Rust"
+LIST_ITEM_START_RE = re.compile(r'\s*(?:[-*\u2022]\s*)?')
+LIST_ITEM_END_RE = re.compile(r'[\s,:]*')
+# "3+ years", "2-4 yrs": the first number is the minimum
+YEARS_RE = re.compile(r'(\d{1,2})\s*\+?\s*(?:-\s*\d{1,2}\s*)?(?:years?|yrs?)\b', re.IGNORECASE)
+# Sentence breaks; a dot inside a token such as "Node.js" does not end a clause
+CLAUSE_RE = re.compile(r'(?:\.(?=\s|$)|[;\n])+')
+
+Profile = namedtuple('Profile', ['must_have', 'nice_to_have', 'min_years'])
+Match = namedtuple('Match', ['score', 'matched', 'missing', 'nice_matched'])
+
+
+@lru_cache(maxsize=1)
+def skill_pattern():
+    """
+    Regex matching any alias as a whole word, longest alias first. The words
+    of an alias may be separated by any whitespace, such as a line break.
+    ``AMBIGUOUS`` aliases are case-sensitive.
+    """
+    aliases = sorted(ALIASES, key=len, reverse=True)
+    return re.compile(
+        r'(?<![\w+#.])(' + '|'.join(_alias_regex(alias) for alias in aliases) + r')(?![\w+#])',
+        re.IGNORECASE,
+    )
+
+
+def _alias_regex(alias):
+    if alias in AMBIGUOUS:
+        forms = sorted({AMBIGUOUS[alias], alias.upper()})
+        return '(?-i:' + '|'.join(re.escape(form) for form in forms) + ')'
+    return re.escape(alias).replace(r'\ ', r'\s+')
+
+
+# Longest alias plus the character after it: a match that starts this far
+# from the end of a chunk of text cannot be cut off (see ``api.pipeline``)
+SKILL_OVERLAP = max(len(alias) for alias in ALIASES) + 1
+
+
+def skill_id(match):
+    """The skill id of an alias matched by ``skill_pattern()``."""
+    return ALIASES[' '.join(match.lower().split())]
+
+
+def skill_ids(text):
+    """Return the set of skill ids mentioned in ``text``."""
+    return {skill_id(match) for match in skill_pattern().findall(text)}
+
+
+def skill_ids_for_names(names):
+    """Map skill names (as extracted from CVs or stored on candidates) to ids."""
+    return {NAME_IDS[name.lower()] for name in names if name.lower() in NAME_IDS}
+
+
+def requirement_skill_ids(clause):
+    """
+    Skill ids mentioned in a clause of job requirements. An ``AMBIGUOUS``
+    alias only counts in a skill context: listed together with an
+    unambiguous skill, after a phrase such as "experience with", or making
+    up the whole clause, as in a bulleted list.
+    """
+    # Runs of skills separated only by list punctuation or "and"/"or"
+    groups = []
+    for match in skill_pattern().finditer(clause):
+        if groups and LIST_SEPARATOR_RE.fullmatch(clause, groups[-1][-1].end(), match.start()):
+            groups[-1].append(match)
+        else:
+            groups.append([match])
+
+    ids = set()
+    for group in groups:
+        ambiguous = [' '.join(match.group().lower().split()) in AMBIGUOUS for match in group]
+        in_context = not all(ambiguous) or SKILL_CONTEXT_RE.search(clause, 0, group[0].start()) or (
+            LIST_ITEM_START_RE.fullmatch(clause, 0, group[0].start())
+            and LIST_ITEM_END_RE.fullmatch(clause, group[-1].end())
+        )
+        ids.update(skill_id(match.group()) for match in group if in_context)
+    return ids
+
+
+def parse_requirements(text):
+    """Parse free-text job requirements into a storable profile dict."""
+    must_have, nice_to_have = set(), set()
+    for clause in CLAUSE_RE.split(text or ''):
+        ids = requirement_skill_ids(clause)
+        if NICE_TO_HAVE_RE.search(clause):
+            nice_to_have |= ids
+        else:
+            must_have |= ids
+    years = [int(value) for value in YEARS_RE.findall(text or '')]
+    return {
+        'version': PROFILE_VERSION,
+        'must_have': sorted(must_have),
+        'nice_to_have': sorted(nice_to_have - must_have),
+        'min_years': max(years) if years else None,
+    }
+
+
+@lru_cache(maxsize=4096)
+def _profile_from_text(text):
+    profile = parse_requirements(text)
+    return Profile(frozenset(profile['must_have']), frozenset(profile['nice_to_have']), profile['min_years'])
+
+
+def job_profile(job):
+    """Return the ``Profile`` of ``job``, from its stored profile when current."""
+    return stored_profile(job.requirements_profile, job.requirements)
+
+
+def stored_profile(requirements_profile, requirements):
+    """Return a ``Profile`` from a stored profile dict, reparsing it if outdated."""
+    stored = requirements_profile or {}
+    if stored.get('version') != PROFILE_VERSION:
+        return _profile_from_text(requirements)
+    return Profile(frozenset(stored['must_have']), frozenset(stored['nice_to_have']), stored['min_years'])
+
+
+def profile_representation(profile):
+    """API representation of a ``Profile`` with skill names instead of ids."""
+    return {
+        'must_have': names(profile.must_have),
+        'nice_to_have': names(profile.nice_to_have),
+        'min_years': profile.min_years,
+    }
+
+
+def match_skills(cv_skill_ids, profile):
+    """
+    Score CV skill ids against a job profile (0-100).
+
+    The score is the share of the job's skills the CV covers, with
+    nice-to-have skills weighted half as much as must-haves.
+    """
+    matched = cv_skill_ids & profile.must_have
+    nice_matched = cv_skill_ids & profile.nice_to_have
+    total = len(profile.must_have) + 0.5 * len(profile.nice_to_have)
+    score = int((len(matched) + 0.5 * len(nice_matched)) / total * 100) if total else 0
+    return Match(score, matched, profile.must_have - matched, nice_matched)
+
+
+def names(ids):
+    """Canonical names for ``ids``, sorted for stable output."""
+    return sorted(SKILL_NAMES[skill_id] for skill_id in ids)
@@ -0,0 +1,108 @@
+"""
+Delta sync for clients that cache the job, application, candidate and CV
+match lists.
+
+Every synced model has an indexed ``updated_at`` (``auto_now``; code that
+writes with ``QuerySet.update()`` or ``bulk_update()`` sets it itself) and
+deletes leave a ``Tombstone``. ``changes()`` returns the rows modified and
+the ids deleted since a token, plus a new token, so a client that polls
+downloads what changed instead of every list.
+
+Tokens are the server time the previous sync started at. Rows are matched
+from ``OVERLAP_SECONDS`` before it, since a transaction can commit a row
+after a sync that started later than the row's ``updated_at``; clients
+upsert by id, so the few rows sent twice are harmless. Tombstones are kept
+for ``TOMBSTONE_DAYS`` (see ``manage.py prune_tombstones``); older tokens
+get ``TokenExpired`` and the client starts again from a full sync.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Job, Application, Candidate, CVMatch, Tombstone
+from .serializers import (
+    JobValuesSerializer, ApplicationValuesSerializer, CandidateValuesSerializer, CVMatchValuesSerializer,
+)
+
+DEFAULTS = {
+    'OVERLAP_SECONDS': 10,
+    'TOMBSTONE_DAYS': 30,
+}
+
+# Name in the response -> (model, serializer, relations whose changes show
+# up in the serialized row)
+SYNCED = {
+    'jobs': (Job, JobValuesSerializer, []),
+    'applications': (Application, ApplicationValuesSerializer, ['candidate']),
+    'candidates': (Candidate, CandidateValuesSerializer, []),
+    'cv_matches': (CVMatch, CVMatchValuesSerializer, []),
+}
+
+
+class TokenExpired(Exception):
+    """The token is older than the tombstones kept; sync from scratch."""
+
+
+def config():
+    return {**DEFAULTS, **getattr(settings, 'SYNC', {})}
+
+
+def make_token(moment):
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def parse_token(token):
+    """Raises ``ValueError`` for a malformed or out of range token."""
+    try:
+        return datetime.fromtimestamp(int(token) / 1_000_000, tz=dt_timezone.utc)
+    except (OverflowError, OSError) as e:
+        raise ValueError(f'Sync token out of range: {token}') from e
+
+
+def changes(since=None, names=None):
+    """
+    Rows of the ``names`` lists (all by default) changed since the token
+    ``since``, as ``{name: rows, 'deleted': {name: ids}, 'token': token}``.
+    Without ``since`` every row is returned.
+    """
+    options = config()
+    now = timezone.now()
+    result = {'token': make_token(now), 'deleted': {}}
+    cutoff = None
+    if since is not None:
+        since = parse_token(since)
+        if since < now - timedelta(days=options['TOMBSTONE_DAYS']):
+            raise TokenExpired('Sync token expired')
+        cutoff = since - timedelta(seconds=options['OVERLAP_SECONDS'])
+
+    for name in names or SYNCED:
+        model, serializer, relations = SYNCED[name]
+        queryset = model.objects.all()
+        if cutoff is not None:
+            changed = Q(updated_at__gt=cutoff)
+            for relation in relations:
+                related = model._meta.get_field(relation).related_model
+                changed |= Q(**{f'{relation}__in': related.objects.filter(updated_at__gt=cutoff)})
+            queryset = queryset.filter(changed)
+        rows = serializer(queryset).data
+        result[name] = rows
+
+        if cutoff is not None:
+            # A row deleted and then created again (e.g. restored from the
+            # archive) is live, not deleted
+            live = {str(row['id']) for row in rows}
+            tombstones = Tombstone.objects.filter(
+                model=model._meta.model_name, deleted_at__gt=cutoff
+            ).values_list('object_id', flat=True).distinct()
+            to_python = model._meta.pk.to_python
+            result['deleted'][name] = [to_python(pk) for pk in tombstones if pk not in live]
+    return result
+
+
+def prune_tombstones(days=None):
+    """Delete tombstones older than ``days`` (``TOMBSTONE_DAYS``); returns how many."""
+    days = config()['TOMBSTONE_DAYS'] if days is None else days
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - timedelta(days=days)).delete()
+    return deleted
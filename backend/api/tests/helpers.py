@@ -0,0 +1,12 @@
+from ..models import Candidate, Job
+
+
+def make_job(pk='JOB-1', **fields):
+    return Job.objects.create(**{
+        'id': pk, 'title': 'Backend Engineer', 'department': 'Engineering', 'location': 'Remote',
+        'requirements': 'Python and Django. Docker is a plus.', **fields,
+    })
+
+
+def make_candidate(email, **fields):
+    return Candidate.objects.create(**{'name': 'Ann Smith', 'email': email, 'phone': '', **fields})
@@ -0,0 +1,62 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..archive import ArchiveError, archive_jobs, restore_job
+from ..models import Application, ArchivedApplication, ArchivedCVMatch, CVMatch, Job
+from .helpers import make_candidate, make_job
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.job = make_job(status='Closed')
+        self.cv_match = CVMatch.objects.create(job=self.job, file_name='a.pdf')
+
+    def test_only_closed_jobs_are_archived(self):
+        open_job = make_job('JOB-2')
+        CVMatch.objects.create(job=open_job, file_name='b.pdf')
+        archive_jobs([self.job.pk, open_job.pk])
+        self.assertIsNone(Job.objects.get(pk=open_job.pk).archived_at)
+        self.assertEqual(CVMatch.objects.filter(job=open_job).count(), 1)
+        self.assertEqual(ArchivedCVMatch.objects.filter(job=self.job).count(), 1)
+
+    def test_export_and_detail_read_through(self):
+        archive_jobs([self.job.pk])
+        response = self.client.get('/api/cv-matches/export/', {'output': 'ndjson', 'job': self.job.pk})
+        self.assertEqual(b''.join(response.streaming_content).count(b'\n'), 1)
+        self.assertEqual(self.client.get(f'/api/cv-matches/{self.cv_match.pk}/').status_code, 200)
+        response = self.client.get('/api/cv-matches/')
+        self.assertEqual(response.json(), [])
+        self.assertEqual(response['X-Archived-Excluded'], 'true')
+
+    def test_failed_restore_leaves_the_job_closed(self):
+        archive_jobs([self.job.pk])
+        with mock.patch('api.views.restore_job', side_effect=ArchiveError('conflict')):
+            response = self.client.patch(f'/api/jobs/{self.job.pk}/toggle_status/')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Job.objects.get(pk=self.job.pk).status, 'Closed')
+
+        response = self.client.patch(f'/api/jobs/{self.job.pk}/toggle_status/')
+        self.assertEqual(response.json()['status'], 'Open')
+        self.assertTrue(CVMatch.objects.filter(pk=self.cv_match.pk).exists())
+
+    def test_restore_keeps_ids_and_timestamps(self):
+        application = Application.objects.create(
+            candidate=make_candidate('ann@example.com'), job=self.job, job_title=self.job.title
+        )
+        past = timezone.now() - timedelta(days=90)
+        CVMatch.objects.filter(pk=self.cv_match.pk).update(uploaded_at=past)
+        Application.objects.filter(pk=application.pk).update(applied_at=past - timedelta(days=1))
+
+        archive_jobs([self.job.pk])
+        self.assertEqual(ArchivedCVMatch.objects.get().uploaded_at, past)
+        self.assertEqual(ArchivedApplication.objects.get().applied_at, past - timedelta(days=1))
+
+        restore_job(Job.objects.get(pk=self.job.pk))
+        cv_match = CVMatch.objects.get()
+        self.assertEqual((cv_match.pk, cv_match.uploaded_at), (self.cv_match.pk, past))
+        restored = Application.objects.get()
+        self.assertEqual((restored.pk, restored.applied_at), (application.pk, past - timedelta(days=1)))
+        self.assertFalse(ArchivedCVMatch.objects.exists() or ArchivedApplication.objects.exists())
@@ -0,0 +1,47 @@
+from django.test import TestCase
+
+from ..benchmarks import Runner, compare, percentile
+from ..models import Job
+from .helpers import make_job
+
+
+class PercentileTests(TestCase):
+    def test_interpolates_between_samples(self):
+        self.assertEqual(percentile([], 50), 0.0)
+        self.assertEqual(percentile([3, 1, 2], 50), 2)
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2.5)
+        self.assertEqual(percentile([1, 2, 3, 4], 100), 4)
+
+
+class RunnerTests(TestCase):
+    def test_measure_records_timings_queries_and_throughput(self):
+        make_job()
+        runner = Runner(sizes=[1], iterations=5, warmup=1)
+        result = runner.measure('jobs', lambda: list(Job.objects.all()), units=10)
+
+        self.assertIs(runner.results['jobs'], result)
+        self.assertEqual(result['iterations'], 5)
+        self.assertEqual(result['queries'], 1)
+        self.assertLessEqual(result['min_ms'], result['p50_ms'])
+        self.assertLessEqual(result['p50_ms'], result['max_ms'])
+        self.assertEqual(result['units'], 10)
+        self.assertGreater(result['units_per_sec'], 0)
+
+
+class CompareTests(TestCase):
+    def result(self, p50, queries=1, peak=100.0):
+        return {'p50_ms': p50, 'queries': queries, 'peak_kb': peak}
+
+    def test_flags_slower_cases_extra_queries_and_memory(self):
+        baseline = {'a': self.result(10), 'b': self.result(10), 'c': self.result(10)}
+        current = {
+            'a': self.result(11),
+            'b': self.result(13, queries=2),
+            'c': self.result(10, peak=150.0),
+            'new': self.result(100),
+        }
+        regressions = compare(baseline, current, threshold=0.2)
+        self.assertEqual(len(regressions), 3)
+        self.assertTrue(regressions[0].startswith('b: p50'))
+        self.assertTrue(regressions[1].startswith('b: queries'))
+        self.assertTrue(regressions[2].startswith('c: peak memory'))
@@ -0,0 +1,79 @@
+import random
+
+from django.test import TestCase
+
+from ..benchmarks.fixtures import cv_text
+from ..dedup import MergeError, dedup_fields, find_duplicates, merge_candidates
+from ..models import Application, Candidate, CVMatch
+from .helpers import make_candidate, make_job
+
+
+class MergeTests(TestCase):
+    def setUp(self):
+        self.job = make_job()
+        self.other_job = make_job('JOB-2')
+        self.target = make_candidate('ann@example.com', skills=['Python'])
+        self.source = make_candidate('ann.smith@example.com', phone='555 0100 200', skills=['Django', 'Python'])
+
+    def test_merge_moves_applications_and_deletes_the_source(self):
+        Application.objects.create(candidate=self.target, job=self.job, job_title=self.job.title)
+        Application.objects.create(candidate=self.source, job=self.job, job_title=self.job.title)
+        moved = Application.objects.create(candidate=self.source, job=self.other_job, job_title=self.other_job.title)
+
+        target, counts = merge_candidates([self.target.pk, self.source.pk])
+
+        self.assertEqual(target.pk, self.target.pk)
+        self.assertEqual(counts['merged_candidates'], 1)
+        self.assertEqual(counts['moved_applications'], 1)
+        self.assertEqual(counts['deleted_applications'], 1)
+        self.assertFalse(Candidate.objects.filter(pk=self.source.pk).exists())
+        moved.refresh_from_db()
+        self.assertEqual(moved.candidate_id, target.pk)
+        self.assertEqual(target.skills, ['Python', 'Django'])
+        self.assertEqual(target.phone, '555 0100 200')
+
+    def test_merge_endpoint_validates_ids(self):
+        response = self.client.post(
+            '/api/candidates/merge/', {'candidates': ['x']}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            '/api/candidates/merge/', {'candidates': [self.target.pk, 999]}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_nothing_to_merge(self):
+        with self.assertRaises(MergeError):
+            merge_candidates()
+
+
+class DuplicateTests(TestCase):
+    def make_cv_match(self, file_name, text, job=None):
+        return CVMatch.objects.create(
+            job=job or self.job, file_name=file_name, extracted_text=text[:1000], **dedup_fields(text)
+        )
+
+    def setUp(self):
+        self.job = make_job()
+
+    def test_same_cv_under_another_name_and_email(self):
+        text = cv_text(random.Random(3))
+        first = self.make_cv_match('a.pdf', text)
+        second = self.make_cv_match('b.pdf', text.replace('@', '.work@'))
+        other = self.make_cv_match('c.pdf', cv_text(random.Random(4)))
+
+        clusters = find_duplicates()
+        self.assertIn([first.pk, second.pk], [cluster['cv_matches'] for cluster in clusters])
+        self.assertNotIn(other.pk, [pk for cluster in clusters for pk in cluster['cv_matches']])
+
+    def test_shared_email_links_candidate_and_cv(self):
+        candidate = make_candidate('jane.doe@example.com')
+        cv_match = self.make_cv_match('jane.pdf', 'Jane Doe\njane.doe@example.com\n' + cv_text(random.Random(5)))
+
+        cluster, = find_duplicates()
+        self.assertEqual(cluster['candidates'], [candidate.pk])
+        self.assertEqual(cluster['cv_matches'], [cv_match.pk])
+        self.assertIn('email', cluster['reasons'])
+
+        merge_candidates([candidate.pk], [cv_match.pk])
+        self.assertEqual(find_duplicates(), [])
@@ -0,0 +1,51 @@
+import csv
+import io
+import json
+
+from django.test import TestCase, override_settings
+
+from .. import profiling
+from ..models import Application
+from .helpers import make_candidate, make_job
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.job = make_job()
+        for i, name in enumerate(['Ann Smith', '=HYPERLINK("http://evil")', '@SUM(A1)']):
+            candidate = make_candidate(f'c{i}@example.com', name=name)
+            Application.objects.create(candidate=candidate, job=self.job, job_title=self.job.title)
+
+    def export(self, output, **params):
+        response = self.client.get('/api/applications/export/', {'output': output, **params})
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_has_a_header_and_one_line_per_row(self):
+        rows = list(csv.DictReader(io.StringIO(self.export('csv'))))
+        self.assertEqual([row['candidate__email'] for row in rows],
+                         ['c0@example.com', 'c1@example.com', 'c2@example.com'])
+        self.assertEqual(rows[0]['job_title'], 'Backend Engineer')
+
+    def test_csv_cells_are_not_run_as_formulas(self):
+        names = [row['candidate__name'] for row in csv.DictReader(io.StringIO(self.export('csv')))]
+        self.assertEqual(names, ['Ann Smith', '\'=HYPERLINK("http://evil")', "'@SUM(A1)"])
+
+    def test_ndjson_keeps_values_as_they_are(self):
+        rows = [json.loads(line) for line in self.export('ndjson', job=self.job.pk).splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[1]['candidate__name'], '=HYPERLINK("http://evil")')
+        self.assertEqual(rows[0]['job_id'], self.job.pk)
+
+    def test_unknown_output_is_rejected(self):
+        response = self.client.get('/api/applications/export/', {'output': 'xlsx'})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(PROFILING={'ENABLED': True, 'SLOW_REQUEST_MS': 0})
+    def test_streamed_reads_are_profiled(self):
+        with self.assertLogs('api.profiling'):
+            self.export('csv')
+        entry = profiling.slow_requests[-1]
+        self.assertEqual(entry['path'], '/api/applications/export/')
+        # The live and archived application reads happen while streaming
+        self.assertGreaterEqual(entry['db_queries'], 2)
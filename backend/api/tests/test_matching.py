@@ -0,0 +1,67 @@
+from django.test import TestCase
+
+from .. import scoring
+from ..models import Job
+from ..scoring import open_job_matrix, rank_jobs
+from .helpers import make_candidate, make_job
+
+BACKEND_CV = 'Senior Python developer. Built Django REST APIs, deployed with Docker.'
+
+
+class MatchCVTests(TestCase):
+    def match(self, data):
+        return self.client.post('/api/jobs/match_cv/', data, content_type='application/json')
+
+    def test_ids_must_be_integers(self):
+        for data in [{'cv_match': 'abc'}, {'candidate': '1x'}, {'candidate': [1, 2]}]:
+            with self.subTest(data=data):
+                self.assertEqual(self.match(data).status_code, 400)
+
+    def test_unknown_id(self):
+        self.assertEqual(self.match({'cv_match': 99}).status_code, 404)
+
+    def test_zero_is_an_id(self):
+        self.assertEqual(self.match({'cv_match': 0}).status_code, 404)
+        self.assertEqual(self.match({'candidate': '0'}).status_code, 404)
+        self.assertEqual(self.match({'cv_match': ''}).status_code, 400)
+
+    def test_candidate_is_ranked_on_skills(self):
+        scoring._cache.clear()
+        make_job()
+        candidate = make_candidate('ann@example.com', skills=['Python', 'Django'])
+        response = self.match({'candidate': candidate.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([match['job']['id'] for match in response.json()['matches']], ['JOB-1'])
+
+
+class RankJobsTests(TestCase):
+    def setUp(self):
+        # Vocabulary ids are reused once a test's transaction rolls back
+        scoring._cache.clear()
+        self.backend = make_job('JOB-1')
+        self.design = make_job('JOB-2', title='Designer', requirements='Figma, Photoshop and branding.')
+        self.devops = make_job('JOB-3', title='DevOps', requirements='Docker, Kubernetes and Terraform.')
+
+    def test_best_jobs_first_without_zero_scores(self):
+        ranked = rank_jobs(BACKEND_CV)
+        self.assertEqual([job_id for job_id, _ in ranked], ['JOB-1', 'JOB-3'])
+        self.assertGreater(ranked[0][1], ranked[1][1])
+        self.assertEqual(rank_jobs(BACKEND_CV, limit=1), ranked[:1])
+
+    def test_matrix_scores_match_single_job_scoring(self):
+        matrix = open_job_matrix()
+        for job_id, score in zip(matrix.job_ids, matrix.scores(BACKEND_CV)):
+            with self.subTest(job=job_id):
+                self.assertEqual(score, scoring.tfidf_score(BACKEND_CV, Job.objects.get(pk=job_id)))
+
+    def test_matrix_follows_job_changes(self):
+        matrix = open_job_matrix()
+        self.assertIs(open_job_matrix(), matrix)
+
+        self.devops.status = 'Closed'
+        self.devops.save()
+        self.assertEqual([job_id for job_id, _ in rank_jobs(BACKEND_CV)], ['JOB-1'])
+
+        self.design.requirements = 'Python, Django and Docker.'
+        self.design.save()
+        self.assertEqual({job_id for job_id, _ in rank_jobs(BACKEND_CV)}, {'JOB-1', 'JOB-2'})
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import TestCase
+
+from ..metrics import PDF_PARSE_FAILURES
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def sample(text, name):
+    """The value of the sample line ``name`` (with labels) in a metrics page."""
+    for line in text.splitlines():
+        if line.startswith(name + ' '):
+            return float(line.split()[-1])
+    return None
+
+
+class MetricsTests(TestCase):
+    def test_request_latency_by_view(self):
+        name = 'talentflow_request_duration_seconds_count{method="GET",view="job-list"}'
+        before = sample(self.client.get('/metrics').content.decode(), name) or 0
+        self.client.get('/api/jobs/')
+
+        page = self.client.get('/metrics')
+        self.assertTrue(page['Content-Type'].startswith('text/plain'))
+        self.assertEqual(sample(page.content.decode(), name), before + 1)
+
+    def test_pipeline_counters_are_exposed(self):
+        before = sample(self.client.get('/metrics').content.decode(), 'talentflow_pdf_parse_failures_total')
+        PDF_PARSE_FAILURES.inc()
+        after = sample(self.client.get('/metrics').content.decode(), 'talentflow_pdf_parse_failures_total')
+        self.assertEqual(after, before + 1)
+
+    def test_multiprocess_samples_are_aggregated(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Two worker processes write their samples to the shared directory
+            env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': directory}
+            for count in (2, 3):
+                subprocess.run(
+                    [sys.executable, '-c', f'from api.metrics import PDF_PARSE_FAILURES; PDF_PARSE_FAILURES.inc({count})'],
+                    cwd=BACKEND_DIR, env=env, check=True,
+                )
+            with mock.patch.dict(os.environ, {'PROMETHEUS_MULTIPROC_DIR': directory}):
+                text = self.client.get('/metrics').content.decode()
+        self.assertEqual(sample(text, 'talentflow_pdf_parse_failures_total'), 5)
@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from prometheus_client import REGISTRY
+
+from .. import pdf
+from ..benchmarks.fixtures import make_pdf
+from ..pdf import Backend, PDFExtractionError, extract_stream, extract_text
+
+PAGE = 'Python developer with Django and Docker experience'
+
+
+class FakeBackend(Backend):
+    module = 'io'
+
+    def __init__(self, name, pages=(PAGE,), fail_at=None, module='io'):
+        self.name = name
+        self.texts = list(pages)
+        self.fail_at = fail_at
+        self.module = module
+
+    def iter_pages(self, stream):
+        if self.fail_at == 0:
+            raise ValueError('cannot open')
+        for i, text in enumerate(self.texts, 1):
+            if i == self.fail_at:
+                raise ValueError(f'bad page {i}')
+            yield text
+
+
+class Consumer(list):
+    feed = list.append
+
+
+def fallbacks(name):
+    return REGISTRY.get_sample_value('talentflow_pdf_extraction_fallbacks_total', {'backend': name}) or 0
+
+
+class FallbackTests(SimpleTestCase):
+    def extract(self, *backends, consumer_factory=Consumer):
+        names = [backend.name for backend in backends]
+        with mock.patch.dict(pdf.BACKENDS, {backend.name: backend for backend in backends}), \
+                override_settings(PDF_EXTRACTION={'BACKENDS': names}):
+            return extract_stream(mock.Mock(), consumer_factory)
+
+    def test_first_working_backend_wins(self):
+        extraction = self.extract(FakeBackend('fast'), FakeBackend('slow'))
+        self.assertEqual((extraction.backend, extraction.pages, extraction.consumer), ('fast', 1, [PAGE]))
+
+    def test_failing_backend_falls_back_with_a_fresh_consumer(self):
+        for broken in [
+            FakeBackend('broken', fail_at=0),
+            FakeBackend('broken', pages=[PAGE, PAGE], fail_at=2),
+            FakeBackend('broken', pages=['   ', '1']),
+        ]:
+            with self.subTest(broken=broken.texts, fail_at=broken.fail_at):
+                before = fallbacks('broken')
+                extraction = self.extract(broken, FakeBackend('fallback', pages=[PAGE, PAGE]))
+                self.assertEqual(extraction.backend, 'fallback')
+                self.assertEqual(extraction.consumer, [PAGE, PAGE])
+                self.assertEqual(fallbacks('broken'), before + 1)
+
+    def test_backends_that_are_not_installed_are_skipped(self):
+        extraction = self.extract(FakeBackend('missing', module='no_such_pdf_module'), FakeBackend('fallback'))
+        self.assertEqual(extraction.backend, 'fallback')
+
+    def test_error_when_every_backend_fails(self):
+        with self.assertRaisesMessage(PDFExtractionError, 'one: cannot open; two: no text layer found'):
+            self.extract(FakeBackend('one', fail_at=0), FakeBackend('two', pages=['']))
+        with self.assertRaisesMessage(PDFExtractionError, 'No PDF extraction backend is installed'):
+            self.extract()
+
+    def test_consumer_errors_are_not_fallbacks(self):
+        class BrokenConsumer(Consumer):
+            def feed(self, text):
+                raise KeyError(text)
+
+        second = FakeBackend('second')
+        with mock.patch.object(second, 'iter_pages') as iter_pages, self.assertRaises(KeyError):
+            self.extract(FakeBackend('first'), second, consumer_factory=BrokenConsumer)
+        iter_pages.assert_not_called()
+
+
+class BackendTests(SimpleTestCase):
+    def test_every_installed_backend_reads_the_same_pages(self):
+        data = make_pdf('\n'.join([PAGE] * 3), lines_per_page=2)
+        for backend in pdf.configured_backends():
+            with self.subTest(backend=backend.name):
+                pages = pdf.extract_pages(data, backend)
+                self.assertEqual(len(pages), 2)
+                self.assertIn(PAGE, ' '.join(pages[0].split()))
+
+    def test_extract_text_joins_pages(self):
+        extraction = extract_text(make_pdf(f'{PAGE}\n{PAGE}', lines_per_page=1))
+        self.assertEqual(extraction.pages, 2)
+        self.assertEqual(extraction.text.count('Django'), 2)
@@ -0,0 +1,36 @@
+import random
+
+from django.test import TestCase
+
+from ..benchmarks.fixtures import cv_text
+from ..dedup import dedup_fields
+from ..pipeline import CVText, SkillScanner
+from ..scoring import word_counts
+from ..skills import names, skill_ids
+
+
+class PageSplitTests(TestCase):
+    def test_streamed_results_equal_whole_text(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            text = cv_text(rng, lines=60)
+            cuts = sorted(rng.sample(range(1, len(text)), 5))
+            pages = [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+            whole = '\n'.join(pages).strip()
+
+            cv = CVText()
+            for page in pages:
+                cv.feed(page)
+            cv.finish()
+
+            self.assertEqual(cv.skill_ids, skill_ids(whole))
+            self.assertEqual(cv.text, whole[:1000])
+            self.assertEqual(cv.size, len(whole))
+            self.assertEqual(cv.duplicates.fields(), dedup_fields(whole))
+            self.assertEqual(cv.words, word_counts(whole))
+
+    def test_alias_split_across_chunks(self):
+        scanner = SkillScanner()
+        for chunk in ['I know machine', '\nlearning and spring', '  boot']:
+            scanner.feed(chunk)
+        self.assertEqual(names(scanner.finish()), ['Machine Learning', 'Spring'])
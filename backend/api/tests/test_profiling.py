@@ -0,0 +1,42 @@
+from django.test import TestCase, override_settings
+
+from .. import profiling
+from .helpers import make_job
+
+
+@override_settings(PROFILING={'ENABLED': True, 'SLOW_REQUEST_MS': 60000})
+class ProfilingMiddlewareTests(TestCase):
+    def test_timing_and_query_count_headers(self):
+        make_job()
+        response = self.client.get('/api/jobs/')
+
+        self.assertEqual(response['X-DB-Query-Count'], '1')
+        timings = [entry.split(';')[0] for entry in response['Server-Timing'].split(', ')]
+        self.assertEqual(timings[:3], ['total', 'db', 'render'])
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+
+    @override_settings(PROFILING={'ENABLED': True, 'SLOW_REQUEST_MS': 0, 'SLOW_LOG_SIZE': 5})
+    def test_slow_requests_are_logged(self):
+        with self.assertLogs('api.profiling', 'WARNING'):
+            self.client.get('/api/jobs/')
+        entry = profiling.slow_requests[-1]
+        self.assertEqual((entry['method'], entry['path'], entry['status']), ('GET', '/api/jobs/', 200))
+        self.assertEqual(profiling.slow_requests.maxlen, 5)
+
+    def test_stages_are_reported(self):
+        profile = profiling.RequestProfile()
+        token = profiling._current.set(profile)
+        try:
+            profiling.record_stage('pdf', 0.25)
+            profiling.record_stage('pdf', 0.25)
+        finally:
+            profiling._current.reset(token)
+        self.assertEqual(profile.stages, {'pdf': 500.0})
+        self.assertIn('pdf;dur=500.0', profile.server_timing(600))
+
+
+class ProfilingDisabledTests(TestCase):
+    def test_no_headers_by_default(self):
+        response = self.client.get('/api/jobs/')
+        self.assertNotIn('Server-Timing', response)
+        self.assertIsNone(profiling.current())
@@ -0,0 +1,80 @@
+import io
+from decimal import Decimal
+
+import orjson
+from django.test import TestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from ..models import Application, Candidate, CVMatch, Job
+from ..parsers import ORJSONParser
+from ..renderers import ORJSONRenderer
+from ..serializers import (
+    ApplicationSerializer, ApplicationValuesSerializer, CandidateSerializer, CandidateValuesSerializer,
+    CVMatchSerializer, CVMatchValuesSerializer, JobSerializer, JobValuesSerializer,
+)
+from .helpers import make_candidate, make_job
+
+
+class ORJSONTests(TestCase):
+    data = {
+        'name': 'Zoë Łukasz 日本',
+        'count': 3,
+        'score': 0.25,
+        'decimal': Decimal('1.50'),
+        'active': True,
+        'missing': None,
+        'skills': ['Python', 'Go'],
+        'nested': {'a': [1, {'b': 'c'}]},
+    }
+
+    def test_renderer_matches_drf(self):
+        self.assertEqual(ORJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_parser_round_trip(self):
+        parsed = ORJSONParser().parse(io.BytesIO(ORJSONRenderer().render(self.data)))
+        self.assertEqual(parsed, {**self.data, 'decimal': 1.5})
+
+    def test_parser_decodes_other_charsets(self):
+        body = '{"name": "Zoë"}'.encode('latin-1')
+        parsed = ORJSONParser().parse(io.BytesIO(body), parser_context={'encoding': 'latin-1'})
+        self.assertEqual(parsed, {'name': 'Zoë'})
+
+    def test_invalid_json(self):
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"name": '))
+        response = self.client.post('/api/jobs/', b'{"title": ', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class ValuesSerializerParityTests(TestCase):
+    def setUp(self):
+        self.job = make_job(requirements='3+ years of Python. Docker is a plus.')
+        self.candidate = make_candidate('ann@example.com', skills=['Python'], resume_url='/resumes/ann.pdf')
+        CVMatch.objects.create(
+            job=self.job, file_name='ann.pdf', extracted_skills=['Python'], match_score=80,
+            match_status='matched', email='ann@example.com', candidate=self.candidate,
+        )
+        Application.objects.create(
+            candidate=self.candidate, job=self.job, job_title=self.job.title, rating=4, notes='Strong',
+        )
+
+    def assertSameOutput(self, values_serializer, model_serializer, model):
+        queryset = model.objects.order_by('pk')
+        expected = orjson.loads(ORJSONRenderer().render(model_serializer(queryset, many=True).data))
+        actual = orjson.loads(ORJSONRenderer().render(values_serializer(queryset).data))
+        self.assertEqual(actual, expected)
+        self.assertEqual([list(row) for row in actual], [list(row) for row in expected])
+
+    def test_jobs(self):
+        self.assertSameOutput(JobValuesSerializer, JobSerializer, Job)
+
+    def test_candidates(self):
+        self.assertSameOutput(CandidateValuesSerializer, CandidateSerializer, Candidate)
+
+    def test_cv_matches(self):
+        self.assertSameOutput(CVMatchValuesSerializer, CVMatchSerializer, CVMatch)
+
+    def test_applications(self):
+        self.assertSameOutput(ApplicationValuesSerializer, ApplicationSerializer, Application)
@@ -0,0 +1,40 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from ..middleware import ReplicaMiddleware
+from ..models import Job
+from ..routers import ReplicaRouter, read_from_replicas
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTests(TestCase):
+    def test_reads_stay_on_primary_after_a_write(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Job), 'default')
+        with read_from_replicas():
+            self.assertEqual(router.db_for_read(Job), 'replica')
+            self.assertEqual(router.db_for_write(Job), 'default')
+            self.assertEqual(router.db_for_read(Job), 'default')
+        with read_from_replicas():
+            self.assertEqual(router.db_for_read(Job), 'replica')
+        # Writes outside a replica block leave the next block alone
+        router.db_for_write(Job)
+        with read_from_replicas():
+            self.assertEqual(router.db_for_read(Job), 'replica')
+
+    def test_writing_client_sticks_to_primary(self):
+        databases = []
+
+        def view(request):
+            databases.append(ReplicaRouter().db_for_read(Job))
+            return HttpResponse()
+
+        middleware = ReplicaMiddleware(view)
+        factory = RequestFactory()
+        middleware(factory.get('/api/jobs/'))
+        response = middleware(factory.post('/api/jobs/'))
+        cookie = response.cookies[ReplicaMiddleware.cookie_name]
+        request = factory.get('/api/jobs/')
+        request.COOKIES[ReplicaMiddleware.cookie_name] = cookie.value
+        middleware(request)
+        self.assertEqual(databases, ['replica', 'default', 'default'])
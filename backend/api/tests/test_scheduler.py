@@ -0,0 +1,85 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from ..benchmarks.fixtures import make_pdf
+from ..models import CVMatch
+from ..scheduler import CVScheduler, QueueFull, process_in_chunks
+from .helpers import make_job
+
+
+class SchedulerTests(TestCase):
+    def hold_slot(self, scheduler):
+        """Occupy the scheduler's only slot until the returned event is set."""
+        release, started = threading.Event(), threading.Event()
+
+        def run():
+            process_in_chunks([1], 'holder', lambda _: (started.set(), release.wait()), scheduler)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        started.wait()
+        self.addCleanup(thread.join)
+        self.addCleanup(release.set)
+        return release
+
+    def test_fair_order_between_keys(self):
+        scheduler = CVScheduler(max_concurrent=1, max_wait=5, worker_threads=10)
+        release = self.hold_slot(scheduler)
+        order = []
+        threads = [
+            threading.Thread(target=process_in_chunks, args=(list(range(4)), key, order.append, scheduler, 1))
+            for key in ('big', 'small')
+        ]
+        threads[0].start()
+        time.sleep(0.05)
+        threads[1] = threading.Thread(target=process_in_chunks, args=(['s'], 'small', order.append, scheduler, 1))
+        threads[1].start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+        # The small upload goes ahead of the rest of the big one
+        self.assertLess(order.index('s'), 3)
+
+    def test_rejected_first_chunk_is_not_charged(self):
+        scheduler = CVScheduler(max_concurrent=1, max_wait=0.05, worker_threads=10)
+        self.hold_slot(scheduler)
+        tags = dict(scheduler.finish_tags)
+        with self.assertRaises(QueueFull):
+            process_in_chunks([1, 2], 'late', lambda _: None, scheduler)
+        self.assertEqual(scheduler.finish_tags, tags)
+
+    def test_uploads_capped_below_worker_threads(self):
+        scheduler = CVScheduler(max_concurrent=1, max_queued=8, max_wait=5, worker_threads=2)
+        self.hold_slot(scheduler)
+        with self.assertRaises(QueueFull):
+            process_in_chunks([1], 'second', lambda _: None, scheduler)
+
+    def test_slot_released_when_processing_fails(self):
+        scheduler = CVScheduler(max_concurrent=1)
+        with self.assertRaises(ZeroDivisionError):
+            process_in_chunks([1], 'key', lambda _: 1 / 0, scheduler)
+        self.assertEqual((scheduler.running, scheduler.uploads), (0, 0))
+
+
+class QueueFullResponseTests(TestCase):
+    def test_process_cvs_is_rejected_with_retry_after(self):
+        job = make_job()
+        scheduler = CVScheduler(max_concurrent=1, max_queued=0)
+        cv = SimpleUploadedFile('ann.pdf', make_pdf('Python and Django'), content_type='application/pdf')
+        with mock.patch('api.views.get_scheduler', return_value=scheduler):
+            response = self.client.post(f'/api/jobs/{job.pk}/process_cvs/', {'cvs': [cv]})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertIn('retry after 1s', response.json()['error'])
+        self.assertFalse(CVMatch.objects.exists())
+
+    def test_retry_after_grows_with_the_backlog(self):
+        scheduler = CVScheduler(max_concurrent=2)
+        scheduler.seconds_per_cv = 1
+        scheduler.running_cost = 10
+        self.assertEqual(scheduler.retry_after(), 5)
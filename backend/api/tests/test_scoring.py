@@ -0,0 +1,58 @@
+from collections import Counter
+
+from django.test import TestCase
+
+from .. import scoring
+from ..models import Job
+from ..scoring import tfidf_score, tfidf_scores, tfidf_scores_from_counts, tokenize, word_counts
+from .helpers import make_job
+
+BACKEND_CV = 'Senior Python developer. Built Django REST APIs, deployed with Docker.'
+DESIGN_CV = 'Graphic designer working in Figma and Photoshop on brand identities.'
+
+
+class TfidfScoreTests(TestCase):
+    def setUp(self):
+        # Vocabulary ids are reused once a test's transaction rolls back
+        scoring._cache.clear()
+        self.job = make_job()
+
+    def test_relevant_cv_scores_higher(self):
+        relevant, unrelated = tfidf_scores([BACKEND_CV, DESIGN_CV], self.job)
+        self.assertGreater(relevant, 50)
+        self.assertEqual(unrelated, 0)
+
+    def test_batch_and_counts_match_single_scores(self):
+        texts = [BACKEND_CV, DESIGN_CV, '']
+        singles = [tfidf_score(text, self.job) for text in texts]
+        self.assertEqual(tfidf_scores(texts, self.job), singles)
+        self.assertEqual(tfidf_scores_from_counts(map(word_counts, texts), self.job), singles)
+
+    def test_counts_can_be_summed_page_by_page(self):
+        pages = BACKEND_CV.split('. ')
+        counts = sum((word_counts(page) for page in pages), Counter())
+        self.assertEqual(tfidf_scores_from_counts([counts], self.job), [tfidf_score(' '.join(pages), self.job)])
+
+    def test_near_variants_share_ngrams(self):
+        self.assertTrue(set(tokenize('postgres')) & set(tokenize('postgresql')))
+        self.assertEqual(tokenize('go'), ['go'])
+        self.assertEqual(tokenize('the 2020'), [])
+
+    def test_job_without_terms_scores_zero(self):
+        job = make_job('JOB-2', requirements='The and of 2024')
+        self.assertEqual(tfidf_scores([BACKEND_CV, DESIGN_CV], job), [0, 0])
+
+    def test_job_vector_is_persisted_until_requirements_change(self):
+        tfidf_score(BACKEND_CV, self.job)
+        stored = Job.objects.get(pk=self.job.pk).tfidf_vector
+        self.assertEqual(stored['vocabulary'], scoring.get_vocabulary().pk)
+
+        job = Job.objects.get(pk=self.job.pk)
+        with self.assertNumQueries(1):
+            # Only the vocabulary lookup; the stored vector is reused
+            tfidf_score(BACKEND_CV, job)
+
+        job.requirements = 'Figma and Photoshop.'
+        job.save()
+        self.assertGreater(tfidf_score(DESIGN_CV, job), 50)
+        self.assertNotEqual(Job.objects.get(pk=job.pk).tfidf_vector['requirements'], stored['requirements'])
@@ -0,0 +1,66 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from ..models import Candidate, CVMatch
+from ..views import PLACEHOLDER_PHONE
+from .helpers import make_candidate, make_job
+
+
+class ShortlistTests(TestCase):
+    def shortlist(self, job, *entries):
+        return self.client.post(
+            f'/api/jobs/{job.pk}/shortlist/', {'candidates': list(entries)}, content_type='application/json'
+        )
+
+    def test_upsert_retries_when_a_concurrent_request_inserts_the_candidate(self):
+        job = make_job()
+        make_candidate('ann@example.com', skills=['Python'])
+        in_bulk = Candidate.objects.none().in_bulk
+        calls = []
+
+        def racing_in_bulk(queryset, *args, **kwargs):
+            # The first lookup misses the row, as if it was inserted just after
+            calls.append(queryset.model)
+            if calls.count(Candidate) == 1 and queryset.model is Candidate:
+                return {}
+            return in_bulk.__func__(queryset, *args, **kwargs)
+
+        with mock.patch('django.db.models.QuerySet.in_bulk', racing_in_bulk):
+            response = self.shortlist(job, {'name': 'Ann', 'email': 'ann@example.com', 'skills': ['Go']})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['updated_candidates'], 1)
+        self.assertEqual(Candidate.objects.get().skills, ['Python', 'Go'])
+
+    def test_existing_candidate_only_gets_blank_fields_filled(self):
+        job = make_job()
+        make_candidate('ann@example.com', name='Ann Smith', phone='', resume_url='/resumes/ann.pdf')
+
+        response = self.shortlist(job, {
+            'name': 'ann smith cv', 'email': 'ann@example.com', 'phone': '+44 20 7946 0000',
+            'resume_url': '/resumes/other.pdf', 'skills': ['Go'],
+        })
+
+        self.assertEqual(response.status_code, 201)
+        candidate = Candidate.objects.get()
+        self.assertEqual(candidate.name, 'Ann Smith')
+        self.assertEqual(candidate.resume_url, '/resumes/ann.pdf')
+        self.assertEqual(candidate.phone, '+44 20 7946 0000')
+        self.assertEqual(candidate.skills, ['Go'])
+
+    def test_placeholder_phone_is_never_stored(self):
+        job = make_job()
+        make_candidate('ann@example.com')
+        cv_match = CVMatch.objects.create(job=job, file_name='bob.pdf', phone='+1 415 555 0100')
+
+        response = self.shortlist(
+            job,
+            {'name': 'Ann', 'email': 'ann@example.com', 'phone': PLACEHOLDER_PHONE},
+            {'name': 'Bob', 'email': 'bob@example.com', 'phone': PLACEHOLDER_PHONE, 'cv_match': cv_match.pk},
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Candidate.objects.get(email='ann@example.com').phone, '')
+        # Falls back to the number found in the CV
+        self.assertEqual(Candidate.objects.get(email='bob@example.com').phone, '+1 415 555 0100')
@@ -0,0 +1,51 @@
+from django.test import TestCase
+
+from ..models import Job
+from ..skills import PROFILE_VERSION, job_profile, names, parse_requirements
+from .helpers import make_job
+
+
+class SkillParserTests(TestCase):
+    def parse(self, text):
+        profile = parse_requirements(text)
+        return names(profile['must_have']), names(profile['nice_to_have'])
+
+    def test_ambiguous_words_in_prose_are_not_skills(self):
+        self.assertEqual(self.parse('Able to go the extra mile and express ideas clearly. Get some rest.'), ([], []))
+
+    def test_ambiguous_words_in_skill_context(self):
+        self.assertEqual(
+            self.parse('Experience with Go and Kubernetes. Docker is a plus.'), (['Go', 'Kubernetes'], ['Docker'])
+        )
+        self.assertEqual(self.parse('Python, REST and Go.'), (['Go', 'Python', 'REST'], []))
+        self.assertEqual(self.parse('- Go\n- Rust'), (['Go', 'Rust'], []))
+
+    def test_r_needs_an_explicit_alias(self):
+        self.assertEqual(self.parse('Strong R programming skills'), (['R'], []))
+        self.assertEqual(self.parse('Grade R or above'), ([], []))
+
+    def test_minimum_years_of_experience(self):
+        for text, years in [
+            ('3+ years of Python', 3),
+            ('2-4 yrs with Django; 5 years leading teams', 5),
+            ('Python and Django', None),
+        ]:
+            with self.subTest(text=text):
+                self.assertEqual(parse_requirements(text)['min_years'], years)
+
+
+class RequirementsProfileTests(TestCase):
+    def test_outdated_profile_is_reparsed(self):
+        job = make_job(requirements='5+ years of Python.')
+        Job.objects.filter(pk=job.pk).update(
+            requirements_profile={'version': PROFILE_VERSION - 1, 'must_have': [], 'nice_to_have': []}
+        )
+        job.refresh_from_db()
+        self.assertEqual(job_profile(job).min_years, 5)
+        self.assertEqual(names(job_profile(job).must_have), ['Python'])
+
+    def test_api_exposes_min_years(self):
+        job = make_job(requirements='3+ years of Python. Docker is a plus.')
+        expected = {'must_have': ['Python'], 'nice_to_have': ['Docker'], 'min_years': 3}
+        self.assertEqual(self.client.get(f'/api/jobs/{job.pk}/').json()['requirements_profile'], expected)
+        self.assertEqual(self.client.get('/api/jobs/').json()[0]['requirements_profile'], expected)
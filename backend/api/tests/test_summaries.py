@@ -0,0 +1,64 @@
+from django.test import TestCase
+
+from ..models import Application, CVMatch
+from ..summaries import PLACEHOLDER_SUMMARIES, summarize, summarize_applications
+from .helpers import make_candidate, make_job
+
+
+class SummaryTests(TestCase):
+    def test_keeps_the_most_central_sentences_in_order(self):
+        text = (
+            'Python developer with Django experience building APIs. I like cats and dogs very much. '
+            'Built Django REST APIs in Python for payments. Python Django APIs scale well under load. '
+            'The weather today is sunny and warm outside.'
+        )
+        self.assertEqual(summarize(text, sentences=2), (
+            'Python developer with Django experience building APIs. '
+            'Built Django REST APIs in Python for payments.'
+        ))
+
+    def test_short_text_is_kept_whole(self):
+        text = 'Senior Python developer with Django.'
+        self.assertEqual(summarize(text, sentences=3), text)
+
+
+class SummarizeApplicationsTests(TestCase):
+    def setUp(self):
+        self.job = make_job()
+        self.text = (
+            'Python developer with Django experience building APIs. I like cats and dogs very much. '
+            'Built Django REST APIs in Python for payments. Python Django APIs scale well under load.'
+        )
+
+    def apply(self, email, ai_summary=''):
+        candidate = make_candidate(email)
+        CVMatch.objects.create(job=self.job, file_name=f'{email}.pdf', extracted_text=self.text, candidate=candidate)
+        return Application.objects.create(
+            candidate=candidate, job=self.job, job_title=self.job.title, ai_summary=ai_summary
+        )
+
+    def test_placeholder_summaries_are_replaced_and_hand_written_ones_kept(self):
+        blank = self.apply('ann@example.com')
+        placeholder = self.apply('bob@example.com', PLACEHOLDER_SUMMARIES[0])
+        hand_written = self.apply('cat@example.com', 'Met at the meetup, very sharp.')
+
+        counts = summarize_applications(workers=1)
+
+        self.assertEqual(counts['updated'], 2)
+        expected = summarize(self.text, sentences=3)
+        for application in (blank, placeholder):
+            application.refresh_from_db()
+            self.assertEqual(application.ai_summary, expected)
+            self.assertNotEqual(application.ai_summary_hash, '')
+        hand_written.refresh_from_db()
+        self.assertEqual(hand_written.ai_summary, 'Met at the meetup, very sharp.')
+
+        # Nothing changed, so nothing is rewritten
+        self.assertEqual(summarize_applications(workers=1)['unchanged'], 2)
+
+    def test_shortlist_drops_the_placeholder(self):
+        response = self.client.post(f'/api/jobs/{self.job.pk}/shortlist/', {'candidates': [
+            {'name': 'Ann', 'email': 'ann@example.com', 'ai_summary': PLACEHOLDER_SUMMARIES[0]},
+        ]}, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Application.objects.get().ai_summary, '')
@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Application
+from ..sync import make_token, parse_token
+from .helpers import make_candidate, make_job
+
+
+class SyncTests(TestCase):
+    def test_malformed_and_out_of_range_tokens_are_rejected(self):
+        for token in ['abc', '1.5', '9' * 30, '-' + '9' * 30]:
+            with self.subTest(token=token):
+                response = self.client.get('/api/changes/', {'since': token})
+                self.assertEqual(response.status_code, 400)
+
+    def test_token_round_trip(self):
+        moment = timezone.now()
+        self.assertEqual(parse_token(make_token(moment)), moment)
+
+    def test_changes_since_token(self):
+        job = make_job()
+        token = self.client.get('/api/changes/').json()['token']
+        job.title = 'Staff Engineer'
+        job.save()
+
+        delta = self.client.get('/api/changes/', {'since': token}).json()
+        self.assertEqual([row['id'] for row in delta['jobs']], [job.pk])
+        self.assertEqual(delta['jobs'][0]['title'], 'Staff Engineer')
+
+    def test_deletes_leave_tombstones(self):
+        job = make_job()
+        candidate = make_candidate('ann@example.com')
+        application = Application.objects.create(candidate=candidate, job=job, job_title=job.title)
+        deleted_pk = application.pk
+        token = self.client.get('/api/changes/').json()['token']
+        application.delete()
+
+        delta = self.client.get('/api/changes/', {'since': token}).json()
+        self.assertIn(deleted_pk, [int(pk) for pk in delta['deleted']['applications']])
+        self.assertEqual(delta['applications'], [])
+
+    def test_expired_token(self):
+        token = make_token(timezone.now() - timedelta(days=365))
+        response = self.client.get('/api/changes/', {'since': token})
+        self.assertEqual(response.status_code, 410)
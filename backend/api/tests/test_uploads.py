@@ -0,0 +1,70 @@
+import hashlib
+import random
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from ..benchmarks.fixtures import cv_text, make_pdf
+from ..models import CVMatch
+from ..uploads import UploadError, parse_content_range
+from .helpers import make_job
+
+
+class ContentRangeTests(TestCase):
+    def test_whole_file_without_header(self):
+        self.assertEqual(parse_content_range(None, 10), (0, 10))
+
+    def test_chunk(self):
+        self.assertEqual(parse_content_range('bytes 10-19/30', 10), (10, 30))
+
+    def test_invalid(self):
+        for header, length in [('bytes 0-9', 10), ('items 0-9/10', 10), ('bytes 0-9/20', 5), ('bytes 0-9/9', 10)]:
+            with self.subTest(header=header):
+                with self.assertRaises(UploadError):
+                    parse_content_range(header, length)
+
+
+class ResumableUploadTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        uploads = override_settings(UPLOADS={'DIRECTORY': directory})
+        uploads.enable()
+        self.addCleanup(uploads.disable)
+        self.job = make_job()
+        self.pdf = make_pdf(cv_text(random.Random(1)))
+        self.base = f'/api/jobs/{self.job.pk}/uploads/'
+
+    def put(self, upload_id, start, end, **headers):
+        return self.client.put(
+            f'{self.base}{upload_id}/files/cv.pdf/', self.pdf[start:end], content_type='application/pdf',
+            headers={'Content-Range': f'bytes {start}-{end - 1}/{len(self.pdf)}', **headers},
+        )
+
+    def test_resume_after_dropped_connection(self):
+        upload_id = self.client.post(self.base).json()['id']
+        half = len(self.pdf) // 2
+        self.assertEqual(self.put(upload_id, 0, half).status_code, 200)
+
+        # The client reads the offset back and resumes from it
+        state = self.client.get(f'{self.base}{upload_id}/').json()
+        self.assertEqual(state['files'][0]['received'], half)
+        self.assertEqual(self.put(upload_id, half + 10, len(self.pdf)).status_code, 409)
+        # A retry of bytes that already arrived is acknowledged
+        self.assertEqual(self.put(upload_id, 0, half).status_code, 200)
+        response = self.put(upload_id, half, len(self.pdf), **{'X-File-SHA256': hashlib.sha256(self.pdf).hexdigest()})
+        self.assertEqual(response.json()['status'], 'processed')
+
+        result = self.client.post(f'{self.base}{upload_id}/commit/').json()
+        self.assertEqual(result['total_processed'], 1)
+        self.assertEqual(CVMatch.objects.filter(job=self.job).count(), 1)
+        # Committing again returns the same results
+        self.assertEqual(self.client.post(f'{self.base}{upload_id}/commit/').json(), result)
+
+    def test_file_checksum_mismatch_restarts_the_file(self):
+        upload_id = self.client.post(self.base).json()['id']
+        response = self.put(upload_id, 0, len(self.pdf), **{'X-File-SHA256': '0' * 64})
+        self.assertEqual(response.status_code, 422)
+        state = self.client.get(f'{self.base}{upload_id}/').json()
+        self.assertEqual(state['files'][0]['received'], 0)
@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from .. import scoring
+from ..models import TfidfVocabulary
+from ..warmup import warm_up, warm_up_before_fork
+from .helpers import make_job
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+class WarmUpTests(TestCase):
+    def setUp(self):
+        scoring._cache.clear()
+
+    def test_steps_are_timed(self):
+        self.assertEqual(list(warm_up()), ['imports', 'pdf', 'skills'])
+
+    @mock.patch('api.warmup.connections')
+    def test_database_warm_up_never_builds_a_vocabulary(self, connections):
+        make_job()
+        self.assertIn('vocabulary', warm_up(database=True))
+        self.assertFalse(TfidfVocabulary.objects.exists())
+        # Connections are closed so forked workers do not share them
+        connections.close_all.assert_called_once_with()
+
+    @mock.patch('api.warmup.connections')
+    def test_database_warm_up_loads_the_vocabulary(self, connections):
+        make_job()
+        scoring.build_vocabulary()
+        warm_up(database=True)
+        self.assertIn('vocabulary', scoring._cache)
+        self.assertIn('job_matrix', scoring._cache)
+
+
+@mock.patch('api.warmup.gc')
+class WarmUpBeforeForkTests(TestCase):
+    @override_settings(WARMUP={'ENABLED': False})
+    def test_disabled(self, gc):
+        with mock.patch('api.warmup.warm_up') as warm:
+            self.assertIsNone(warm_up_before_fork())
+        warm.assert_not_called()
+        gc.freeze.assert_not_called()
+
+    @override_settings(WARMUP={'ENABLED': True, 'DATABASE': False})
+    def test_enabled(self, gc):
+        with mock.patch('api.warmup.warm_up', return_value={'imports': 1.0}) as warm:
+            with self.assertLogs('api.warmup') as logs:
+                self.assertEqual(warm_up_before_fork(), {'imports': 1.0})
+        warm.assert_called_once_with(database=False)
+        gc.freeze.assert_called_once_with()
+        self.assertIn('Warm-up took 1.0ms (imports 1.0ms)', logs.output[0])
+
+    def test_enabled_by_environment(self, gc):
+        def enabled(value):
+            env = {**os.environ, 'DJANGO_WARMUP': value}
+            result = subprocess.run(
+                [sys.executable, '-c', 'from talent_flow import settings; print(settings.WARMUP["ENABLED"])'],
+                cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+            )
+            return result.stdout.strip()
+
+        self.assertEqual(enabled('1'), 'True')
+        self.assertEqual(enabled(''), 'False')
@@ -0,0 +1,224 @@
+"""
+Resumable CV uploads.
+
+Instead of one multipart POST to ``process_cvs``, a client creates an
+``UploadSession`` for a job, PUTs every file in one or more chunks and then
+commits. Chunks are written into a part file under ``UPLOADS['DIRECTORY']``
+and the ``UploadFile`` row records how many bytes have arrived, so after a
+dropped connection the client reads the session back and resumes each file
+from its ``received`` offset instead of starting the batch over.
+
+A file is parsed, scored and stored as a ``CVMatch`` by the request that
+completes it; the commit processes whatever is still pending (e.g. files
+that were turned away by the CV scheduler) and returns every result.
+
+Retries are safe. Bytes that were already received are acknowledged
+without being written again, and a file's ``CVMatch`` is created in the
+same transaction that marks the file processed, so a retried request finds
+both or neither; a concurrent retry loses on the ``(job, file_name)``
+unique constraint and returns the stored result.
+"""
+import hashlib
+import os
+import re
+import shutil
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import UploadSession, UploadFile
+
+DEFAULTS = {
+    'DIRECTORY': None,  # Part files; defaults to BASE_DIR / 'uploads'
+    'MAX_FILES': 100,
+    'MAX_FILE_SIZE': 10 * 1024 * 1024,
+    'EXPIRE_HOURS': 24,  # Sessions older than this are removed by clean_uploads
+}
+
+CONTENT_RANGE = re.compile(r'bytes (\d+)-(\d+)/(\d+)')
+
+
+class UploadError(Exception):
+    """A request was refused; ``status`` is the HTTP status to answer with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def config():
+    return {**DEFAULTS, **getattr(settings, 'UPLOADS', {})}
+
+
+def directory():
+    return Path(config()['DIRECTORY'] or Path(settings.BASE_DIR) / 'uploads')
+
+
+def part_path(upload_file):
+    return directory() / upload_file.session_id / f'{upload_file.pk}.part'
+
+
+def create_session(job):
+    return UploadSession.objects.create(id=f'upload-{uuid.uuid4().hex}', job=job)
+
+
+def parse_content_range(header, length):
+    """
+    Return ``(start, total)`` for a chunk of ``length`` bytes from its
+    ``Content-Range: bytes START-END/TOTAL`` header. Without the header the
+    chunk is the whole file.
+    """
+    if not header:
+        return 0, length
+    match = CONTENT_RANGE.fullmatch(header.strip())
+    if not match:
+        raise UploadError('Content-Range must look like "bytes START-END/TOTAL"')
+    start, end, total = (int(value) for value in match.groups())
+    if end - start + 1 != length or end >= total:
+        raise UploadError(f'Content-Range {header} does not match a {length} byte chunk')
+    return start, total
+
+
+def get_file(session, name, size, sha256=''):
+    """The session's ``UploadFile`` called ``name``, declared on first use."""
+    options = config()
+    if size <= 0:
+        raise UploadError(f'{name} is empty')
+    if size > options['MAX_FILE_SIZE']:
+        raise UploadError(f'{name} is larger than {options["MAX_FILE_SIZE"]} bytes', 413)
+
+    upload_file = session.files.filter(name=name).first()
+    if upload_file is None:
+        if session.committed_at:
+            raise UploadError('This upload is already committed', 409)
+        count = session.files.count()
+        if count >= options['MAX_FILES']:
+            raise UploadError(f'Maximum {options["MAX_FILES"]} CV files per upload')
+        try:
+            with transaction.atomic():
+                upload_file = UploadFile.objects.create(
+                    session=session, name=name, size=size, sha256=sha256.lower(), position=count
+                )
+        except IntegrityError:
+            # Declared by a concurrent retry of the same chunk
+            upload_file = session.files.get(name=name)
+    if upload_file.size != size:
+        raise UploadError(f'{name} was declared with {upload_file.size} bytes, not {size}', 409)
+    if sha256 and upload_file.received == 0 and sha256.lower() != upload_file.sha256:
+        # Starting over, e.g. after a checksum mismatch
+        upload_file.sha256 = sha256.lower()
+        upload_file.save(update_fields=['sha256'])
+    return upload_file
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_chunk(upload_file, start, data, chunk_sha256=''):
+    """
+    Write the chunk ``data`` at offset ``start`` and return the updated file.
+
+    Chunks starting at or before the received offset are accepted, since a
+    retry may resend bytes that already arrived; a chunk that would leave a
+    gap is refused with a 409. Once every byte is in, the whole file is
+    checked against its declared checksum and marked complete.
+    """
+    if upload_file.status != 'uploading':
+        # Retry of a chunk of a file that is already complete
+        return upload_file
+    if chunk_sha256 and hashlib.sha256(data).hexdigest() != chunk_sha256.lower():
+        raise UploadError('Chunk checksum mismatch, send it again')
+    if start > upload_file.received:
+        raise UploadError(f'{upload_file.name}: expected offset {upload_file.received}, got {start}', 409)
+
+    end = start + len(data)
+    if end > upload_file.received:
+        path = part_path(upload_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o600), 'r+b') as f:
+            f.seek(start)
+            f.write(data)
+        # Only ever moves forward, however retries interleave
+        if UploadFile.objects.filter(pk=upload_file.pk, received__lt=end).update(received=end):
+            upload_file.received = end
+        else:
+            upload_file.refresh_from_db()
+
+    if upload_file.received >= upload_file.size and upload_file.status == 'uploading':
+        if upload_file.sha256 and _sha256(part_path(upload_file)) != upload_file.sha256:
+            UploadFile.objects.filter(pk=upload_file.pk).update(received=0)
+            part_path(upload_file).unlink(missing_ok=True)
+            upload_file.received = 0
+            raise UploadError(f'{upload_file.name}: file checksum mismatch, upload it again from offset 0', 422)
+        if UploadFile.objects.filter(pk=upload_file.pk, status='uploading').update(status='complete'):
+            upload_file.status = 'complete'
+        else:
+            upload_file.refresh_from_db()
+    return upload_file
+
+
+def process_file(upload_file, process_cv):
+    """
+    Process a complete file, updating ``upload_file``, and return its
+    result entry.
+
+    ``process_cv(cv_file, on_saved)`` parses and scores the file and calls
+    ``on_saved(cv_match, result)`` inside the transaction that creates the
+    ``CVMatch``. Processed and failed files return their stored result.
+    """
+    if upload_file.status in ('processed', 'failed'):
+        return upload_file.result
+
+    def on_saved(cv_match, result):
+        UploadFile.objects.filter(pk=upload_file.pk).update(status='processed', cv_match=cv_match, result=result)
+        upload_file.status, upload_file.cv_match, upload_file.result = 'processed', cv_match, result
+
+    with open(part_path(upload_file), 'rb') as f:
+        result = process_cv(File(f, name=upload_file.name), on_saved)
+    if 'error' in result:
+        # Either the file cannot be processed, or a concurrent retry stored
+        # it first and this attempt hit the unique constraint
+        if UploadFile.objects.filter(pk=upload_file.pk, status='complete').update(status='failed', result=result):
+            upload_file.status, upload_file.result = 'failed', result
+        else:
+            upload_file.refresh_from_db()
+    return upload_file.result
+
+
+def pending_files(session):
+    """Files that are complete but not processed yet, raising if any are still uploading."""
+    files = list(session.files.all())
+    if not files:
+        raise UploadError('No CV files uploaded')
+    incomplete = [f'{f.name} ({f.received}/{f.size})' for f in files if f.status == 'uploading']
+    if incomplete:
+        raise UploadError(f'Files not fully uploaded: {", ".join(incomplete)}', 409)
+    return [f for f in files if f.status == 'complete']
+
+
+def finish(session):
+    """Mark the session committed, drop its part files and return every result."""
+    UploadSession.objects.filter(pk=session.pk, committed_at__isnull=True).update(committed_at=timezone.now())
+    session.refresh_from_db()
+    shutil.rmtree(directory() / session.pk, ignore_errors=True)
+    return [upload_file.result for upload_file in session.files.all()]
+
+
+def expired_sessions(hours=None):
+    hours = config()['EXPIRE_HOURS'] if hours is None else hours
+    return UploadSession.objects.filter(created_at__lt=timezone.now() - timedelta(hours=hours))
+
+
+def delete_session(session):
+    shutil.rmtree(directory() / session.pk, ignore_errors=True)
+    session.delete()
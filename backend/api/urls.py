@@ -1,12 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import JobViewSet, ApplicationViewSet, CandidateViewSet, CVMatchViewSet
+from .views import JobViewSet, ApplicationViewSet, CandidateViewSet, CVMatchViewSet, ChangesViewSet
 
 router = DefaultRouter()
 router.register(r'jobs', JobViewSet)
 router.register(r'applications', ApplicationViewSet)
 router.register(r'candidates', CandidateViewSet)
 router.register(r'cv-matches', CVMatchViewSet)
+router.register(r'changes', ChangesViewSet, basename='changes')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,24 +1,64 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.utils import timezone
+from django.db import IntegrityError, transaction
+from django.http import Http404
+from django.shortcuts import get_object_or_404
 from django.core.mail import send_mail
 from django.conf import settings
-from .models import Job, Application, Candidate, CVMatch
+from .models import Job, Application, Candidate, CVMatch, UploadSession
+from .archive import ArchiveError, archive_model, restore_job
+from .dedup import MergeError, find_duplicates, merge_candidates
+from .profiling import record_stage, stage
+from .exports import EXPORT_FORMATS, export_response
+from .pdf import PDFExtractionError, extract_text
+from .pipeline import read_cv
+from .routers import read_from_replicas
+from .scheduler import QueueFull, get_scheduler, process_in_chunks
+from .summaries import PLACEHOLDER_SUMMARIES
+from .sync import SYNCED, TokenExpired, changes
+from .uploads import (
+    UploadError, create_session, get_file, parse_content_range, write_chunk, process_file, pending_files, finish,
+)
+from .scoring import get_vocabulary, tfidf_scores_from_counts, word_counts, rank_jobs
+from .skills import job_profile, match_skills, skill_ids, skill_ids_for_names, names
+from .metrics import PDF_PAGES_PER_SECOND, SKILLS_PER_CV, MATCH_SCORE, EMAIL_SEND_LATENCY, PDF_PARSE_FAILURES
 from .serializers import (
     JobSerializer, JobCreateSerializer,
     ApplicationSerializer, ApplicationCreateSerializer, ApplicationUpdateSerializer,
-    CandidateSerializer, CVMatchSerializer
+    CandidateSerializer, CVMatchSerializer, ShortlistSerializer, UploadSessionSerializer, UploadFileSerializer,
+    JobValuesSerializer, ApplicationValuesSerializer, CandidateValuesSerializer, CVMatchValuesSerializer
 )
 import json
-import re
-from PyPDF2 import PdfReader
-import io
+import time
+
+# Tries of a shortlist whose candidate inserts race with another request's
+SHORTLIST_ATTEMPTS = 3
+
+# Dummy number older SPA builds send for every shortlisted candidate
+PLACEHOLDER_PHONE = '+1 (555) 000-0000'
 
-class JobViewSet(viewsets.ModelViewSet):
+class ValuesListMixin:
+    """
+    Serve unpaginated list responses from ``.values()`` rows through
+    ``values_serializer_class`` instead of the (much slower) ModelSerializer.
+    """
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(self.values_serializer_class(queryset).data)
+
+class JobViewSet(ValuesListMixin, viewsets.ModelViewSet):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
+    values_serializer_class = JobValuesSerializer
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -29,79 +69,287 @@ class JobViewSet(viewsets.ModelViewSet):
         import uuid
         job = serializer.save(id=f"job-{uuid.uuid4().hex[:8]}")
 
+    def update(self, request, *args, **kwargs):
+        # The job is only reopened if its rows could be restored
+        try:
+            with transaction.atomic():
+                return super().update(request, *args, **kwargs)
+        except ArchiveError as e:
+            return self._restore_failed(e)
+
+    def perform_update(self, serializer):
+        job = serializer.save()
+        self._restore_if_reopened(job)
+
+    def _restore_if_reopened(self, job):
+        """
+        Bring an archived job's rows back to the live tables when it reopens.
+        Raises ``ArchiveError``; call it in the transaction that saved the
+        status so a failed restore leaves the job closed.
+        """
+        if job.status == 'Open' and job.archived_at is not None:
+            restore_job(job)
+
+    def _restore_failed(self, error):
+        return Response(
+            {'error': f'Could not reopen job, its archived rows were not restored: {error}'},
+            status=status.HTTP_409_CONFLICT
+        )
+
     @action(detail=True, methods=['patch'])
     def toggle_status(self, request, pk=None):
         job = self.get_object()
         job.status = 'Closed' if job.status == 'Open' else 'Open'
-        job.save()
+        try:
+            with transaction.atomic():
+                job.save()
+                self._restore_if_reopened(job)
+        except ArchiveError as e:
+            return self._restore_failed(e)
         serializer = self.get_serializer(job)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['post'])
+    def shortlist(self, request, pk=None):
+        """
+        Move candidates into this job's pipeline in one request.
+
+        Candidates are upserted by email and an application is created for
+        each one that does not already have one for this job. When an entry
+        references a ``cv_match``, the application takes its match score and
+        status from it, and the candidate's skills and resume default to it.
+        """
+        job = self.get_object()
+        serializer = ShortlistSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        app_status = serializer.validated_data['status']
+
+        # Last entry wins when the same email is submitted twice
+        entries = {entry['email']: entry for entry in serializer.validated_data['candidates']}
+
+        cv_match_ids = {entry['cv_match'] for entry in entries.values() if 'cv_match' in entry}
+        cv_matches = CVMatch.objects.filter(job=job).in_bulk(cv_match_ids)
+        missing = cv_match_ids - cv_matches.keys()
+        if missing:
+            return Response(
+                {'error': f'CV matches not found for this job: {sorted(missing)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # A concurrent shortlist may create one of the same candidates first,
+        # failing the insert; the retry finds it and updates it instead
+        for attempt in range(SHORTLIST_ATTEMPTS):
+            try:
+                new_candidates, updated_candidates, new_applications, applications = self._shortlist(
+                    job, entries, cv_matches, app_status
+                )
+                break
+            except IntegrityError:
+                if attempt == SHORTLIST_ATTEMPTS - 1:
+                    raise
+
+        return Response({
+            'created_candidates': len(new_candidates),
+            'updated_candidates': len(updated_candidates),
+            'created_applications': len(new_applications),
+            'existing_applications': len(entries) - len(new_applications),
+            'applications': ApplicationSerializer(applications.values(), many=True).data,
+        }, status=status.HTTP_201_CREATED if new_applications else status.HTTP_200_OK)
+
+    def _shortlist(self, job, entries, cv_matches, app_status):
+        """
+        Upsert the shortlisted candidates and create their applications in
+        one transaction. Returns the new and updated candidates, the new
+        applications and every application by candidate id.
+        """
+        with transaction.atomic():
+            candidates = Candidate.objects.in_bulk(entries.keys(), field_name='email')
+            new_candidates, updated_candidates = [], []
+
+            for email, entry in entries.items():
+                cv_match = cv_matches.get(entry.get('cv_match'))
+                skills = entry.get('skills') or (cv_match.extracted_skills if cv_match else [])
+                resume_url = entry.get('resume_url') or (f'/resumes/{cv_match.file_name}' if cv_match else '')
+                phone = entry.get('phone', '')
+                if phone == PLACEHOLDER_PHONE:
+                    phone = ''
+                phone = phone or (cv_match.phone if cv_match else '')
+                candidate = candidates.get(email)
+
+                if candidate is None:
+                    candidates[email] = Candidate(
+                        name=entry['name'],
+                        email=email,
+                        phone=phone,
+                        skills=skills,
+                        resume_url=resume_url,
+                    )
+                    new_candidates.append(candidates[email])
+                    continue
+
+                # Existing candidate: only fill in blank details, as merge_candidates does
+                changed = False
+                for field, value in [('name', entry['name']), ('phone', phone), ('resume_url', resume_url)]:
+                    if value and not getattr(candidate, field):
+                        setattr(candidate, field, value)
+                        changed = True
+                new_skills = [s for s in skills if s not in candidate.skills]
+                if new_skills:
+                    candidate.skills = candidate.skills + new_skills
+                    changed = True
+                if changed:
+                    # bulk_update does not apply auto_now
+                    candidate.updated_at = timezone.now()
+                    updated_candidates.append(candidate)
+
+            Candidate.objects.bulk_create(new_candidates)
+            if updated_candidates:
+                Candidate.objects.bulk_update(
+                    updated_candidates, ['name', 'phone', 'resume_url', 'skills', 'updated_at']
+                )
+
+            applications = {
+                app.candidate_id: app
+                for app in Application.objects.filter(
+                    job=job, candidate__in=[c.id for c in candidates.values()]
+                ).select_related('candidate')
+            }
+            new_applications = []
+            for email, entry in entries.items():
+                candidate = candidates[email]
+                if candidate.id in applications:
+                    continue
+                cv_match = cv_matches.get(entry.get('cv_match'))
+                summary = entry.get('ai_summary', '')
+                application = Application(
+                    candidate=candidate,
+                    job=job,
+                    job_title=job.title,
+                    status=app_status,
+                    notes=entry.get('notes', ''),
+                    ai_summary='' if summary in PLACEHOLDER_SUMMARIES else summary,
+                    match_score=cv_match.match_score if cv_match else 0,
+                    match_status=cv_match.match_status if cv_match else 'not_matched',
+                )
+                applications[candidate.id] = application
+                new_applications.append(application)
+            Application.objects.bulk_create(new_applications)
+
+            # Remember whose CV each match is, for duplicate detection
+            linked = []
+            for email, entry in entries.items():
+                cv_match = cv_matches.get(entry.get('cv_match'))
+                if cv_match is not None and cv_match.candidate_id != candidates[email].id:
+                    cv_match.candidate = candidates[email]
+                    cv_match.updated_at = timezone.now()
+                    linked.append(cv_match)
+            CVMatch.objects.bulk_update(linked, ['candidate', 'updated_at'])
+        return new_candidates, updated_candidates, new_applications, applications
+
+    @action(detail=False, methods=['post'])
+    def match_cv(self, request):
+        """
+        Rank open jobs for one CV.
+
+        The CV is an uploaded PDF (``cv``), an existing CV match
+        (``cv_match``) or a candidate (``candidate``, scored on their
+        skills). Returns up to ``limit`` jobs (default 10) by TF-IDF score.
+        """
+        ids = {}
+        for field in ('cv_match', 'candidate'):
+            value = request.data.get(field)
+            if value is None or value == '':
+                ids[field] = None
+                continue
+            try:
+                ids[field] = int(value)
+            except (TypeError, ValueError):
+                return Response({'error': f'{field} must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        cv_match_id, candidate_id = ids['cv_match'], ids['candidate']
+
+        if 'cv' in request.FILES:
+            try:
+                with stage('pdf'):
+                    text = self._extract_text_from_pdf(request.FILES['cv'])
+            except PDFExtractionError as e:
+                return Response({'error': f'Could not read CV: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+        elif cv_match_id is not None:
+            cv_match = CVMatch.objects.filter(pk=cv_match_id).first()
+            if cv_match is None:
+                return Response({'error': 'CV match not found'}, status=status.HTTP_404_NOT_FOUND)
+            text = cv_match.extracted_text
+        elif candidate_id is not None:
+            candidate = Candidate.objects.filter(pk=candidate_id).first()
+            if candidate is None:
+                return Response({'error': 'Candidate not found'}, status=status.HTTP_404_NOT_FOUND)
+            text = ' '.join(candidate.skills)
+        else:
+            return Response(
+                {'error': 'Provide a cv file, cv_match or candidate'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = max(1, min(int(request.data.get('limit', 10)), 100))
+        except (TypeError, ValueError):
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        with stage('scoring'):
+            ranked = rank_jobs(text, limit)
+        jobs = Job.objects.in_bulk([job_id for job_id, _ in ranked])
+        return Response({
+            'matches': [
+                {'job': JobSerializer(jobs[job_id]).data, 'match_score': score}
+                for job_id, score in ranked if job_id in jobs
+            ]
+        })
+
     def _extract_text_from_pdf(self, pdf_file):
-        """Extract text content from PDF file."""
+        """
+        Extract text content from PDF file with the configured backends.
+
+        Raises ``PDFExtractionError`` when no backend can read it.
+        """
         try:
-            pdf_reader = PdfReader(io.BytesIO(pdf_file.read()))
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
-        except Exception as e:
+            start = time.perf_counter()
+            extraction = extract_text(pdf_file.read())
+        except PDFExtractionError as e:
+            PDF_PARSE_FAILURES.inc()
             print(f"Error extracting text from PDF: {e}")
-            return ""
+            raise
+        elapsed = time.perf_counter() - start
+        if elapsed > 0:
+            PDF_PAGES_PER_SECOND.observe(extraction.pages / elapsed)
+        return extraction.text
 
     def _extract_skills_from_text(self, text):
-        """Extract skills from text using regex patterns."""
-        # Common tech skills and keywords
-        skill_patterns = [
-            r'\b(React|Angular|Vue|JavaScript|TypeScript|Node\.js|Express|Django|Flask|Spring|Laravel)\b',
-            r'\b(Python|Java|C\+\+|C#|Go|Rust|PHP|Ruby|Swift|Kotlin)\b',
-            r'\b(HTML|CSS|SCSS|SASS|Bootstrap|Tailwind|Material-UI)\b',
-            r'\b(SQL|MySQL|PostgreSQL|MongoDB|Redis|Elasticsearch)\b',
-            r'\b(AWS|Azure|GCP|Docker|Kubernetes|Jenkins|Git|GitHub|GitLab)\b',
-            r'\b(Figma|Sketch|Adobe XD|InVision|Zeplin|Prototyping)\b',
-            r'\b(UI/UX|User Experience|User Interface|Design Systems)\b',
-            r'\b(Machine Learning|AI|Data Science|TensorFlow|PyTorch|NLP)\b',
-            r'\b(Agile|Scrum|Kanban|JIRA|Confluence|Trello)\b',
-            r'\b(REST|GraphQL|API|Microservices|Serverless)\b'
-        ]
-
-        found_skills = set()
-        text_lower = text.lower()
-
-        for pattern in skill_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            found_skills.update(matches)
-
-        # Clean up skills (remove duplicates and normalize)
-        cleaned_skills = []
-        for skill in found_skills:
-            # Normalize common variations
-            if skill.lower() in ['react', 'angular', 'vue']:
-                cleaned_skills.append(skill.title())
-            elif skill.lower() in ['nodejs', 'node.js']:
-                cleaned_skills.append('Node.js')
-            elif skill.lower() in ['ui/ux', 'user experience', 'user interface']:
-                cleaned_skills.append('UI/UX')
-            else:
-                cleaned_skills.append(skill)
+        """Extract canonical skill names from text using the skill taxonomy."""
+        return names(skill_ids(text))
 
-        return list(set(cleaned_skills))  # Remove duplicates
+    def _read_cv(self, cv_file):
+        """
+        Read an uploaded CV PDF a page at a time into a ``pipeline.CVText``.
 
-    def _calculate_match_score(self, cv_skills, job_requirements):
-        """Calculate match score between CV skills and job requirements."""
-        if not cv_skills:
-            return 0
-
-        requirements_lower = job_requirements.lower()
-        matching_skills = []
+        Raises ``PDFExtractionError`` when no backend can read it.
+        """
+        try:
+            cv = read_cv(cv_file)
+        except PDFExtractionError as e:
+            PDF_PARSE_FAILURES.inc()
+            print(f"Error extracting text from PDF: {e}")
+            raise
+        if cv.elapsed > 0:
+            PDF_PAGES_PER_SECOND.observe(cv.pages / cv.elapsed)
+        return cv
 
-        for skill in cv_skills:
-            if skill.lower() in requirements_lower:
-                matching_skills.append(skill)
+    def _calculate_match_score(self, cv_skills, profile):
+        """
+        Match CV skills against a job's requirement profile.
 
-        # Calculate percentage based on matching skills
-        match_percentage = (len(matching_skills) / len(cv_skills)) * 100
-        return int(match_percentage)
+        Returns a ``skills.Match`` with the 0-100 score and the matched and
+        missing skill ids that explain it.
+        """
+        return match_skills(skill_ids_for_names(cv_skills), profile)
 
     @action(detail=True, methods=['post'])
     def process_cvs(self, request, pk=None):
@@ -115,88 +363,387 @@ class JobViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Maximum 100 CV files allowed'}, status=status.HTTP_400_BAD_REQUEST)
 
         processed_cvs = []
+        vocabulary = get_vocabulary() if job.scoring_engine == 'tfidf' else None
+        profile = job_profile(job)
+
+        # Large uploads are processed a chunk at a time, taking turns with
+        # other uploads so they cannot starve the rest of the API
+        key = (request.user.pk or request.META.get('REMOTE_ADDR'), job.pk)
+
+        def process(cv_file):
+            processed_cvs.append(self._process_cv(len(processed_cvs), cv_file, job, profile, vocabulary))
+
+        try:
+            process_in_chunks(uploaded_files, key, process, get_scheduler())
+        except QueueFull as e:
+            response = Response({'error': str(e)}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+            response['Retry-After'] = str(e.retry_after)
+            return response
+
+        # Filter CVs with match score >= 60 (but show all for transparency)
+        filtered_cvs = processed_cvs  # Show all processed CVs
+        filtered_cvs.sort(key=lambda x: x['matchScore'], reverse=True)
+
+        return Response({
+            'total_processed': len(processed_cvs),
+            'filtered_count': len([cv for cv in filtered_cvs if cv['matchScore'] >= 60]),
+            'filtered_cvs': filtered_cvs
+        })
+
+    # Resumable uploads (see api.uploads): create a session, PUT each file
+    # in chunks with Content-Range, then commit
 
-        for i, cv_file in enumerate(uploaded_files):
+    @action(detail=True, methods=['post'])
+    def uploads(self, request, pk=None):
+        session = create_session(self.get_object())
+        return Response(UploadSessionSerializer(session).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['get'], url_path=r'uploads/(?P<upload_id>[^/.]+)')
+    def upload(self, request, pk=None, upload_id=None):
+        """Upload state, including the offset each file resumes from."""
+        return Response(UploadSessionSerializer(self._get_upload(pk, upload_id)).data)
+
+    @action(detail=True, methods=['put'], url_path=r'uploads/(?P<upload_id>[^/.]+)/files/(?P<name>[^/]+)')
+    def upload_file(self, request, pk=None, upload_id=None, name=None):
+        """
+        Write one chunk of file ``name``: the raw request body, placed by a
+        ``Content-Range: bytes START-END/TOTAL`` header (omit it to send the
+        whole file at once). ``X-Chunk-SHA256`` and ``X-File-SHA256`` carry
+        optional checksums of the chunk and of the whole file.
+
+        The request that completes a file processes it and returns its
+        result. A 409 means the offset does not match what the server has;
+        read the upload and resume from the file's ``received`` offset.
+        """
+        session = self._get_upload(pk, upload_id)
+        job = session.job
+        data = request.body
+        try:
+            start, total = parse_content_range(request.headers.get('Content-Range'), len(data))
+            upload_file = get_file(session, name, total, request.headers.get('X-File-SHA256', ''))
+            upload_file = write_chunk(upload_file, start, data, request.headers.get('X-Chunk-SHA256', ''))
+        except UploadError as e:
+            return Response({'error': str(e)}, status=e.status)
+
+        if upload_file.status == 'complete':
             try:
-                # Extract text from PDF
-                extracted_text = self._extract_text_from_pdf(cv_file)
-
-                # Extract skills from text
-                skills = self._extract_skills_from_text(extracted_text)
-
-                # If no skills found, use fallback mock skills for demo purposes
-                if not skills:
-                    mock_skill_sets = [
-                        ['React', 'TypeScript', 'Node.js', 'GraphQL', 'AWS', 'Docker'],
-                        ['Python', 'Django', 'PostgreSQL', 'REST APIs', 'Docker', 'AWS'],
-                        ['Figma', 'UI/UX', 'Prototyping', 'User Research', 'Design Systems'],
-                        ['JavaScript', 'Vue.js', 'CSS', 'HTML', 'Git', 'Webpack'],
-                        ['SQL', 'Python', 'Tableau', 'Power BI', 'Data Analysis', 'Statistics'],
-                        ['Java', 'Spring Boot', 'Microservices', 'Docker', 'Kubernetes'],
-                        ['Google Analytics', 'SEO', 'SEM', 'Content Marketing', 'HubSpot'],
-                        ['Sketch', 'InVision', 'Principle', 'Wireframing', 'Usability Testing']
-                    ]
-                    skills = mock_skill_sets[i % len(mock_skill_sets)]
-                    extracted_text = f'Extracted content from {cv_file.name}... This CV contains skills in {", ".join(skills[:3])}...'
-
-                # Calculate match score
-                match_score = self._calculate_match_score(skills, job.requirements)
-
-                # Create CV match record in database
+                self._process_upload_files(request, job, [upload_file])
+            except QueueFull as e:
+                # The file stays complete and the commit processes it
+                response = Response(UploadFileSerializer(upload_file).data, status=status.HTTP_202_ACCEPTED)
+                response['Retry-After'] = str(e.retry_after)
+                return response
+        return Response(UploadFileSerializer(upload_file).data)
+
+    @action(detail=True, methods=['post'], url_path=r'uploads/(?P<upload_id>[^/.]+)/commit')
+    def commit_upload(self, request, pk=None, upload_id=None):
+        """
+        Finish an upload once every file is complete, processing any file
+        that is not processed yet. Returns the same results as
+        ``process_cvs``; committing again returns them again.
+        """
+        session = self._get_upload(pk, upload_id)
+        job = session.job
+        try:
+            self._process_upload_files(request, job, pending_files(session))
+        except UploadError as e:
+            return Response({'error': str(e)}, status=e.status)
+        except QueueFull as e:
+            response = Response({'error': str(e)}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+            response['Retry-After'] = str(e.retry_after)
+            return response
+
+        processed_cvs = sorted(finish(session), key=lambda x: x['matchScore'], reverse=True)
+        return Response({
+            'total_processed': len(processed_cvs),
+            'filtered_count': len([cv for cv in processed_cvs if cv['matchScore'] >= 60]),
+            'filtered_cvs': processed_cvs
+        })
+
+    def _get_upload(self, pk, upload_id):
+        # One query for the session and its job; chunk PUTs are frequent
+        return get_object_or_404(UploadSession.objects.select_related('job'), pk=upload_id, job_id=pk)
+
+    def _process_upload_files(self, request, job, upload_files):
+        """Process complete upload files, taking turns with other uploads like ``process_cvs``."""
+        vocabulary = get_vocabulary() if job.scoring_engine == 'tfidf' else None
+        profile = job_profile(job)
+        key = (request.user.pk or request.META.get('REMOTE_ADDR'), job.pk)
+
+        def process(upload_file):
+            process_file(upload_file, lambda cv_file, on_saved: self._process_cv(
+                upload_file.position, cv_file, job, profile, vocabulary, on_saved
+            ))
+
+        process_in_chunks(upload_files, key, process, get_scheduler())
+
+    def _process_cv(self, i, cv_file, job, profile, vocabulary, on_saved=None):
+        """
+        Extract, score and store one uploaded CV, returning its result entry.
+
+        ``on_saved(cv_match, result)`` is called in the transaction that
+        creates the ``CVMatch``.
+        """
+        try:
+            # Read the PDF a page at a time, finding skills, contacts and
+            # word counts as each page arrives (see api.pipeline)
+            cv = self._read_cv(cv_file)
+            extracted_text = cv.text
+            duplicate_fields = cv.duplicates.fields()
+            words = cv.words
+            skills = names(cv.skill_ids)
+            SKILLS_PER_CV.observe(len(skills))
+
+            # If the CV text names no known skills, use fallback mock skills
+            # for demo purposes (unreadable PDFs raise above instead)
+            if not skills:
+                mock_skill_sets = [
+                    ['React', 'TypeScript', 'Node.js', 'GraphQL', 'AWS', 'Docker'],
+                    ['Python', 'Django', 'PostgreSQL', 'REST APIs', 'Docker', 'AWS'],
+                    ['Figma', 'UI/UX', 'Prototyping', 'User Research', 'Design Systems'],
+                    ['JavaScript', 'Vue.js', 'CSS', 'HTML', 'Git', 'Webpack'],
+                    ['SQL', 'Python', 'Tableau', 'Power BI', 'Data Analysis', 'Statistics'],
+                    ['Java', 'Spring Boot', 'Microservices', 'Docker', 'Kubernetes'],
+                    ['Google Analytics', 'SEO', 'SEM', 'Content Marketing', 'HubSpot'],
+                    ['Sketch', 'InVision', 'Principle', 'Wireframing', 'Usability Testing']
+                ]
+                skills = mock_skill_sets[i % len(mock_skill_sets)]
+                extracted_text = f'Extracted content from {cv_file.name}... This CV contains skills in {", ".join(skills[:3])}...'
+                words = word_counts(extracted_text)
+
+            # Calculate match score; counting the words was part of it
+            start = time.perf_counter()
+            match = self._calculate_match_score(skills, profile)
+            if job.scoring_engine == 'tfidf':
+                match_score = tfidf_scores_from_counts([words], job, vocabulary)[0]
+            else:
+                match_score = match.score
+            record_stage('scoring', cv.timings['scoring'] + time.perf_counter() - start)
+            MATCH_SCORE.observe(match_score)
+
+            # Create CV match record in database
+            with stage('persist'), transaction.atomic():
+                candidate = None
+                if duplicate_fields['email']:
+                    candidate = Candidate.objects.filter(email=duplicate_fields['email']).first()
                 cv_match = CVMatch.objects.create(
                     job=job,
                     file_name=cv_file.name,
                     extracted_skills=skills,
                     match_score=match_score,
                     match_status='matched' if match_score >= 80 else 'not_matched',
-                    extracted_text=extracted_text[:1000]  # Limit text length
+                    extracted_text=extracted_text[:1000],  # Limit text length
+                    candidate=candidate,
+                    **duplicate_fields
                 )
 
                 processed_cv = {
                     'id': cv_match.id,
                     'fileName': cv_file.name,
+                    'email': cv_match.email,
+                    'candidateName': cv_match.candidate_name,
                     'skills': skills,
                     'matchScore': match_score,
+                    'matchedSkills': names(match.matched | match.nice_matched),
+                    'missingSkills': names(match.missing),
                     'extractedText': extracted_text[:200] + '...' if len(extracted_text) > 200 else extracted_text,
                     'uploadedAt': cv_match.uploaded_at.isoformat()
                 }
-                processed_cvs.append(processed_cv)
-
-            except Exception as e:
-                print(f"Error processing CV {cv_file.name}: {e}")
-                # Return error for this specific CV but continue processing others
-                processed_cv = {
-                    'id': f'error-{i+1}',
-                    'fileName': cv_file.name,
-                    'skills': [],
-                    'matchScore': 0,
-                    'extractedText': f'Error processing {cv_file.name}: {str(e)}',
-                    'uploadedAt': timezone.now().isoformat(),
-                    'error': str(e)
-                }
-                processed_cvs.append(processed_cv)
-
-        # Filter CVs with match score >= 60 (but show all for transparency)
-        filtered_cvs = processed_cvs  # Show all processed CVs
-        filtered_cvs.sort(key=lambda x: x['matchScore'], reverse=True)
-
-        return Response({
-            'total_processed': len(processed_cvs),
-            'filtered_count': len([cv for cv in filtered_cvs if cv['matchScore'] >= 60]),
-            'filtered_cvs': filtered_cvs
-        })
-
-class CandidateViewSet(viewsets.ModelViewSet):
+                if on_saved is not None:
+                    on_saved(cv_match, processed_cv)
+        except Exception as e:
+            print(f"Error processing CV {cv_file.name}: {e}")
+            # Return error for this specific CV but continue processing others
+            processed_cv = {
+                'id': f'error-{i+1}',
+                'fileName': cv_file.name,
+                'skills': [],
+                'matchScore': 0,
+                'matchedSkills': [],
+                'missingSkills': [],
+                'extractedText': f'Error processing {cv_file.name}: {str(e)}',
+                'uploadedAt': timezone.now().isoformat(),
+                'error': str(e)
+            }
+        return processed_cv
+
+class CandidateViewSet(ValuesListMixin, viewsets.ModelViewSet):
     queryset = Candidate.objects.all()
     serializer_class = CandidateSerializer
+    values_serializer_class = CandidateValuesSerializer
+
+    @action(detail=False, methods=['get'])
+    def duplicates(self, request):
+        """
+        Clusters of candidates and CV matches that look like the same person
+        (see ``api.dedup``), largest first; ``limit`` caps how many are
+        returned (default 100).
+        """
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 100)), 1000))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        clusters = find_duplicates()
+        shown = clusters[:limit]
+        candidates = {
+            row['id']: row for row in CandidateValuesSerializer(
+                Candidate.objects.filter(pk__in=[pk for c in shown for pk in c['candidates']])
+            ).data
+        }
+        cv_matches = CVMatch.objects.in_bulk(
+            [pk for c in shown for pk in c['cv_matches']]
+        )
+        return Response({
+            'count': len(clusters),
+            'clusters': [
+                {
+                    'reasons': cluster['reasons'],
+                    'candidates': [candidates[pk] for pk in cluster['candidates']],
+                    'cv_matches': [
+                        {
+                            'id': pk,
+                            'job': cv_matches[pk].job_id,
+                            'file_name': cv_matches[pk].file_name,
+                            'email': cv_matches[pk].email,
+                            'phone': cv_matches[pk].phone,
+                            'candidate_name': cv_matches[pk].candidate_name,
+                            'candidate': cv_matches[pk].candidate_id,
+                        }
+                        for pk in cluster['cv_matches']
+                    ],
+                }
+                for cluster in shown
+            ],
+        })
 
-class CVMatchViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['post'])
+    def merge(self, request):
+        """
+        Merge ``candidates`` and ``cv_matches`` (lists of ids) into one
+        candidate: ``target`` if given, else the first candidate, else one
+        created from the CV matches' email. Returns the merged candidate.
+        """
+        try:
+            candidate_ids = [int(pk) for pk in request.data.get('candidates', [])]
+            cv_match_ids = [int(pk) for pk in request.data.get('cv_matches', [])]
+            target_id = int(request.data['target']) if request.data.get('target') is not None else None
+        except (TypeError, ValueError):
+            return Response({'error': 'Ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            candidate, counts = merge_candidates(candidate_ids, cv_match_ids, target_id)
+        except MergeError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({**counts, 'candidate': CandidateSerializer(candidate).data})
+
+class ChangesViewSet(viewsets.ViewSet):
+    """
+    Delta sync (see ``api.sync``): ``GET /api/changes/?since=<token>``
+    returns the rows changed and the ids deleted since ``token``, and the
+    token to pass next time. Without ``since`` every row is returned.
+    ``models=jobs,applications`` limits the response to those lists.
+    """
+
+    def list(self, request):
+        names = request.query_params.get('models')
+        names = names.split(',') if names else None
+        unknown = set(names or []) - SYNCED.keys()
+        if unknown:
+            return Response(
+                {'error': f'Unknown models: {", ".join(sorted(unknown))}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            # A lagging replica could hide rows older than the new token
+            with read_from_replicas(False):
+                data = changes(request.query_params.get('since'), names)
+        except TokenExpired as e:
+            return Response({'error': f'{e}; sync again without since'}, status=status.HTTP_410_GONE)
+        except ValueError:
+            return Response({'error': 'Invalid sync token'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
+
+class ExportMixin:
+    """
+    Adds a streaming ``export`` list action (``?output=csv|ndjson&job=<id>``).
+
+    Like ``ArchiveReadThroughMixin``, exports read through to the archive
+    tables: rows of archived jobs follow the live rows.
+    """
+    export_fields = []
+    export_filename = 'export'
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        output = request.query_params.get('output', 'csv')
+        if output not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"Unsupported output '{output}', expected one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        queryset = self.get_queryset().order_by('id')
+        archived = archive_model(self.queryset.model).objects.order_by('id')
+        job_id = request.query_params.get('job')
+        if job_id:
+            queryset = queryset.filter(job_id=job_id)
+            archived = archived.filter(job_id=job_id)
+        return export_response([queryset, archived], self.export_fields, output, self.export_filename)
+
+class ArchiveReadThroughMixin:
+    """
+    Read through to the archive tables (``api.archive``) for archived jobs.
+
+    ``?job=<id>`` filters the list to one job, including its archived rows,
+    and retrieving an archived row by id still works. Archived rows are
+    read only until their job is reopened.
+
+    The unfiltered list only has live rows, so it stays an index scan of
+    active hiring; when some jobs are archived it says so in an
+    ``X-Archived-Excluded`` header. Exports (``ExportMixin``) include them.
+    """
+
+    def list(self, request, *args, **kwargs):
+        job_id = request.query_params.get('job')
+        if not job_id:
+            response = super().list(request, *args, **kwargs)
+            if Job.objects.filter(archived_at__isnull=False).exists():
+                response['X-Archived-Excluded'] = 'true'
+            return response
+        job = get_object_or_404(Job, pk=job_id)
+        data = self.values_serializer_class(self.get_queryset().filter(job_id=job_id)).data
+        if job.archived_at is not None:
+            archived = archive_model(self.queryset.model).objects.filter(job_id=job_id)
+            data += self.values_serializer_class(archived).data
+        return Response(data)
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+            instance = get_object_or_404(archive_model(self.queryset.model), pk=lookup)
+            if self.request.method not in SAFE_METHODS:
+                raise PermissionDenied('This record is archived; reopen its job to change it.')
+            return instance
+
+class CVMatchViewSet(ArchiveReadThroughMixin, ExportMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = CVMatch.objects.all()
     serializer_class = CVMatchSerializer
-
-class ApplicationViewSet(viewsets.ModelViewSet):
+    values_serializer_class = CVMatchValuesSerializer
+    export_fields = [
+        'id', 'job_id', 'file_name', 'extracted_skills', 'match_score',
+        'match_status', 'uploaded_at',
+    ]
+    export_filename = 'cv-matches'
+
+class ApplicationViewSet(ArchiveReadThroughMixin, ExportMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
+    values_serializer_class = ApplicationValuesSerializer
+    export_fields = [
+        'id', 'job_id', 'job_title', 'candidate_id', 'candidate__name', 'candidate__email',
+        'status', 'applied_at', 'rating', 'match_score', 'match_status',
+    ]
+    export_filename = 'applications'
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -273,6 +820,7 @@ Talent Flow Hiring Team
             # No email needed for other status changes
             return
 
+        start = time.perf_counter()
         try:
             send_mail(
                 subject=subject,
@@ -281,7 +829,9 @@ Talent Flow Hiring Team
                 recipient_list=[candidate.email],
                 fail_silently=False,
             )
+            EMAIL_SEND_LATENCY.labels(outcome='sent').observe(time.perf_counter() - start)
         except Exception as e:
+            EMAIL_SEND_LATENCY.labels(outcome='failed').observe(time.perf_counter() - start)
             # Log the error but don't fail the status update
             print(f"Failed to send email to {candidate.email}: {e}")
 
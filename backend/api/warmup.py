@@ -0,0 +1,99 @@
+"""
+Pre-fork warm-up.
+
+Workers otherwise pay for importing the URLconf (and with it numpy and the
+views), loading the PDF backends, compiling the skill matcher and loading
+the TF-IDF vocabulary on their first request. Doing that once in the master process
+before the server forks (gunicorn ``--preload``) lets every worker start
+warm and share those pages copy-on-write.
+"""
+import gc
+import io
+import logging
+import time
+from contextlib import contextmanager
+from importlib import import_module
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger('api.warmup')
+
+@contextmanager
+def _timed(timings, name):
+    start = time.perf_counter()
+    yield
+    timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
+
+def _blank_pdf():
+    from PyPDF2 import PdfWriter
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def warm_up(database=False):
+    """
+    Build per-process state ahead of the first request and return the time
+    each step took in milliseconds.
+
+    With ``database`` the TF-IDF vocabulary and open-job matrix are loaded
+    too; connections are closed afterwards so none leak into forked workers.
+    """
+    timings = {}
+    with _timed(timings, 'imports'):
+        import_module(settings.ROOT_URLCONF)
+        from rest_framework.settings import api_settings
+        api_settings.DEFAULT_RENDERER_CLASSES
+        api_settings.DEFAULT_PARSER_CLASSES
+
+    with _timed(timings, 'pdf'):
+        # First use of a reader pulls in the libraries' lazily imported parts
+        from .pdf import configured_backends
+        blank = _blank_pdf()
+        for backend in configured_backends():
+            backend.pages(blank)
+
+    with _timed(timings, 'skills'):
+        from .skills import skill_pattern, parse_requirements
+        skill_pattern()
+        parse_requirements('React and Node.js. Docker is a plus. 3+ years.')
+
+    if database:
+        with _timed(timings, 'vocabulary'):
+            from .models import TfidfVocabulary
+            from .scoring import get_vocabulary, open_job_matrix
+            # Never build a vocabulary here: that scans every CV on startup
+            try:
+                if TfidfVocabulary.objects.exists():
+                    get_vocabulary()
+                    open_job_matrix()
+            except DatabaseError as e:
+                # e.g. migrations not applied yet; the first request loads it
+                logger.warning('Skipping TF-IDF warm-up: %s', e)
+        connections.close_all()
+    return timings
+
+
+def warm_up_before_fork():
+    """
+    Warm up from ``wsgi.py`` / ``asgi.py`` when ``WARMUP['ENABLED']`` is set
+    (off unless the ``DJANGO_WARMUP`` environment variable is ``1``, so
+    ``runserver``, management commands and tests start as before).
+
+    Objects created so far are moved out of the garbage collector's reach
+    with ``gc.freeze()``, so collections in the workers do not write to
+    (and un-share) the pages they live on.
+    """
+    config = getattr(settings, 'WARMUP', {})
+    if not config.get('ENABLED'):
+        return None
+    timings = warm_up(database=config.get('DATABASE', True))
+    gc.collect()
+    gc.freeze()
+    steps = ', '.join(f'{step} {ms}ms' for step, ms in timings.items())
+    logger.info('Warm-up took %.1fms (%s)', sum(timings.values()), steps)
+    return timings
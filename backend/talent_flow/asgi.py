@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'talent_flow.settings')
 
 application = get_asgi_application()
+
+# Runs in the master process when the server preloads the app (gunicorn --preload)
+from api.warmup import warm_up_before_fork  # noqa: E402
+
+warm_up_before_fork()
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -43,6 +46,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -51,6 +55,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.ProfilingMiddleware',
+    'api.middleware.ReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'talent_flow.urls'
@@ -83,6 +89,22 @@ DATABASES = {
     }
 }
 
+# Read replicas (api.routers.ReplicaRouter): add each replica to DATABASES
+# and list its alias here. Safe requests then read jobs, candidates,
+# applications and CV matches from a replica, except for
+# REPLICA_STICKY_SECONDS after the same client wrote. To try it locally
+# with SQLite copies kept fresh by "manage.py sync_replicas --interval 1":
+#
+#   DATABASES['replica1'] = {
+#       'ENGINE': 'django.db.backends.sqlite3',
+#       'NAME': BASE_DIR / 'db_replica1.sqlite3',
+#       'TEST': {'MIRROR': 'default'},
+#   }
+#   DATABASE_REPLICAS = ['replica1']
+DATABASE_ROUTERS = ['api.routers.ReplicaRouter']
+DATABASE_REPLICAS = []
+REPLICA_STICKY_SECONDS = 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -120,6 +142,100 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Django REST framework
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Request profiling (api.middleware.ProfilingMiddleware)
+# Adds Server-Timing / X-DB-Query-Count headers and logs slow requests.
+PROFILING = {
+    'ENABLED': False,
+    'SLOW_REQUEST_MS': 500,
+    'SLOW_LOG_SIZE': 100,
+    'PROFILE_SAMPLE_RATE': 0.0,  # Fraction of requests run under cProfile
+    'PROFILE_DIR': BASE_DIR / 'profiles',  # cProfile dumps of sampled slow requests
+}
+
+# PDF text extraction (api.pdf). Backends are tried in order, falling back to
+# the next on failure; ones that are not installed are skipped. Only PyPDF2
+# is in requirements.txt: pip install pypdfium2 for the fast path, and
+# pdfminer.six as the last resort for PDFs the others cannot read.
+PDF_EXTRACTION = {
+    'BACKENDS': ['pypdfium2', 'PyPDF2', 'pypdf', 'pdfminer'],
+    'MIN_CHARS_PER_PAGE': 20,
+}
+
+# Admission control for process_cvs (api.scheduler), per worker process.
+# Uploads are processed CHUNK_SIZE CVs at a time, MAX_CONCURRENT chunks at
+# once, fairly across (user, job); beyond MAX_QUEUED waiting uploads or
+# MAX_WAIT seconds of queueing, new uploads get 429 with Retry-After. Set
+# WORKER_THREADS to the server's threads per process: at most one fewer
+# uploads are let in, so a thread is always free for the rest of the API.
+CV_SCHEDULER = {
+    'ENABLED': True,
+    'MAX_CONCURRENT': 1,
+    'MAX_QUEUED': 8,
+    'MAX_WAIT': 30,
+    'CHUNK_SIZE': 10,
+    'WORKER_THREADS': 4,
+}
+
+# Resumable CV uploads (api.uploads): chunks are written to DIRECTORY, which
+# must be shared by all workers serving the API. Keep chunks below
+# DATA_UPLOAD_MAX_MEMORY_SIZE (2.5 MB by default). Uncommitted sessions older
+# than EXPIRE_HOURS are removed by `manage.py clean_uploads`.
+UPLOADS = {
+    'DIRECTORY': BASE_DIR / 'uploads',
+    'MAX_FILES': 100,
+    'MAX_FILE_SIZE': 10 * 1024 * 1024,
+    'EXPIRE_HOURS': 24,
+}
+
+# Delta sync (api.sync, /api/changes/). Rows are matched from OVERLAP_SECONDS
+# before the client's token, to cover transactions that commit late; keep it
+# above the longest write transaction. Tombstones of deleted rows are kept
+# TOMBSTONE_DAYS (`manage.py prune_tombstones`); older tokens get a 410.
+SYNC = {
+    'OVERLAP_SECONDS': 10,
+    'TOMBSTONE_DAYS': 30,
+}
+
+# Duplicate candidate detection (api.dedup, /api/candidates/duplicates/).
+# CVs with the same name are linked when their texts are NAME_THRESHOLD
+# similar, other CVs when TEXT_THRESHOLD similar (estimated Jaccard of word
+# shingles). Phones shared by more than MAX_PHONE_SHARES records are ignored.
+DEDUP = {
+    'TEXT_THRESHOLD': 0.8,
+    'NAME_THRESHOLD': 0.3,
+    'MAX_PHONE_SHARES': 10,
+}
+
+# Offline CV summaries for Application.ai_summary (api.summaries), filled by
+# `manage.py summarize_applications` (--interval to keep running). WORKERS
+# processes summarize in parallel (None: one per CPU).
+SUMMARIES = {
+    'SENTENCES': 3,
+    'WORKERS': None,
+    'BATCH_SIZE': 1000,
+}
+
+# Pre-fork warm-up (api.warmup), run from wsgi.py / asgi.py. Serve with
+# DJANGO_WARMUP=1 and gunicorn --preload so workers inherit the warmed state
+# copy-on-write; off otherwise so runserver and tests are not slowed down.
+WARMUP = {
+    'ENABLED': os.environ.get('DJANGO_WARMUP') == '1',
+    'DATABASE': True,  # Also load the TF-IDF vocabulary and open-job matrix
+}
+
 # Email settings
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'  # For development - prints to console
 # EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'  # For production
@@ -141,3 +257,10 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:8087",
     "http://127.0.0.1:8087",
 ]
+
+# Resumable uploads send chunk offsets and checksums in headers
+CORS_ALLOW_HEADERS = (*default_headers, 'content-range', 'x-chunk-sha256', 'x-file-sha256')
+CORS_EXPOSE_HEADERS = ['Retry-After', 'X-Archived-Excluded']
+# The frontend sends cookies so the replica stickiness cookie set after a
+# write (api.middleware.ReplicaMiddleware) comes back on the next requests
+CORS_ALLOW_CREDENTIALS = True
@@ -0,0 +1,7 @@
+// fetch() for backend API calls. Cookies are sent with every request: after
+// a write the backend sets one that keeps this client's reads on the primary
+// database until the read replicas have caught up (ReplicaMiddleware in
+// backend/api/middleware.py), so a page never shows data older than the
+// change the user just made.
+export const apiFetch = (input: RequestInfo | URL, init: RequestInit = {}) =>
+  fetch(input, { credentials: "include", ...init });
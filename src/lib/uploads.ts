@@ -0,0 +1,107 @@
+// Resumable CV uploads: create a session, PUT each file in chunks, commit.
+// After a failed request the session is read back and every file resumes
+// from the offset the server has, so a dropped connection never restarts
+// the batch. See backend/api/uploads.py for the protocol.
+
+import { apiFetch } from "./api";
+
+const CHUNK_SIZE = 1024 * 1024;
+const MAX_ATTEMPTS = 5;
+
+interface UploadFileState {
+  name: string;
+  size: number;
+  received: number;
+  status: "uploading" | "complete" | "processed" | "failed";
+}
+
+export interface UploadResult {
+  total_processed: number;
+  filtered_count: number;
+  filtered_cvs: any[];
+}
+
+const sha256 = async (data: ArrayBuffer) =>
+  Array.from(new Uint8Array(await crypto.subtle.digest("SHA-256", data)))
+    .map((b) => b.toString(16).padStart(2, "0"))
+    .join("");
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Retry network errors and 5xx/429 responses with backoff; other errors are final
+async function withRetries(request: () => Promise<Response>): Promise<Response> {
+  for (let attempt = 1; ; attempt++) {
+    let response: Response | null = null;
+    try {
+      response = await request();
+      if (response.status < 500 && response.status !== 429) return response;
+    } catch (error) {
+      if (attempt >= MAX_ATTEMPTS) throw error;
+    }
+    if (attempt >= MAX_ATTEMPTS) return response as Response;
+    const retryAfter = Number(response?.headers.get("Retry-After"));
+    await sleep(retryAfter ? retryAfter * 1000 : 500 * 2 ** attempt);
+  }
+}
+
+export async function uploadCVs(
+  apiBase: string,
+  jobId: string,
+  files: File[],
+  onProgress?: (sentBytes: number, totalBytes: number) => void,
+): Promise<UploadResult> {
+  const sessionResponse = await withRetries(() =>
+    apiFetch(`${apiBase}/jobs/${jobId}/uploads/`, { method: "POST" }),
+  );
+  if (!sessionResponse.ok) throw new Error("Failed to start upload");
+  const sessionUrl = `${apiBase}/jobs/${jobId}/uploads/${(await sessionResponse.json()).id}`;
+
+  const totalBytes = files.reduce((sum, file) => sum + file.size, 0);
+  const sent = new Map<string, number>();
+  const report = () => onProgress?.([...sent.values()].reduce((a, b) => a + b, 0), totalBytes);
+
+  const serverOffset = async (name: string) => {
+    const response = await withRetries(() => apiFetch(`${sessionUrl}/`));
+    const state = await response.json();
+    const file = (state.files as UploadFileState[]).find((f) => f.name === name);
+    return file ? (file.status === "uploading" ? file.received : file.size) : 0;
+  };
+
+  for (const file of files) {
+    const fileUrl = `${sessionUrl}/files/${encodeURIComponent(file.name)}/`;
+    const fileSha256 = await sha256(await file.arrayBuffer());
+    let offset = 0;
+    let restarts = 0;
+    while (offset < file.size) {
+      const chunk = await file.slice(offset, offset + CHUNK_SIZE).arrayBuffer();
+      const end = offset + chunk.byteLength - 1;
+      const response = await withRetries(async () =>
+        apiFetch(fileUrl, {
+          method: "PUT",
+          headers: {
+            "Content-Type": "application/octet-stream",
+            "Content-Range": `bytes ${offset}-${end}/${file.size}`,
+            "X-Chunk-SHA256": await sha256(chunk),
+            "X-File-SHA256": fileSha256,
+          },
+          body: chunk,
+        }),
+      );
+      if (response.ok) {
+        const state: UploadFileState = await response.json();
+        offset = state.status === "uploading" ? state.received : file.size;
+      } else if ((response.status === 409 || response.status === 422) && restarts++ < MAX_ATTEMPTS) {
+        // Out of step with the server (or the file was corrupted): resume from its offset
+        offset = await serverOffset(file.name);
+      } else {
+        throw new Error(`Failed to upload ${file.name}`);
+      }
+      sent.set(file.name, offset);
+      report();
+    }
+  }
+
+  const commit = await withRetries(() => apiFetch(`${sessionUrl}/commit/`, { method: "POST" }));
+  if (!commit.ok) throw new Error("Failed to process CVs");
+  return commit.json();
+}
@@ -15,7 +15,9 @@ import {
   SelectValue,
 } from "@/components/ui/select";
 import { useAppStore } from "@/store/useAppStore";
+import { Application } from "@/types";
 import { cn } from "@/lib/utils";
+import { apiFetch } from "@/lib/api";
 
 const API_BASE = "http://localhost:8000/api";
 
@@ -25,7 +27,24 @@ export default function JobDetailPage() {
   const { jobs, applications, updateApplicationStatus, updateApplicationNotes, updateApplicationRating } = useAppStore();
 
   const job = jobs.find(j => j.id === id);
-  const jobApplications = applications.filter(app => app.jobId === id);
+  const [archivedApplications, setArchivedApplications] = useState<Application[] | null>(null);
+
+  // Archived jobs' applications are not in the global list; fetch them by job
+  useEffect(() => {
+    if (!job?.archivedAt) {
+      setArchivedApplications(null);
+      return;
+    }
+    apiFetch(`${API_BASE}/applications/?job=${job.id}`)
+      .then(response => response.ok ? response.json() : [])
+      .then(data => setArchivedApplications(data.map((app: any) => ({
+        ...app,
+        jobId: app.job,
+        appliedAt: new Date(app.applied_at),
+      }))));
+  }, [job?.id, job?.archivedAt]);
+
+  const jobApplications = archivedApplications ?? applications.filter(app => app.jobId === id);
 
   const [selectedApplication, setSelectedApplication] = useState<string | null>(null);
   const [uploadedCVs, setUploadedCVs] = useState<File[]>([]);
@@ -25,6 +25,8 @@ import {
 import { useAppStore } from "@/store/useAppStore";
 import { useToast } from "@/hooks/use-toast";
 import { cn } from "@/lib/utils";
+import { uploadCVs } from "@/lib/uploads";
+import { apiFetch } from "@/lib/api";
 
 const API_BASE = "http://localhost:8000/api";
 
@@ -185,27 +187,15 @@ export default function JobsPage() {
                     setIsFiltering(true);
 
                     try {
-                      // Create FormData for file upload
-                      const formData = new FormData();
-                      uploadedCVs.forEach((file) => {
-                        formData.append('cvs', file);
-                      });
-
-                      // Call the backend API for CV processing
-                      const response = await fetch(`${API_BASE}/jobs/${selectedJob.id}/process_cvs/`, {
-                        method: 'POST',
-                        body: formData,
-                      });
-
-                      if (!response.ok) {
-                        throw new Error('Failed to process CVs');
-                      }
-
-                      const data = await response.json();
+                      // Upload in resumable chunks; a dropped connection resumes
+                      // where it stopped instead of re-sending the whole batch
+                      const data = await uploadCVs(API_BASE, selectedJob.id, uploadedCVs);
 
                       // Transform the results to match frontend expectations
                       const results = data.filtered_cvs.map((cv: any) => ({
                         cvName: cv.fileName,
+                        email: cv.email,
+                        candidateName: cv.candidateName,
                         skills: cv.skills,
                         bestJob: selectedJob,
                         matchScore: cv.matchScore,
@@ -395,108 +385,58 @@ export default function JobsPage() {
                         size="sm"
                         onClick={async () => {
                           try {
-                            // Generate candidate name from CV filename
-                            const candidateName = result.cvName.replace(/\.(pdf|doc|docx|txt)$/i, '').replace(/[-_]/g, ' ');
-
-                            // Create a mock email (in real implementation, this would be extracted from CV)
-                            const baseName = candidateName.replace(/\s+/g, '').toLowerCase();
-                            let candidateEmail = `${baseName}@example.com`;
-                            let emailCounter = 1;
-
-                            // Keep trying different emails until we find one that doesn't exist
-                            while (true) {
-                              try {
-                                const checkResponse = await fetch(`${API_BASE}/candidates/?email=${candidateEmail}`);
-                                const existingCandidates = await checkResponse.json();
-                                if (existingCandidates.length === 0) {
-                                  break; // Email is available
-                                }
-                                emailCounter++;
-                                candidateEmail = `${baseName}${emailCounter}@example.com`;
-                              } catch (error) {
-                                break; // If check fails, proceed with current email
-                              }
-                            }
-
-                            const candidateData = {
-                              name: candidateName,
-                              email: candidateEmail,
-                              phone: '+1 (555) 000-0000', // Mock phone
-                              skills: result.skills,
-                              resume_url: `/resumes/${result.cvName}` // Mock URL
-                            };
-
-                            // Create candidate via API
-                            const candidateResponse = await fetch(`${API_BASE}/candidates/`, {
+                            // Prefer the name and email found in the CV; without an email, use an
+                            // address unique to this CV match so different people are never merged
+                            const candidateName = result.candidateName
+                              || result.cvName.replace(/\.(pdf|doc|docx|txt)$/i, '').replace(/[-_]/g, ' ');
+                            const candidateEmail = result.email || `cv-match-${result.id}@example.com`;
+
+                            // Upsert the candidate and create the application in one request
+                            const response = await apiFetch(`${API_BASE}/jobs/${selectedJob.id}/shortlist/`, {
                               method: 'POST',
                               headers: { 'Content-Type': 'application/json' },
-                              body: JSON.stringify(candidateData)
-                            });
-
-                            if (candidateResponse.ok) {
-                              const newCandidate = await candidateResponse.json();
-
-                              // Check for duplicate application (same email + same job)
-                              const existingAppsResponse = await fetch(`${API_BASE}/applications/?candidate__email=${candidateEmail}&job=${selectedJob.id}`);
-                              const existingApps = await existingAppsResponse.json();
-
-                              if (existingApps.length > 0) {
-                                toast({
-                                  title: "Duplicate Application",
-                                  description: "This candidate has already applied for this job.",
-                                  variant: "destructive",
-                                });
-                                return;
-                              }
-
-                              // Create application with screening status
-                              const applicationData = {
-                                candidate: newCandidate.id,
-                                job: selectedJob.id,
-                                job_title: selectedJob.title,
+                              body: JSON.stringify({
                                 status: 'Screening',
-                                applied_at: new Date().toISOString(),
-                                rating: 0, // Start with no rating
-                                notes: `Auto-selected candidate with ${result.matchScore}% match score. Skills: ${result.skills.join(', ')}`,
-                                ai_summary: `High-match candidate selected automatically. Strong alignment with job requirements.`,
-                                match_score: result.matchScore,
-                                match_status: 'matched'
-                              };
+                                candidates: [{
+                                  cv_match: result.id,
+                                  name: candidateName,
+                                  email: candidateEmail,
+                                  notes: `Auto-selected candidate with ${result.matchScore}% match score. Skills: ${result.skills.join(', ')}`,
+                                }],
+                              }),
+                            });
 
-                              const applicationResponse = await fetch(`${API_BASE}/applications/`, {
-                                method: 'POST',
-                                headers: { 'Content-Type': 'application/json' },
-                                body: JSON.stringify(applicationData)
+                            if (!response.ok) {
+                              const errorData = await response.json();
+                              toast({
+                                title: "Failed to Select Candidate",
+                                description: `Error: ${JSON.stringify(errorData)}`,
+                                variant: "destructive",
                               });
+                              return;
+                            }
 
-                              if (applicationResponse.ok) {
-                                toast({
-                                  title: "Candidate Selected Successfully! ✅",
-                                  description: `${newCandidate.name} has been added to screening for ${selectedJob.title}.`,
-                                });
-
-                                // Refresh data
-                                fetchJobs();
-                                fetchApplications();
-
-                                // Navigate to Applications page to view all candidates
-                                navigate('/applications');
-                              } else {
-                                const errorData = await applicationResponse.json();
-                                toast({
-                                  title: "Failed to Create Application",
-                                  description: `Error: ${JSON.stringify(errorData)}`,
-                                  variant: "destructive",
-                                });
-                              }
-                            } else {
-                              const errorData = await candidateResponse.json();
+                            const data = await response.json();
+                            if (data.created_applications === 0) {
                               toast({
-                                title: "Failed to Create Candidate",
-                                description: `Error: ${JSON.stringify(errorData)}`,
+                                title: "Duplicate Application",
+                                description: "This candidate has already applied for this job.",
                                 variant: "destructive",
                               });
+                              return;
                             }
+
+                            toast({
+                              title: "Candidate Selected Successfully! ✅",
+                              description: `${candidateName} has been added to screening for ${selectedJob.title}.`,
+                            });
+
+                            // Refresh data
+                            fetchJobs();
+                            fetchApplications();
+
+                            // Navigate to Applications page to view all candidates
+                            navigate('/applications');
                           } catch (error) {
                             console.error('Error selecting candidate:', error);
                             toast({
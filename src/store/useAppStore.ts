@@ -1,5 +1,6 @@
 import { create } from "zustand";
 import { Job, Application, ApplicationStatus } from "@/types";
+import { apiFetch } from "@/lib/api";
 
 const API_BASE = "http://localhost:8000/api";
 
@@ -19,55 +20,86 @@ interface AppState {
   updateApplicationRating: (applicationId: string, rating: number) => Promise<void>;
   fetchJobs: () => Promise<void>;
   fetchApplications: () => Promise<void>;
+  syncToken: string | null;
+  sync: () => Promise<void>;
 }
 
+const toJob = (job: any): Job => ({
+  ...job,
+  createdAt: new Date(job.created_at),
+  archivedAt: job.archived_at ? new Date(job.archived_at) : null,
+});
+
+const toApplication = (app: any): Application => ({
+  ...app,
+  jobId: app.job,
+  appliedAt: new Date(app.applied_at),
+});
+
+// Upsert changed rows by id and drop deleted ones, keeping list order
+const merge = <T extends { id: string }>(items: T[], changed: T[], deleted: (string | number)[]) => {
+  const byId = new Map(items.map((item) => [String(item.id), item]));
+  deleted.forEach((id) => byId.delete(String(id)));
+  changed.forEach((item) => byId.set(String(item.id), item));
+  return [...byId.values()];
+};
+
+let syncing: Promise<void> | null = null;
+
 export const useAppStore = create<AppState>((set, get) => ({
   jobs: [],
   applications: [],
   loading: false,
   error: null,
+  syncToken: null,
 
   setJobs: (jobs) => set({ jobs }),
   setApplications: (applications) => set({ applications }),
   setLoading: (loading) => set({ loading }),
   setError: (error) => set({ error }),
 
-  fetchJobs: async () => {
-    try {
-      set({ loading: true, error: null });
-      const response = await fetch(`${API_BASE}/jobs/`);
-      if (!response.ok) throw new Error('Failed to fetch jobs');
-      const jobsData = await response.json();
-      const jobs = jobsData.map((job: any) => ({
-        ...job,
-        createdAt: new Date(job.created_at),
-      }));
-      set({ jobs, loading: false });
-    } catch (error) {
-      set({ error: error instanceof Error ? error.message : 'Unknown error', loading: false });
-    }
-  },
+  fetchJobs: () => get().sync(),
+  fetchApplications: () => get().sync(),
 
-  fetchApplications: async () => {
-    try {
-      set({ loading: true, error: null });
-      const response = await fetch(`${API_BASE}/applications/`);
-      if (!response.ok) throw new Error('Failed to fetch applications');
-      const applicationsData = await response.json();
-      const applications = applicationsData.map((app: any) => ({
-        ...app,
-        jobId: app.job,
-        appliedAt: new Date(app.applied_at),
-      }));
-      set({ applications, loading: false });
-    } catch (error) {
-      set({ error: error instanceof Error ? error.message : 'Unknown error', loading: false });
+  sync: () => {
+    // Concurrent callers (e.g. fetchJobs and fetchApplications on mount) share one request
+    if (!syncing) {
+      syncing = (async () => {
+        try {
+          set({ loading: true, error: null });
+          let token = get().syncToken;
+          const params = new URLSearchParams({ models: 'jobs,applications' });
+          if (token) params.set('since', token);
+          let response = await apiFetch(`${API_BASE}/changes/?${params}`);
+          if (response.status === 410) {
+            // Token older than the server keeps deletions for: start over
+            token = null;
+            params.delete('since');
+            response = await apiFetch(`${API_BASE}/changes/?${params}`);
+          }
+          if (!response.ok) throw new Error('Failed to sync');
+          const data = await response.json();
+          const jobs = data.jobs.map(toJob);
+          const applications = data.applications.map(toApplication);
+          set((state) => ({
+            jobs: token ? merge(state.jobs, jobs, data.deleted.jobs) : jobs,
+            applications: token ? merge(state.applications, applications, data.deleted.applications) : applications,
+            syncToken: data.token,
+            loading: false,
+          }));
+        } catch (error) {
+          set({ error: error instanceof Error ? error.message : 'Unknown error', loading: false });
+        } finally {
+          syncing = null;
+        }
+      })();
     }
+    return syncing;
   },
 
   addJob: async (jobData) => {
     try {
-      const response = await fetch(`${API_BASE}/jobs/`, {
+      const response = await apiFetch(`${API_BASE}/jobs/`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(jobData),
@@ -86,7 +118,7 @@ export const useAppStore = create<AppState>((set, get) => ({
 
   toggleJobStatus: async (jobId) => {
     try {
-      const response = await fetch(`${API_BASE}/jobs/${jobId}/toggle_status/`, {
+      const response = await apiFetch(`${API_BASE}/jobs/${jobId}/toggle_status/`, {
         method: 'PATCH',
         headers: { 'Content-Type': 'application/json' },
       });
@@ -95,10 +127,16 @@ export const useAppStore = create<AppState>((set, get) => ({
       const updatedJob = {
         ...updatedJobData,
         createdAt: new Date(updatedJobData.created_at),
+        archivedAt: updatedJobData.archived_at ? new Date(updatedJobData.archived_at) : null,
       };
+      const wasArchived = get().jobs.find((job) => job.id === jobId)?.archivedAt;
       set((state) => ({
         jobs: state.jobs.map((job) => (job.id === jobId ? updatedJob : job)),
       }));
+      // Reopening an archived job moves its applications back to the live list
+      if (wasArchived && !updatedJob.archivedAt) {
+        await get().fetchApplications();
+      }
     } catch (error) {
       set({ error: error instanceof Error ? error.message : 'Unknown error' });
     }
@@ -106,7 +144,7 @@ export const useAppStore = create<AppState>((set, get) => ({
 
   updateApplicationStatus: async (applicationId, status) => {
     try {
-      const response = await fetch(`${API_BASE}/applications/${applicationId}/update_status/`, {
+      const response = await apiFetch(`${API_BASE}/applications/${applicationId}/update_status/`, {
         method: 'PATCH',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ status }),
@@ -128,7 +166,7 @@ export const useAppStore = create<AppState>((set, get) => ({
 
   updateApplicationNotes: async (applicationId, notes) => {
     try {
-      const response = await fetch(`${API_BASE}/applications/${applicationId}/update_notes/`, {
+      const response = await apiFetch(`${API_BASE}/applications/${applicationId}/update_notes/`, {
         method: 'PATCH',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ notes }),
@@ -150,7 +188,7 @@ export const useAppStore = create<AppState>((set, get) => ({
 
   updateApplicationRating: async (applicationId, rating) => {
     try {
-      const response = await fetch(`${API_BASE}/applications/${applicationId}/update_rating/`, {
+      const response = await apiFetch(`${API_BASE}/applications/${applicationId}/update_rating/`, {
         method: 'PATCH',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ rating }),
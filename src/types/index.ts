@@ -16,6 +16,7 @@ export interface Job {
   status: JobStatus;
   createdAt: Date;
   applicationsCount: number;
+  archivedAt?: Date | null;
 }
 
 export interface Candidate {